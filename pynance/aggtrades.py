@@ -0,0 +1,73 @@
+"""Aggregate trades pagination module."""
+import pandas as pd
+
+from .decoding import create_agg_trades_frame
+
+MAX_LIMIT = 1000
+
+
+def iter_agg_trades(client, symbol, from_id=None, start_time=None,
+                    end_time=None, limit=MAX_LIMIT, decimals=None):
+    """Pages of the aggregate trades of ``symbol``, as DataFrames.
+
+    Starts from id ``from_id``, or else from the first aggregate trade at or
+    after ``start_time``, or else from the first one ever, and continues by
+    id up to and including ``end_time`` (or the latest aggregate trade).
+    Only the first page is requested by time, so the range is not limited
+    to an hour, as ranges with both ``startTime`` and ``endTime`` are, and
+    later pages are always complete (hence cached forever by
+    :class:`pynance.cache.CachePolicy`).
+
+    Columns are named as those of trades, see
+    :func:`pynance.decoding.create_agg_trades_frame`, so pages can be passed
+    to :func:`pynance.bars.build_bars` as they are.
+
+    Parameters
+    ----------
+    client : pynance.client.Client
+    symbol : str
+    from_id : int, optional
+    start_time, end_time : int, optional
+        Range of times, in milliseconds.
+    limit : int
+        Number of aggregate trades per request.
+    decimals : dict, optional
+        Decode the listed columns to fixed-point, see
+        :func:`pynance.decoding.decode_agg_trades`.
+    """
+    if from_id is None and start_time is None:
+        from_id = 0
+
+    if from_id is None:
+        page = client.agg_trades(symbol, limit=limit, start_time=start_time)
+    else:
+        page = client.agg_trades(symbol, limit=limit, from_id=from_id)
+
+    while page:
+
+        frame = create_agg_trades_frame(page, decimals=decimals)
+
+        if end_time is not None and page[-1]["T"] > end_time:
+            yield frame[frame.time.to_numpy().view("int64") <= end_time]
+            return
+
+        yield frame
+
+        if len(page) < limit:  # the latest aggregate trade
+            return
+
+        page = client.agg_trades(symbol, limit=limit,
+                                 from_id=page[-1]["a"] + 1)
+
+
+def fetch_agg_trades(client, symbol, from_id=None, start_time=None,
+                     end_time=None, limit=MAX_LIMIT, decimals=None):
+    """All aggregate trades of :func:`iter_agg_trades` in one DataFrame."""
+    frames = list(iter_agg_trades(client, symbol, from_id=from_id,
+                                  start_time=start_time, end_time=end_time,
+                                  limit=limit, decimals=decimals))
+
+    if not frames:
+        return create_agg_trades_frame([], decimals=decimals)
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,165 @@
+"""Asyncio client module."""
+import asyncio
+import aiohttp
+
+from yarl import URL
+
+from .auth import Signer
+from .client import BASE_URL
+
+
+class AsyncClient:
+    """Awaitable counterpart of :class:`pynance.client.Client`.
+
+    All requests share one ``aiohttp`` session and at most
+    ``max_concurrency`` of them are in flight at any time, so thousands of
+    coroutines (e.g. one per symbol) may be scheduled at once. Signed
+    requests are timestamped in server time if given a ``clock_sync``, e.g.
+    the one returned by :meth:`pynance.client.Client.sync_clock`.
+
+    Examples
+    --------
+    >>> async def main(symbols):
+    ...     async with AsyncClient() as client:
+    ...         return await client.gather(client.trades, symbols, limit=10)
+    >>> trades = asyncio.run(main(["BTCAUD", "ETHAUD"]))  # doctest: +SKIP
+    """
+
+    def __init__(self, api_key=None, secret_key=None, base_url=BASE_URL,
+                 max_concurrency=10, timeout=10., rate_limiter=None,
+                 clock_sync=None):
+
+        self.headers = {}
+        if api_key is not None:
+            self.headers["X-MBX-APIKEY"] = api_key
+
+        self.base_url = base_url.rstrip("/")
+        self.secret_key = secret_key
+        self.signer = None if secret_key is None \
+            else Signer(secret_key, clock=clock_sync)
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        # must be created from within the running event loop
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             headers=self.headers,
+                                             timeout=self.timeout)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, path, params=None, signed=False,
+                      raw=False):
+
+        params = {key: str(value) for key, value in (params or {}).items()
+                  if value is not None}
+
+        if self.rate_limiter is not None:
+            await asyncio.sleep(self.rate_limiter.reserve(path, params))
+
+        async with self.semaphore:
+
+            url, query = self.base_url + path, params
+            if signed:  # sign as late as possible so timestamp is fresh
+                # send the signed query string as is, without re-encoding
+                url = URL(f"{url}?{self.signer.sign(params)}", encoded=True)
+                query = None
+
+            headers = status = None
+            try:
+                async with self.session.request(method, url,
+                                                params=query) as response:
+                    headers, status = response.headers, response.status
+                    response.raise_for_status()
+                    if raw:  # the body as bytes, to decode in a single pass
+                        return await response.read()
+                    return await response.json()
+            finally:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.release(path, params, headers=headers,
+                                              status=status)
+
+    async def get(self, path, params=None, signed=False, raw=False):
+        return await self.request("GET", path, params=params, signed=signed,
+                                  raw=raw)
+
+    async def gather(self, func, symbols, **kwargs):
+        """Call coroutine function ``func`` for every symbol concurrently.
+
+        Returns a dict mapping each symbol to its result.
+        """
+        results = await asyncio.gather(*(func(symbol, **kwargs)
+                                         for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    async def server_time(self):
+        response = await self.get("/api/v3/time")
+        return response.get("serverTime")
+
+    async def exchange_info(self):
+        return await self.get("/api/v3/exchangeInfo")
+
+    async def trades(self, symbol, limit=None, raw=False):
+        return await self.get("/api/v3/trades",
+                              params=dict(symbol=symbol, limit=limit),
+                              raw=raw)
+
+    async def historical_trades(self, symbol, limit=None, from_id=None,
+                                raw=False):
+        return await self.get("/api/v3/historicalTrades",
+                              params=dict(symbol=symbol, limit=limit,
+                                          fromId=from_id), raw=raw)
+
+    async def agg_trades(self, symbol, limit=None, from_id=None,
+                         start_time=None, end_time=None):
+        return await self.get("/api/v3/aggTrades",
+                              params=dict(symbol=symbol, limit=limit,
+                                          fromId=from_id,
+                                          startTime=start_time,
+                                          endTime=end_time))
+
+    async def klines(self, symbol, interval, limit=None, start_time=None,
+                     end_time=None):
+        return await self.get("/api/v3/klines",
+                              params=dict(symbol=symbol, interval=interval,
+                                          limit=limit, startTime=start_time,
+                                          endTime=end_time))
+
+    async def depth(self, symbol, limit=None):
+        return await self.get("/api/v3/depth",
+                              params=dict(symbol=symbol, limit=limit))
+
+    async def avg_price(self, symbol):
+        return await self.get("/api/v3/avgPrice", params=dict(symbol=symbol))
+
+    async def ticker_price(self, symbol=None):
+        return await self.get("/api/v3/ticker/price",
+                              params=dict(symbol=symbol))
+
+    async def book_ticker(self, symbol=None):
+        return await self.get("/api/v3/ticker/bookTicker",
+                              params=dict(symbol=symbol))
+
+    async def my_trades(self, symbol, limit=None, from_id=None,
+                        start_time=None, end_time=None, raw=False):
+        return await self.get("/api/v3/myTrades",
+                              params=dict(symbol=symbol, limit=limit,
+                                          fromId=from_id,
+                                          startTime=start_time,
+                                          endTime=end_time),
+                              signed=True, raw=raw)
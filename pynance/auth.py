@@ -1,9 +1,13 @@
 import hmac
+import re
 from hashlib import sha256
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
 
 from .utils import create_timestamp
 
+# characters `quote_plus` leaves as they are
+UNRESERVED = re.compile(r"[A-Za-z0-9_.~-]*").fullmatch
+
 
 def create_hmac(params, secret_key, digestmod=sha256):
     return hmac.new(secret_key.encode("utf-8"),
@@ -25,3 +29,70 @@ def signed_params(params, secret_key):
     params_new["signature"] = create_signature(params_new, secret_key)
 
     return params_new
+
+
+def encode_params(params):
+    """Same as ``urlencode(params)``, but only quotes the keys and values
+    that need it, which symbols, ids and numbers never do."""
+    pairs = []
+    for key, value in params.items():
+        value = str(value)
+        if UNRESERVED(key) and UNRESERVED(value):
+            pairs.append(f"{key}={value}")
+        else:
+            pairs.append(f"{quote_plus(key)}={quote_plus(value)}")
+
+    return "&".join(pairs)
+
+
+class Signer:
+    """Signs requests with a pre-keyed HMAC.
+
+    The key is encoded and hashed into the HMAC state once, and every
+    signature starts from a copy of that state. Parameters are url-encoded
+    once into the final query string, which is both signed and sent as is.
+
+    Parameters
+    ----------
+    secret_key : str
+        Secret key of the account.
+    digestmod : str
+        Name of the hash function, for OpenSSL's HMAC implementation.
+    clock : pynance.utils.ClockSync, optional
+        If given, timestamps are taken in server time from it.
+    """
+
+    def __init__(self, secret_key, digestmod="sha256", clock=None):
+        self.hmac = hmac.new(secret_key.encode("utf-8"), digestmod=digestmod)
+        self.clock = clock
+
+    def timestamp(self):
+        if self.clock is None:
+            return create_timestamp()
+        return self.clock.timestamp()
+
+    def signature(self, query):
+        """Hex digest of the HMAC of ``query``."""
+        mac = self.hmac.copy()
+        mac.update(query.encode("utf-8"))
+        return mac.hexdigest()
+
+    def sign(self, params, timestamp=None):
+        """Query string of ``params`` with a ``timestamp`` and ``signature``
+        appended."""
+        if timestamp is None:
+            timestamp = self.timestamp()
+
+        query = encode_params(params)
+        query = f"{query}&timestamp={timestamp}" if query \
+            else f"timestamp={timestamp}"
+
+        return f"{query}&signature={self.signature(query)}"
+
+    def sign_many(self, params_list, timestamp=None):
+        """Query strings of many requests, sharing one timestamp."""
+        if timestamp is None:
+            timestamp = self.timestamp()
+
+        return [self.sign(params, timestamp=timestamp)
+                for params in params_list]
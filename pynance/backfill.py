@@ -0,0 +1,238 @@
+"""Parallel historical trade backfill module."""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .decoding import create_trades_frame, strip_whitespace
+
+
+def find_trade_id(client, symbol, timestamp):
+    """The id of the first trade at or after ``timestamp`` (in ms)."""
+    agg_trades = client.agg_trades(symbol, start_time=timestamp, limit=1)
+
+    if not agg_trades:
+        return None
+
+    return agg_trades[0]["f"]
+
+
+def find_gaps(ids, start_id, stop_id):
+    """Ranges ``(lo, hi)`` of ids in ``[start_id, stop_id)`` missing from the
+    sorted sequence of unique ``ids``."""
+    ids = np.asarray(ids, dtype=np.int64)
+    ids = ids[(ids >= start_id) & (ids < stop_id)]
+
+    # ids on either side of each gap, as if those just outside were fetched
+    bounds = np.concatenate(([start_id - 1], ids, [stop_id]))
+    gaps = np.flatnonzero(np.diff(bounds) > 1)
+
+    return [(int(bounds[i]) + 1, int(bounds[i + 1])) for i in gaps]
+
+
+def slice_body(body, start, stop):
+    """The JSON list of trades ``body`` with only its trades from position
+    ``start`` to ``stop``."""
+    trades = strip_whitespace(body).strip(b"[]{}").split(b"},{")
+    return b"[{" + b"},{".join(trades[start:stop]) + b"}]"
+
+
+def split_range(start_id, stop_id, limit):
+    return [(lo, min(lo + limit, stop_id))
+            for lo in range(start_id, stop_id, limit)]
+
+
+class Checkpoint:
+    """Fetched chunks of trades persisted as JSON files in ``path``, so that
+    an interrupted backfill can resume where it left off."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def load(self):
+
+        trades = []
+        for filename in sorted(self.path.glob("*.json")):
+            with open(filename) as f:
+                trades.extend(json.load(f))
+
+        return trades
+
+    def load_frames(self, decimals=None):
+        """Chunks decoded from their bodies as they are, a frame each."""
+        return [create_trades_frame(filename.read_bytes(), decimals=decimals)
+                for filename in sorted(self.path.glob("*.json"))]
+
+    def save(self, trades):
+
+        if not trades:
+            return
+
+        self.write(trades[0]["id"], trades[-1]["id"],
+                   json.dumps(trades).encode("utf-8"))
+
+    def write(self, first_id, last_id, body):
+        """Save the JSON ``body`` of the trades from ``first_id`` to
+        ``last_id``, e.g. a response body as it is."""
+        filename = self.path.joinpath(f"{first_id:012d}-{last_id:012d}.json")
+        tmp = filename.with_suffix(".tmp")
+
+        with open(tmp, "wb") as f:
+            f.write(body)
+
+        os.replace(tmp, filename)  # atomic, never leaves partial chunks
+
+
+def backfill_trades(client, symbol, start_id=None, stop_id=None,
+                    start_time=None, end_time=None, limit=1000,
+                    max_workers=8, max_rounds=5, checkpoint_dir=None,
+                    frame=False, decimals=None):
+    """Fetch every trade of ``symbol`` with id in ``[start_id, stop_id)``.
+
+    The range is split into windows of ``limit`` ids which are fetched in
+    parallel from ``/api/v3/historicalTrades`` by ``max_workers`` threads.
+    The result is then checked for contiguity and any holes (e.g. from
+    short or failed responses) are re-fetched, for up to ``max_rounds``
+    rounds, so that a window failing (after the retries of the client)
+    does not discard the others.
+
+    Parameters
+    ----------
+    client : pynance.client.Client
+        Client to fetch through. Its ``pool_maxsize`` should be at least
+        ``max_workers``.
+    start_id, stop_id : int, optional
+        Range of trade ids. Alternatively, specify ``start_time`` and
+        ``end_time``. Defaults to the start and end of the trade history.
+    start_time, end_time : int, optional
+        Range of trade times, in milliseconds.
+    checkpoint_dir : str or Path, optional
+        If given, fetched trades are persisted in this directory and a
+        backfill of the same range resumes from it.
+    frame : bool
+        Fetch the raw response bodies and decode each in a single pass (see
+        :func:`pynance.decoding.decode_trades`), without building a dict
+        per trade, returning a DataFrame.
+    decimals : dict, optional
+        Passed to :func:`pynance.decoding.create_trades_frame` if ``frame``.
+
+    Returns
+    -------
+    list of dict or pandas.DataFrame
+        Trades sorted by id.
+    """
+    if start_id is None:
+        start_id = 0 if start_time is None else \
+            find_trade_id(client, symbol, start_time)
+
+    if start_id is None:  # no trades at or after `start_time` yet
+        return create_trades_frame([], decimals=decimals) if frame else []
+
+    if stop_id is None:
+        stop_id = None if end_time is None else \
+            find_trade_id(client, symbol, end_time)
+
+    if stop_id is None:  # up to and including the latest trade
+        stop_id = client.trades(symbol, limit=1)[-1]["id"] + 1
+
+    checkpoint = None
+    trades = {}
+    pages = []  # frames, if `frame`
+
+    if checkpoint_dir is not None:
+        checkpoint = Checkpoint(Path(checkpoint_dir).joinpath(symbol))
+        if frame:
+            pages.extend(page[(page.id >= start_id) & (page.id < stop_id)]
+                         for page in checkpoint.load_frames(decimals=decimals))
+        else:
+            trades.update((trade["id"], trade) for trade in checkpoint.load())
+
+    def page_ids(fetched):
+        if frame:
+            return fetched.id.to_numpy()
+        return np.fromiter((trade["id"] for trade in fetched),
+                           dtype=np.int64, count=len(fetched))
+
+    # sorted ids fetched so far, merged with those of each round
+    ids = np.unique(np.concatenate(
+        [np.empty(0, dtype=np.int64)] +
+        [page_ids(page) for page in pages] +
+        [np.fromiter(trades, dtype=np.int64, count=len(trades))]))
+
+    errors = []
+
+    def fetch(window):
+
+        lo, hi = window
+        try:
+            if frame:
+                body = client.historical_trades(symbol, limit=hi - lo,
+                                                from_id=lo, raw=True)
+                page = create_trades_frame(body, decimals=decimals)
+            else:
+                fetched = client.historical_trades(symbol, limit=hi - lo,
+                                                   from_id=lo)
+        except Exception as error:
+            errors.append(error)
+            return None  # a hole, re-fetched in the next round
+
+        if frame:
+            kept = np.flatnonzero((page.id >= lo) & (page.id < hi))
+            if len(kept) < len(page):  # checkpoint only the trades kept
+                page = page.iloc[kept]
+                body = slice_body(body, kept[0], kept[-1] + 1) \
+                    if len(kept) else None
+            if checkpoint is not None and len(page):
+                checkpoint.write(page.id.iloc[0], page.id.iloc[-1], body)
+            return page
+
+        fetched = [trade for trade in fetched if lo <= trade["id"] < hi]
+
+        if checkpoint is not None:
+            checkpoint.save(fetched)
+
+        return fetched
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        for round_num in range(max_rounds):
+
+            gaps = find_gaps(ids, start_id, stop_id)
+            if not gaps:
+                break
+
+            windows = [window for lo, hi in gaps
+                       for window in split_range(lo, hi, limit)]
+
+            new_ids = [np.empty(0, dtype=np.int64)]
+            for fetched in executor.map(fetch, windows):
+                if fetched is None:
+                    continue
+                if frame:
+                    pages.append(fetched)
+                else:
+                    trades.update((trade["id"], trade) for trade in fetched)
+                new_ids.append(page_ids(fetched))
+
+            ids = np.union1d(ids, np.concatenate(new_ids))
+
+    gaps = find_gaps(ids, start_id, stop_id)
+    if gaps:
+        raise RuntimeError(f"Failed to backfill trade ids {gaps} of {symbol} "
+                           f"after {max_rounds} rounds.") \
+            from (errors[-1] if errors else None)
+
+    if frame:
+        if not pages:
+            return create_trades_frame([], decimals=decimals)
+        result = pd.concat(pages, axis="index", ignore_index=True) \
+            .drop_duplicates("id").sort_values("id")
+        result = result[(result.id >= start_id) & (result.id < stop_id)]
+        return result.reset_index(drop=True)
+
+    return [trades[trade_id] for trade_id in range(start_id, stop_id)]
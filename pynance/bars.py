@@ -0,0 +1,177 @@
+"""Streaming OHLCV bar module."""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["open", "high", "low", "close", "volume", "vwap", "count"]
+
+
+class BarAggregator:
+    """OHLCV, VWAP and trade count bars of one interval, built from batches
+    of trades as they arrive.
+
+    Only the bar still open is kept in memory. Bars are aligned to the Unix
+    epoch and labelled by their opening time, so the bars emitted over a
+    whole stream of trades equal those of ``resample(interval,
+    origin="epoch")``, which is the default alignment for any interval
+    dividing a day. Bars without trades are emitted with NaN prices, and
+    zero volume and count.
+
+    Parameters
+    ----------
+    interval : str or Timedelta
+        Bar interval, e.g. ``"15min"``.
+    """
+
+    def __init__(self, interval):
+
+        self.interval = interval
+        self.width = pd.Timedelta(interval) // pd.Timedelta(milliseconds=1)
+
+        self.pending = None  # the bar still open
+        self.last_bin = None  # the bin of the bar last emitted
+
+    def update(self, times, prices, qtys):
+        """Aggregate a batch of trades, sorted by time, and return the bars
+        it closes."""
+        times = np.asarray(times).astype("datetime64[ms]").view(np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        qtys = np.asarray(qtys, dtype=np.float64)
+
+        if not len(times):
+            return self.emit(None)
+
+        bins = times // self.width
+        steps = np.diff(bins)
+
+        if (steps < 0).any() or self.pending is not None and \
+                bins[0] < self.pending["bin"][0]:
+            raise ValueError("Trades must be sorted by time.")
+
+        starts = np.concatenate(([0], np.flatnonzero(steps) + 1))
+        ends = np.append(starts[1:], len(bins))
+
+        bars = {
+            "bin": bins[starts],
+            "open": prices[starts],
+            "high": np.maximum.reduceat(prices, starts),
+            "low": np.minimum.reduceat(prices, starts),
+            "close": prices[ends - 1],
+            "volume": np.add.reduceat(qtys, starts),
+            "notional": np.add.reduceat(prices * qtys, starts),
+            "count": ends - starts,
+        }
+
+        pending = self.pending
+        if pending is not None:
+            if pending["bin"][0] == bars["bin"][0]:
+                # the batch continues the open bar
+                bars["open"][0] = pending["open"][0]
+                bars["high"][0] = max(bars["high"][0], pending["high"][0])
+                bars["low"][0] = min(bars["low"][0], pending["low"][0])
+                for key in ("volume", "notional", "count"):
+                    bars[key][0] += pending[key][0]
+            else:
+                bars = {key: np.concatenate((pending[key], bars[key]))
+                        for key in bars}
+
+        # copied so as not to keep the whole batch alive
+        self.pending = {key: value[-1:].copy() for key, value in bars.items()}
+
+        # bars up to the open one are closed, including those without trades
+        return self.emit({key: value[:-1] for key, value in bars.items()},
+                         stop=bars["bin"][-1])
+
+    def flush(self):
+        """Close and return the bar still open."""
+        bars, self.pending = self.pending, None
+        return self.emit(bars)
+
+    def emit(self, bars, stop=None):
+
+        if bars is None:
+            bars = {key: np.empty(0, dtype=np.int64 if key in ("bin", "count")
+                                  else np.float64)
+                    for key in ("bin", "open", "high", "low", "close",
+                                "volume", "notional", "count")}
+
+        if stop is None:
+            stop = bars["bin"][-1] + 1 if len(bars["bin"]) else 0
+
+        if self.last_bin is not None:
+            start = self.last_bin + 1
+        elif len(bars["bin"]):
+            start = bars["bin"][0]
+        else:
+            start = stop
+
+        stop = max(start, stop)
+        if stop > start:
+            self.last_bin = stop - 1
+
+        positions = bars["bin"] - start
+
+        columns = {}
+        for key in ("open", "high", "low", "close"):
+            columns[key] = np.full(stop - start, np.nan)
+            columns[key][positions] = bars[key]
+        for key in ("volume", "notional", "count"):
+            columns[key] = np.zeros(stop - start, dtype=bars[key].dtype)
+            columns[key][positions] = bars[key]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns["vwap"] = columns.pop("notional") / columns["volume"]
+
+        index = pd.DatetimeIndex(
+            (np.arange(start, stop) * self.width).astype("datetime64[ms]"),
+            name="time")
+
+        return pd.DataFrame(columns, index=index, columns=COLUMNS)
+
+
+class BarBuilder:
+    """Bars of several intervals at once, built from batches of trades.
+
+    Examples
+    --------
+    >>> builder = BarBuilder(["1min", "15min"])
+    >>> for frame in store.iter_read("BTCAUD"):  # doctest: +SKIP
+    ...     for interval, bars in builder.update(frame).items():
+    ...         print(interval, bars)
+
+    Parameters
+    ----------
+    intervals : list of str or Timedelta
+        Bar intervals.
+    """
+
+    def __init__(self, intervals):
+        self.aggregators = {interval: BarAggregator(interval)
+                            for interval in intervals}
+
+    def update(self, trades):
+        """Aggregate a batch of trades (with ``time``, ``price`` and ``qty``
+        columns) and return the bars it closes, keyed by interval."""
+        return {interval: aggregator.update(trades["time"], trades["price"],
+                                            trades["qty"])
+                for interval, aggregator in self.aggregators.items()}
+
+    def flush(self):
+        return {interval: aggregator.flush()
+                for interval, aggregator in self.aggregators.items()}
+
+
+def build_bars(batches, intervals):
+    """Bars of each interval over an iterable of trade batches, which only
+    ever holds one batch in memory."""
+    builder = BarBuilder(intervals)
+    results = {interval: [] for interval in intervals}
+
+    for trades in batches:
+        for interval, bars in builder.update(trades).items():
+            results[interval].append(bars)
+
+    for interval, bars in builder.flush().items():
+        results[interval].append(bars)
+
+    return {interval: pd.concat(frames, axis="index")
+            for interval, frames in results.items()}
@@ -0,0 +1,297 @@
+"""HTTP cache policy and in-process response cache module."""
+import hashlib
+import json
+import math
+import threading
+import time
+
+import requests_cache
+
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import timedelta
+from requests_cache import DO_NOT_CACHE, NEVER_EXPIRE, create_key
+from urllib.parse import parse_qsl, urlsplit
+
+# time to live of responses of each endpoint, in seconds
+DEFAULT_TTLS = {
+    "/api/v3/exchangeInfo": 3600,
+    "/api/v3/historicalTrades": NEVER_EXPIRE,
+    "/api/v3/aggTrades": NEVER_EXPIRE,
+    "/api/v3/myTrades": NEVER_EXPIRE,
+    "/api/v3/klines": NEVER_EXPIRE,
+    "/api/v3/ticker/price": 1,
+    "/api/v3/trades": DO_NOT_CACHE,
+    "/api/v3/depth": DO_NOT_CACHE,
+    "/api/v3/avgPrice": DO_NOT_CACHE,
+    "/api/v3/ticker/bookTicker": DO_NOT_CACHE,
+    "/api/v3/time": DO_NOT_CACHE,
+}
+# endpoints whose pages are immutable once complete
+PAGED_PATHS = {
+    "/api/v3/historicalTrades": 500,  # default limit
+    "/api/v3/aggTrades": 500,
+    "/api/v3/myTrades": 500,
+}
+PAGE_PARAMETERS = ("fromId", "startTime", "endTime")
+API_KEY_HEADER = "X-MBX-APIKEY"
+# changing with every signed request, or secret
+IGNORED_PARAMETERS = ("timestamp", "signature", "recvWindow", API_KEY_HEADER)
+
+
+def account_key(api_key):
+    """Digest identifying the account of ``api_key`` in cache keys, without
+    storing the key itself."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class CachePolicy:
+    """Which responses to cache, and for how long.
+
+    Pages of trades are immutable once complete, so pages requested by id
+    or time range that hold ``limit`` trades are kept forever, while the
+    latest (or a partial) page is not cached at all. Likewise, klines are
+    kept forever unless the last of them is still open. Signed requests are
+    cached by their parameters other than their timestamp and signature,
+    and by the account of their API key, so that accounts sharing a cache
+    never see each other's responses.
+
+    Examples
+    --------
+    >>> session = CachePolicy().create_session("pynance_cache")
+    >>> client = Client(session=session)  # doctest: +SKIP
+
+    Parameters
+    ----------
+    ttls : dict, optional
+        Time to live (seconds, or a ``requests_cache`` expiration constant)
+        of each endpoint. Defaults to :data:`DEFAULT_TTLS`.
+    default_ttl : int, optional
+        Time to live of other endpoints. Defaults to not caching them.
+    """
+
+    def __init__(self, ttls=None, default_ttl=DO_NOT_CACHE):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+
+    def ttl(self, path):
+        """Time to live of responses of ``path``, in seconds, which is 0 if
+        they are not cached and infinite if they never expire."""
+        ttl = self.ttls.get(path, self.default_ttl)
+
+        if ttl == DO_NOT_CACHE:
+            return 0.
+        if ttl == NEVER_EXPIRE:
+            return math.inf
+        if isinstance(ttl, timedelta):
+            return ttl.total_seconds()
+
+        return float(ttl)
+
+    def urls_expire_after(self):
+        return {f"*{path}": ttl for path, ttl in self.ttls.items()}
+
+    def is_cacheable(self, response):
+        """Whether to cache ``response``, which for pages of trades means
+        whether the page is complete, and for klines whether they are all
+        closed."""
+        url = urlsplit(response.url)
+
+        if url.path == "/api/v3/klines":
+            klines = response.json()
+            return bool(klines) and klines[-1][6] < 1e+3 * time.time()
+
+        default_limit = PAGED_PATHS.get(url.path)
+        if default_limit is None:
+            return True
+
+        params = dict(parse_qsl(url.query))
+        if not any(key in params for key in PAGE_PARAMETERS):
+            return False  # the latest trades
+
+        return len(response.json()) >= int(params.get("limit",
+                                                      default_limit))
+
+    def cache_key(self, request, **kwargs):
+        """Key of ``request`` in the cache, as that of ``requests_cache``
+        plus the account for signed requests, whose API key header is
+        otherwise ignored."""
+        key = create_key(request, **kwargs)
+
+        params = dict(parse_qsl(urlsplit(request.url).query))
+        api_key = request.headers.get(API_KEY_HEADER)
+
+        if "signature" in params and api_key is not None:
+            key = hashlib.sha256(f"{key}:{account_key(api_key)}"
+                                 .encode("utf-8")).hexdigest()[:16]
+
+        return key
+
+    def create_session(self, cache_name="pynance_cache", backend="sqlite",
+                       **kwargs):
+        """A ``requests_cache.CachedSession`` following this policy.
+
+        ``backend`` is any of those of ``requests_cache``, e.g. ``"memory"``
+        or ``"filesystem"``, or a backend instance.
+        """
+        return requests_cache.CachedSession(
+            cache_name=cache_name, backend=backend,
+            expire_after=self.default_ttl,
+            urls_expire_after=self.urls_expire_after(),
+            ignored_parameters=IGNORED_PARAMETERS, key_fn=self.cache_key,
+            filter_fn=self.is_cacheable, **kwargs)
+
+
+class LatencyHistogram:
+    """Counts of latencies in logarithmic buckets, from a microsecond to
+    ten seconds with two buckets per decade."""
+
+    edges = [10.**(exponent / 2) for exponent in range(-12, 3)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.edges) + 1)
+        self.total = 0.
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def record(self, seconds):
+        self.counts[bisect_right(self.edges, seconds)] += 1
+        self.total += seconds
+
+    def mean(self):
+        return self.total / len(self) if len(self) else math.nan
+
+    def buckets(self):
+        """Dict of counts keyed by the upper edge of each bucket."""
+        return dict(zip(self.edges + [math.inf], self.counts))
+
+
+class MemoryCache:
+    """In-process LRU cache of JSON responses, bounded in bytes.
+
+    Sits in front of the session of a :class:`pynance.client.Client`
+    (which may itself be a persistent ``requests_cache`` session), so that
+    repeated requests within a process are answered from memory, without
+    going through ``requests`` at all. Responses expire and are cached or
+    not as decided by a :class:`CachePolicy`.
+
+    Examples
+    --------
+    >>> client = Client(memory_cache=MemoryCache(max_bytes=2**28))
+    >>> client.exchange_info()  # doctest: +SKIP
+    >>> client.memory_cache.hits  # doctest: +SKIP
+    0
+
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum total size of the cached response bodies. Least recently
+        used responses are evicted beyond it.
+    policy : CachePolicy, optional
+        Defaults to ``CachePolicy()``.
+    decoded : bool
+        Store decoded responses, so that hits skip decoding too. Hits then
+        return the same object every time, which must not be mutated.
+    """
+
+    def __init__(self, max_bytes=2**26, policy=None, decoded=False,
+                 clock=time.monotonic):
+
+        self.max_bytes = max_bytes
+        self.policy = CachePolicy() if policy is None else policy
+        self.decoded = decoded
+        self.clock = clock
+
+        self.entries = OrderedDict()  # key: (value, size, expires)
+        self.num_bytes = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.hit_latency = LatencyHistogram()
+        self.miss_latency = LatencyHistogram()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else math.nan
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.num_bytes = 0
+
+    def lookup(self, key):
+
+        with self.lock:
+
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            value, size, expires = entry
+            if expires <= self.clock():
+                del self.entries[key]
+                self.num_bytes -= size
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def store(self, key, value, size, ttl):
+
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.num_bytes -= previous[1]
+
+            self.entries[key] = value, size, self.clock() + ttl
+            self.num_bytes += size
+
+            while self.num_bytes > self.max_bytes:
+                _, (_, evicted, _) = self.entries.popitem(last=False)
+                self.num_bytes -= evicted
+
+    def get_json(self, path, params, fetch, api_key=None, raw=False):
+        """Decoded response to ``path`` with ``params``, from memory or else
+        from the response returned by ``fetch()``.
+
+        ``api_key`` is that of signed requests, whose responses are only
+        ever returned to requests of the same account. If ``raw``, the
+        response body is returned as bytes instead, undecoded.
+        """
+        start = time.perf_counter()
+
+        decoded = self.decoded and not raw
+        account = None if api_key is None else account_key(api_key)
+        key = path, tuple(sorted(params.items())), account, decoded
+        value = self.lookup(key)
+
+        if value is not None:
+            if not decoded and not raw:
+                value = json.loads(value)
+            with self.lock:
+                self.hits += 1
+                self.hit_latency.record(time.perf_counter() - start)
+            return value
+
+        response = fetch()
+        result = response.content if raw else response.json()
+
+        ttl = self.policy.ttl(path)
+        if ttl > 0 and self.policy.is_cacheable(response):
+            self.store(key, result if decoded else response.content,
+                       size=len(response.content), ttl=ttl)
+
+        with self.lock:
+            self.misses += 1
+            self.miss_latency.record(time.perf_counter() - start)
+
+        return result
@@ -0,0 +1,228 @@
+"""HTTP client module."""
+import requests
+
+from .auth import Signer
+from .cache import API_KEY_HEADER
+from .ratelimit import RATE_LIMIT_STATUSES
+from .utils import RETRY_STATUSES, ClockSync, create_adapter, mount_adapter
+
+BASE_URL = "https://api.binance.com"
+# times a request rejected for exceeding a rate limit is paced and resent
+MAX_RATE_LIMITED = 10
+
+
+class Client:
+    """Binance REST client backed by a single pooled, keep-alive session.
+
+    Connections are pooled per host by the session's adapter, so repeated
+    calls reuse established TCP/TLS connections instead of handshaking on
+    every request. Failed requests (connection errors and retryable status
+    codes) are retried with exponential backoff.
+
+    Parameters
+    ----------
+    api_key, secret_key : str, optional
+        Credentials. Only required for signed endpoints.
+    base_url : str
+        Scheme and host of the API.
+    session : requests.Session, optional
+        Session to route requests through, e.g. one from
+        :func:`pynance.utils.create_session`. Defaults to a plain
+        (non-caching) session.
+    pool_connections : int
+        Number of per-host connection pools to keep.
+    pool_maxsize : int
+        Maximum number of connections kept alive per host.
+    max_retries : int
+        Maximum number of retries per request.
+    backoff_factor : float
+        Backoff factor between retries, in seconds.
+    timeout : float
+        Connect and read timeout, in seconds.
+    rate_limiter : pynance.ratelimit.RateLimiter, optional
+        If given, requests are paced to stay within the exchange's request
+        weight and order count limits. Requests rejected for exceeding them
+        anyway are then resent once the limiter allows, rather than retried
+        by the session's adapter, so that every thread backs off.
+    clock_sync : pynance.utils.ClockSync, optional
+        If given, signed requests are timestamped in server time from it.
+        See also :meth:`sync_clock`.
+    memory_cache : pynance.cache.MemoryCache, optional
+        If given, decoded responses are looked up in it before requesting.
+    """
+
+    def __init__(self, api_key=None, secret_key=None, base_url=BASE_URL,
+                 session=None, pool_connections=10, pool_maxsize=10,
+                 max_retries=3, backoff_factor=0.3, timeout=10.,
+                 rate_limiter=None, clock_sync=None, memory_cache=None):
+
+        if session is None:
+            session = requests.Session()
+
+        session.headers.update({"Connection": "keep-alive"})
+        if api_key is not None:
+            session.headers.update({API_KEY_HEADER: api_key})
+
+        retry_statuses = RETRY_STATUSES if rate_limiter is None else \
+            [status for status in RETRY_STATUSES
+             if status not in RATE_LIMIT_STATUSES]
+
+        adapter = create_adapter(pool_connections=pool_connections,
+                                 pool_maxsize=pool_maxsize,
+                                 max_retries=max_retries,
+                                 backoff_factor=backoff_factor,
+                                 retry_statuses=retry_statuses,
+                                 respect_retry_after=rate_limiter is None)
+
+        self.session = mount_adapter(session, adapter)
+        self.base_url = base_url.rstrip("/")
+        self.secret_key = secret_key
+        self.signer = None if secret_key is None \
+            else Signer(secret_key, clock=clock_sync)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.clock_sync = clock_sync
+        self.owns_clock_sync = False
+        self.memory_cache = memory_cache
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.owns_clock_sync:
+            self.clock_sync.stop()
+        self.session.close()
+
+    def sync_clock(self, interval=60., window=8):
+        """Track the server time in the background, sampling it every
+        ``interval`` seconds, and timestamp signed requests with it.
+
+        Returns the :class:`pynance.utils.ClockSync`.
+        """
+        self.clock_sync = ClockSync(self.server_time, interval=interval,
+                                    window=window).start()
+        self.owns_clock_sync = True
+
+        if self.signer is not None:
+            self.signer.clock = self.clock_sync
+
+        return self.clock_sync
+
+    def request(self, method, path, params=None, signed=False):
+
+        params = {key: value for key, value in (params or {}).items()
+                  if value is not None}
+
+        for _ in range(MAX_RATE_LIMITED + 1):
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(path, params)
+
+            query = params
+            if signed:  # sign after waiting so the timestamp is fresh
+                query = self.signer.sign(params)
+
+            response = None
+            try:
+                response = self.session.request(method, self.base_url + path,
+                                                params=query,
+                                                timeout=self.timeout)
+            finally:
+                if self.rate_limiter is not None:
+                    self._release(path, params, response)
+
+            if self.rate_limiter is None or \
+                    response.status_code not in RATE_LIMIT_STATUSES:
+                break
+
+        response.raise_for_status()
+
+        return response
+
+    def _release(self, path, params, response):
+
+        if response is None or getattr(response, "from_cache", False):
+            # nothing reached the exchange, or headers are stale
+            self.rate_limiter.release(path, params)
+        else:
+            self.rate_limiter.release(path, params, headers=response.headers,
+                                      status=response.status_code)
+
+    def get(self, path, params=None, signed=False):
+        return self.request("GET", path, params=params, signed=signed)
+
+    def get_json(self, path, params=None, signed=False, raw=False):
+        """Decoded response to ``path`` with ``params``, or its raw body as
+        bytes if ``raw``, e.g. to decode with
+        :func:`pynance.decoding.decode_trades` in a single pass."""
+        if self.memory_cache is None:
+            response = self.get(path, params=params, signed=signed)
+            return response.content if raw else response.json()
+
+        params = {key: value for key, value in (params or {}).items()
+                  if value is not None}
+
+        api_key = self.session.headers.get(API_KEY_HEADER) if signed else None
+
+        return self.memory_cache.get_json(
+            path, params, lambda: self.get(path, params=params, signed=signed),
+            api_key=api_key, raw=raw)
+
+    def get_content(self, path, params=None, signed=False):
+        """Raw body of the response to ``path`` with ``params``."""
+        return self.get_json(path, params=params, signed=signed, raw=True)
+
+    def server_time(self):
+        return self.get_json("/api/v3/time").get("serverTime")
+
+    def exchange_info(self):
+        return self.get_json("/api/v3/exchangeInfo")
+
+    def trades(self, symbol, limit=None, raw=False):
+        return self.get_json("/api/v3/trades",
+                             params=dict(symbol=symbol, limit=limit), raw=raw)
+
+    def historical_trades(self, symbol, limit=None, from_id=None, raw=False):
+        return self.get_json("/api/v3/historicalTrades",
+                             params=dict(symbol=symbol, limit=limit,
+                                         fromId=from_id), raw=raw)
+
+    def agg_trades(self, symbol, limit=None, from_id=None, start_time=None,
+                   end_time=None):
+        return self.get_json("/api/v3/aggTrades",
+                             params=dict(symbol=symbol, limit=limit,
+                                         fromId=from_id, startTime=start_time,
+                                         endTime=end_time))
+
+    def klines(self, symbol, interval, limit=None, start_time=None,
+               end_time=None):
+        return self.get_json("/api/v3/klines",
+                             params=dict(symbol=symbol, interval=interval,
+                                         limit=limit, startTime=start_time,
+                                         endTime=end_time))
+
+    def depth(self, symbol, limit=None):
+        return self.get_json("/api/v3/depth",
+                             params=dict(symbol=symbol, limit=limit))
+
+    def avg_price(self, symbol):
+        return self.get_json("/api/v3/avgPrice", params=dict(symbol=symbol))
+
+    def ticker_price(self, symbol=None):
+        return self.get_json("/api/v3/ticker/price",
+                             params=dict(symbol=symbol))
+
+    def book_ticker(self, symbol=None):
+        return self.get_json("/api/v3/ticker/bookTicker",
+                             params=dict(symbol=symbol))
+
+    def my_trades(self, symbol, limit=None, from_id=None, start_time=None,
+                  end_time=None, raw=False):
+        return self.get_json("/api/v3/myTrades",
+                             params=dict(symbol=symbol, limit=limit,
+                                         fromId=from_id, startTime=start_time,
+                                         endTime=end_time),
+                             signed=True, raw=raw)
@@ -0,0 +1,279 @@
+"""Decoding of JSON response payloads into typed columns."""
+import io
+
+import numpy as np
+import pandas as pd
+
+from .fixedpoint import to_fixed
+
+# dtypes of the fields of `/trades`, `/historicalTrades` and `/myTrades`
+TRADE_DTYPES = {
+    "id": np.int64,
+    "orderId": np.int64,
+    "orderListId": np.int64,
+    "price": np.float64,
+    "qty": np.float64,
+    "quoteQty": np.float64,
+    "commission": np.float64,
+    "time": np.dtype("datetime64[ms]"),
+    "isBuyer": np.bool_,
+    "isMaker": np.bool_,
+    "isBuyerMaker": np.bool_,
+    "isBestMatch": np.bool_,
+    "symbol": np.object_,
+    "commissionAsset": np.object_,
+}
+
+# fields of `/trades` and `/historicalTrades`, and of `/myTrades`, in order
+TRADE_FIELDS = ["id", "price", "qty", "quoteQty", "time", "isBuyerMaker",
+                "isBestMatch"]
+MY_TRADE_FIELDS = ["symbol", "id", "orderId", "orderListId", "price", "qty",
+                   "quoteQty", "commission", "commissionAsset", "time",
+                   "isBuyer", "isMaker", "isBestMatch"]
+
+# column name and dtype of each single-letter key of `/aggTrades`
+AGG_TRADE_COLUMNS = {
+    "a": "id",
+    "p": "price",
+    "q": "qty",
+    "f": "firstId",
+    "l": "lastId",
+    "T": "time",
+    "m": "isBuyerMaker",
+    "M": "isBestMatch",
+}
+AGG_TRADE_DTYPES = {key: TRADE_DTYPES.get(name, np.int64)
+                    for key, name in AGG_TRADE_COLUMNS.items()}
+
+# names and dtypes of the fields of each kline (candlestick) of `/klines`,
+# in order, without the last, unused, one
+KLINE_DTYPES = {
+    "openTime": np.dtype("datetime64[ms]"),
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "closeTime": np.dtype("datetime64[ms]"),
+    "quoteVolume": np.float64,
+    "count": np.int64,
+    "takerBuyVolume": np.float64,
+    "takerBuyQuoteVolume": np.float64,
+}
+
+WHITESPACE = b" \t\r\n"
+
+# turns `key:value` pairs into `key,value` and drops JSON punctuation
+PUNCTUATION = bytes.maketrans(b":", b",")
+
+
+def strip_whitespace(body):
+    """``body`` without the whitespace between JSON tokens, keeping that in
+    strings, which are assumed to have no escaped quotes."""
+    stripped = body.translate(None, delete=WHITESPACE)
+
+    if len(stripped) == len(body):  # compact, as responses are
+        return stripped
+
+    parts = body.split(b'"')  # strings are every other part
+    parts[::2] = [part.translate(None, delete=WHITESPACE)
+                  for part in parts[::2]]
+
+    return b'"'.join(parts)
+
+
+def empty_columns(dtypes, fields):
+    return {key: np.empty(0, dtype=dtypes.get(key, np.object_))
+            for key in fields}
+
+
+def decode_bytes(body, dtypes, fields):
+
+    # one record per line, as CSV of alternating keys and values, which
+    # holds as long as strings have no JSON punctuation, as symbols and
+    # assets do not
+    body = strip_whitespace(body) \
+        .replace(b"},{", b"\n") \
+        .translate(PUNCTUATION, delete=b'"[]{}')
+
+    if not body:
+        return empty_columns(dtypes, fields)
+
+    keys = [key.decode("utf-8")
+            for key in body.partition(b"\n")[0].split(b",")[::2]]
+
+    parse_dtypes = {}
+    for i, key in enumerate(keys):
+
+        dtype = np.dtype(dtypes.get(key, np.object_))
+
+        if dtype.kind == "M":  # timestamps are integers since the epoch
+            parse_dtypes[2 * i + 1] = np.int64
+        elif dtype.kind in "if":
+            parse_dtypes[2 * i + 1] = dtype
+
+    # parses all columns in a single pass of the C parser
+    frame = pd.read_csv(io.BytesIO(body), header=None, engine="c",
+                        usecols=range(1, 2 * len(keys), 2),
+                        dtype=parse_dtypes, true_values=["true"],
+                        false_values=["false"], keep_default_na=False,
+                        float_precision="round_trip")
+
+    columns = {}
+    for i, key in enumerate(keys):
+
+        dtype = np.dtype(dtypes.get(key, np.object_))
+        column = frame[2 * i + 1].to_numpy()
+
+        columns[key] = column.view(dtype) if dtype.kind == "M" else \
+            column.astype(dtype, copy=False)
+
+    return columns
+
+
+def decode_records(records, dtypes, fields):
+
+    if not records:
+        return empty_columns(dtypes, fields)
+
+    columns = {}
+    for key in records[0]:
+
+        dtype = np.dtype(dtypes.get(key, np.object_))
+
+        if dtype.kind == "M":
+            column = np.fromiter((record[key] for record in records),
+                                 dtype=np.int64, count=len(records)) \
+                       .view(dtype)
+        elif dtype.kind == "f":  # numbers are quoted
+            column = np.fromiter((float(record[key]) for record in records),
+                                 dtype=dtype, count=len(records))
+        else:
+            column = np.fromiter((record[key] for record in records),
+                                 dtype=dtype, count=len(records))
+
+        columns[key] = column
+
+    return columns
+
+
+def to_fixed_columns(columns, decimals):
+
+    for key, num_decimals in (decimals or {}).items():
+        if key in columns:
+            columns[key] = to_fixed(columns[key], num_decimals)
+
+    return columns
+
+
+def decode_trades(trades, dtypes=TRADE_DTYPES, decimals=None, fields=None):
+    """Decode a trades payload into a dict of typed NumPy columns.
+
+    Parameters
+    ----------
+    trades : bytes, str or list of dict
+        Raw response body, or the already parsed list of trades. Raw bodies
+        are decoded directly, without building a dict per trade.
+    dtypes : dict
+        Mapping from field name to dtype. Fields not listed are kept as
+        Python objects.
+    decimals : dict, optional
+        Mapping from field name to number of decimals, e.g. from
+        :func:`pynance.fixedpoint.symbol_decimals`. Listed fields are
+        decoded to fixed-point int64 instead of float64.
+    fields : list of str, optional
+        Fields of an empty payload, which lists none, e.g.
+        :data:`MY_TRADE_FIELDS`. Defaults to :data:`TRADE_FIELDS`.
+
+    Returns
+    -------
+    dict
+        Mapping from field name to array, one element per trade.
+    """
+    if fields is None:
+        fields = TRADE_FIELDS
+
+    if isinstance(trades, str):
+        trades = trades.encode("utf-8")
+
+    if isinstance(trades, (bytes, bytearray, memoryview)):
+        columns = decode_bytes(bytes(trades), dtypes, fields)
+    else:
+        columns = decode_records(trades, dtypes, fields)
+
+    return to_fixed_columns(columns, decimals)
+
+
+def create_trades_frame(trades, dtypes=TRADE_DTYPES, decimals=None,
+                        fields=None):
+    """Decode a trades payload into a :class:`pandas.DataFrame`."""
+    return pd.DataFrame(decode_trades(trades, dtypes=dtypes,
+                                      decimals=decimals, fields=fields),
+                        copy=False)
+
+
+def decode_agg_trades(agg_trades, decimals=None):
+    """Decode an aggregate trades payload into a dict of typed NumPy columns,
+    named as those of trades (e.g. ``"a"`` as ``"id"`` and ``"T"`` as
+    ``"time"``) by :data:`AGG_TRADE_COLUMNS`.
+
+    See :func:`decode_trades` for the parameters, where ``decimals`` is keyed
+    by column name.
+    """
+    columns = decode_trades(agg_trades, dtypes=AGG_TRADE_DTYPES,
+                            fields=list(AGG_TRADE_DTYPES))
+    columns = {AGG_TRADE_COLUMNS.get(key, key): column
+               for key, column in columns.items()}
+
+    return to_fixed_columns(columns, decimals)
+
+
+def create_agg_trades_frame(agg_trades, decimals=None):
+    """Decode an aggregate trades payload into a
+    :class:`pandas.DataFrame`."""
+    return pd.DataFrame(decode_agg_trades(agg_trades, decimals=decimals),
+                        copy=False)
+
+
+def decode_klines(klines, decimals=None):
+    """Decode a klines payload, a list of lists, into a dict of typed NumPy
+    columns named by :data:`KLINE_DTYPES`.
+
+    See :func:`decode_trades` for the parameters.
+    """
+    if isinstance(klines, str):
+        klines = klines.encode("utf-8")
+
+    dtypes = [np.dtype(dtype) for dtype in KLINE_DTYPES.values()]
+    # timestamps are integers since the epoch
+    parse_dtypes = [np.dtype(np.int64) if dtype.kind == "M" else dtype
+                    for dtype in dtypes]
+
+    body = None
+    if isinstance(klines, (bytes, bytearray, memoryview)):
+        # one kline per line, as CSV
+        body = bytes(klines).translate(None, delete=b' \t\r\n"') \
+                            .replace(b"],[", b"\n").strip(b"[]")
+        klines = []
+
+    if body:
+        frame = pd.read_csv(io.BytesIO(body), header=None, engine="c",
+                            usecols=range(len(dtypes)),
+                            dtype=dict(enumerate(parse_dtypes)),
+                            float_precision="round_trip")
+        columns = [frame[i].to_numpy() for i in range(len(dtypes))]
+    else:
+        # numbers are quoted
+        columns = [np.array([kline[i] for kline in klines],
+                            dtype=object).astype(dtype)
+                   for i, dtype in enumerate(parse_dtypes)]
+
+    columns = {key: column.view(dtype)
+               for key, dtype, column in zip(KLINE_DTYPES, dtypes, columns)}
+
+    return to_fixed_columns(columns, decimals)
+
+
+def create_klines_frame(klines, decimals=None):
+    """Decode a klines payload into a :class:`pandas.DataFrame`."""
+    return pd.DataFrame(decode_klines(klines, decimals=decimals), copy=False)
@@ -0,0 +1,100 @@
+"""Vectorized order book analytics.
+
+Functions operate on arrays of book levels of shape ``(..., levels)``,
+typically ``(snapshots, levels)``, ordered from the best level outwards.
+Missing levels are padded with a price of NaN and a quantity of zero.
+"""
+import numpy as np
+
+
+def book_arrays(snapshots, num_levels=None):
+    """Stack ``/api/v3/depth`` snapshots (or streamed partial books) into
+    arrays.
+
+    Returns the ``bid_prices``, ``bid_qtys``, ``ask_prices`` and
+    ``ask_qtys``, each of shape ``(snapshots, num_levels)``.
+    """
+    if num_levels is None:
+        num_levels = max((max(len(snapshot["bids"]), len(snapshot["asks"]))
+                          for snapshot in snapshots), default=0)
+
+    shape = (len(snapshots), num_levels)
+    arrays = {}
+
+    for side in ("bids", "asks"):
+
+        prices = np.full(shape, np.nan)
+        qtys = np.zeros(shape)
+
+        for i, snapshot in enumerate(snapshots):
+            levels = snapshot[side][:num_levels]
+            if levels:
+                levels = np.array(levels, dtype=np.float64)
+                prices[i, :len(levels)] = levels[:, 0]
+                qtys[i, :len(levels)] = levels[:, 1]
+
+        arrays[side] = prices, qtys
+
+    return arrays["bids"] + arrays["asks"]
+
+
+def cumulative_depth(qtys):
+    """Total quantity available at or better than each level."""
+    return np.cumsum(qtys, axis=-1)
+
+
+def fill(qtys, size):
+    """Quantity taken from each level by a market order of ``size``."""
+    size = np.expand_dims(size, axis=-1)
+    before = cumulative_depth(qtys) - qtys
+
+    return np.clip(size - before, 0., qtys)
+
+
+def vwap(prices, qtys, size):
+    """Volume-weighted average fill price of a market order of ``size``
+    walking the levels of one side of the book.
+
+    NaN where the side does not hold ``size``.
+    """
+    filled = fill(qtys, size)
+    total = filled.sum(axis=-1)
+
+    notional = np.where(filled > 0., prices * filled, 0.).sum(axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(np.isclose(total, size), notional / total, np.nan)
+
+
+def impact(prices, qtys, size):
+    """Relative price impact of a market order of ``size``, i.e. how far
+    its VWAP is from the best price (positive for asks, negative for
+    bids)."""
+    return vwap(prices, qtys, size) / prices[..., 0] - 1.
+
+
+def mid_price(bid_prices, ask_prices):
+    return 0.5 * (bid_prices[..., 0] + ask_prices[..., 0])
+
+
+def spread(bid_prices, ask_prices):
+    return ask_prices[..., 0] - bid_prices[..., 0]
+
+
+def microprice(bid_prices, bid_qtys, ask_prices, ask_qtys):
+    """Mid price weighted towards the side with less quantity at the top,
+    which is the side more likely to be depleted next."""
+    bid_qty = bid_qtys[..., 0]
+    ask_qty = ask_qtys[..., 0]
+
+    return (bid_prices[..., 0] * ask_qty + ask_prices[..., 0] * bid_qty) / \
+        (bid_qty + ask_qty)
+
+
+def imbalance(bid_qtys, ask_qtys, n=1):
+    """Imbalance ``(bids - asks) / (bids + asks)`` of the quantity in the
+    top ``n`` levels, between -1 (all asks) and 1 (all bids)."""
+    bids = bid_qtys[..., :n].sum(axis=-1)
+    asks = ask_qtys[..., :n].sum(axis=-1)
+
+    return (bids - asks) / (bids + asks)
@@ -0,0 +1,193 @@
+"""Downsampling module, reducing data to what a figure can show."""
+import numpy as np
+
+METHODS = ("minmax", "lttb")
+
+# rows binned at a time, bounding the temporaries of :func:`bin2d`
+CHUNK_SIZE = 2**22
+
+
+def to_numeric(values):
+    """Values as a NumPy array that supports arithmetic, viewing datetimes
+    as integers."""
+    values = np.asarray(values)
+
+    if values.dtype.kind in "mM":
+        return values.view(np.int64)
+
+    return values
+
+
+def minmax(x, y, num_bins):
+    """Positions of the first, last, lowest and highest points in each of
+    ``num_bins`` bins of equal width along ``x``.
+
+    Drawn as a line ``num_bins`` pixels wide, these are indistinguishable
+    from all the points, since every pixel column spans exactly the same
+    values, while taking at most four points per pixel.
+
+    Parameters
+    ----------
+    x : array-like
+        Sorted values (e.g. times) of the series.
+    y : array-like
+        Values of the series.
+    num_bins : int
+        Number of bins, e.g. the width of the axes in pixels.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sorted positions of the points to keep.
+    """
+    x = to_numeric(x)
+    y = np.asarray(y)
+
+    if len(x) <= 4 * num_bins:
+        return np.arange(len(x))
+
+    edges = np.linspace(x[0], x[-1], num_bins + 1)[1:-1]
+    bounds = np.concatenate([[0], np.searchsorted(x, edges), [len(x)]])
+
+    indices = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if lo < hi:
+            segment = y[lo:hi]
+            indices.extend((lo, lo + segment.argmin(), lo + segment.argmax(),
+                            hi - 1))
+
+    return np.unique(indices)
+
+
+def lttb(x, y, num_points):
+    """Positions of ``num_points`` points chosen by Largest-Triangle-Three-
+    Buckets, which keeps, of each bucket of consecutive points, the one
+    forming the largest triangle with the point kept before it and the
+    average of the next bucket.
+
+    Unlike :func:`minmax`, ``x`` need not be sorted, so that it also
+    reduces curves such as one price against another over time.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sorted positions of the points to keep, including the first and
+        last.
+    """
+    x = to_numeric(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    length = len(x)
+    if num_points >= length or num_points < 3:
+        return np.arange(length)
+
+    # relative to the first point, to keep precision with datetimes
+    x = (x - x[0]).astype(np.float64)
+
+    edges = np.linspace(1, length - 1, num_points - 1).astype(np.intp)
+    edges = np.append(edges, length)  # the last point as the last bucket
+
+    indices = np.empty(num_points, dtype=np.intp)
+    indices[0] = a = 0
+    indices[-1] = length - 1
+
+    for i in range(num_points - 2):
+
+        lo, hi, end = edges[i], edges[i + 1], edges[i + 2]
+        xc, yc = x[hi:end].mean(), y[hi:end].mean()
+
+        # twice the area of each triangle
+        area = np.abs((x[a] - xc) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (yc - y[a]))
+
+        indices[i + 1] = a = lo + area.argmax()
+
+    return indices
+
+
+def decimate(x, y, num_pixels, method="minmax"):
+    """Positions of the points of a series to draw as a line
+    ``num_pixels`` wide, by either :func:`minmax` or :func:`lttb`.
+
+    Examples
+    --------
+    >>> width, height = style.pixels  # doctest: +SKIP
+    >>> indices = decimate(frame.time, frame.price, width)  # doctest: +SKIP
+    >>> data = frame.iloc[indices]  # doctest: +SKIP
+    >>> ax.plot(data.time, data.price)  # doctest: +SKIP
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of "
+                         f"{METHODS}")
+
+    if method == "minmax":
+        return minmax(x, y, num_pixels)
+
+    return lttb(x, y, num_pixels)
+
+
+def bin_positions(values, lo, scale, size):
+    """Bins of ``values`` of width ``1 / scale`` from ``lo``, the largest
+    value included in the last."""
+    return np.minimum(((values - lo) * scale).astype(np.intp), size - 1)
+
+
+def bin2d(x, y, num_bins, weights=None):
+    """Counts (or sums of ``weights``) of points in a grid of ``num_bins``
+    bins spanning ``x`` and ``y``, to draw as an image in place of a
+    scatter plot of millions of points.
+
+    Points are binned ``CHUNK_SIZE`` at a time, so that memory besides the
+    grid stays bounded.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Coordinates of the points, which may be datetimes.
+    num_bins : tuple of int
+        Number of bins along ``x`` and ``y``, e.g. the size of the axes in
+        pixels.
+    weights : array-like, optional
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        Array of shape ``(num_bins[1], num_bins[0])``, with rows along
+        ``y``, as expected by ``imshow`` and ``pcolormesh``.
+    xedges, yedges : numpy.ndarray
+        Edges of the bins, of the same dtypes as ``x`` and ``y``.
+    """
+    dtypes = np.asarray(x).dtype, np.asarray(y).dtype
+    x, y = to_numeric(x), to_numeric(y)
+
+    counts = np.zeros(num_bins[0] * num_bins[1], dtype=np.float64)
+
+    if not len(x):
+        return counts.reshape(num_bins[::-1]), np.empty(0, dtypes[0]), \
+            np.empty(0, dtypes[1])
+
+    limits = [(values.min(), values.max()) for values in (x, y)]
+    scales = [size / ((hi - lo) or 1)
+              for size, (lo, hi) in zip(num_bins, limits)]
+
+    for start in range(0, len(x), CHUNK_SIZE):
+
+        chunk = slice(start, start + CHUNK_SIZE)
+        cols, rows = (bin_positions(values[chunk], lo, scale, size)
+                      for values, (lo, hi), scale, size
+                      in zip((x, y), limits, scales, num_bins))
+
+        chunk_weights = None if weights is None \
+            else np.asarray(weights)[chunk]
+        counts += np.bincount(rows * num_bins[0] + cols,
+                              weights=chunk_weights, minlength=counts.size)
+
+    xedges, yedges = (np.linspace(lo, hi, size + 1)
+                      for (lo, hi), size in zip(limits, num_bins))
+
+    if dtypes[0].kind in "mM":
+        xedges = xedges.astype(np.int64).view(dtypes[0])
+    if dtypes[1].kind in "mM":
+        yedges = yedges.astype(np.int64).view(dtypes[1])
+
+    return counts.reshape(num_bins[::-1]), xedges, yedges
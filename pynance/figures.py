@@ -0,0 +1,245 @@
+"""Cached, parallel figure rendering module."""
+import hashlib
+import inspect
+import json
+import pickle
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+GOLDEN_RATIO = 0.5 * (1 + np.sqrt(5))
+WIDTH = 397.48499  # text width of the paper, in points
+
+MANIFEST = ".figures.json"
+
+
+def pt_to_in(x):
+    pt_per_in = 72.27
+    return x / pt_per_in
+
+
+class Style:
+    """Style of a set of figures, i.e. the arguments of ``sns.set`` along
+    with the size, resolution and formats of the figures.
+
+    Parameters
+    ----------
+    context, style, palette, font : str
+        Arguments of ``sns.set``.
+    width : float
+        Width in inches.
+    height : float, optional
+        Height in inches. Defaults to ``width / aspect``.
+    aspect : float
+    dpi : float
+    transparent : bool
+    usetex : bool
+        Render text with LaTeX.
+    extensions : sequence of str
+        Formats to save each figure in.
+    """
+
+    def __init__(self, context="paper", style="ticks", palette="muted",
+                 font="serif", width=pt_to_in(WIDTH), height=None,
+                 aspect=GOLDEN_RATIO,
+                 dpi=300, transparent=False, usetex=False,
+                 extensions=("png",)):
+
+        self.context = context
+        self.style = style
+        self.palette = palette
+        self.font = font
+        self.width = width
+        self.height = width / aspect if height is None else height
+        self.dpi = dpi
+        self.transparent = transparent
+        self.usetex = usetex
+        self.extensions = list(extensions)
+
+    @property
+    def figsize(self):
+        return self.width, self.height
+
+    @property
+    def pixels(self):
+        """Width and height of figures in pixels, i.e. the most points they
+        can tell apart along each axis."""
+        return round(self.width * self.dpi), round(self.height * self.dpi)
+
+    @property
+    def suffix(self):
+        return f"{self.context}_{self.width*self.dpi:.0f}x" \
+               f"{self.height*self.dpi:.0f}"
+
+    def params(self):
+        return dict(vars(self))
+
+    def apply(self):
+        """Set the style globally, as the preamble of every script."""
+        rc = {
+            "figure.figsize": self.figsize,
+            "font.serif": ["Times New Roman"],
+            "text.usetex": self.usetex,
+        }
+        sns.set(context=self.context, style=self.style, palette=self.palette,
+                font=self.font, rc=rc)
+
+
+def update_hash(hasher, obj):
+    """Feed the contents of ``obj`` to ``hasher``, hashing arrays and
+    frames by their values rather than their pickles."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        hasher.update(pickle.dumps((type(obj).__name__, obj.shape,
+                                    getattr(obj, "columns", None),
+                                    str(getattr(obj, "dtypes", None)))))
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(pickle.dumps((obj.dtype.str, obj.shape)))
+        hasher.update(np.ascontiguousarray(obj).view(np.uint8))
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(pickle.dumps((type(obj).__name__, len(obj))))
+        for item in obj:
+            update_hash(hasher, item)
+    elif isinstance(obj, dict):
+        hasher.update(pickle.dumps(("dict", len(obj))))
+        for key in sorted(obj, key=repr):
+            update_hash(hasher, key)
+            update_hash(hasher, obj[key])
+    else:
+        hasher.update(pickle.dumps(obj))
+
+
+def function_source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return func.__code__.co_code
+
+
+class Figure:
+    """A figure to render, by calling ``plot(*args, ax=ax, **kwargs)`` on new
+    axes, where ``plot`` is a module-level function (so that it can be
+    called in another process).
+
+    Its key hashes the source of ``plot``, its arguments and the style, so
+    that it only changes when the figure would.
+    """
+
+    def __init__(self, name, plot, *args, **kwargs):
+        self.name = name
+        self.plot = plot
+        self.args = args
+        self.kwargs = kwargs
+
+    def key(self, style):
+
+        name = f"{self.plot.__module__}.{self.plot.__qualname__}"
+
+        hasher = hashlib.sha256()
+        update_hash(hasher, (name, function_source(self.plot), self.args,
+                             self.kwargs, style.params()))
+
+        return hasher.hexdigest()
+
+
+def render(figure, style, paths):
+    """Render ``figure`` and save it to each of ``paths``, with a
+    non-interactive backend."""
+    matplotlib.use("Agg")
+    style.apply()
+
+    fig, ax = plt.subplots()
+    result = figure.plot(*figure.args, ax=ax, **figure.kwargs)
+    if isinstance(result, matplotlib.figure.Figure):
+        fig = result
+
+    fig.tight_layout()
+    for path in paths:
+        fig.savefig(path, dpi=style.dpi, transparent=style.transparent)
+
+    plt.close("all")
+
+    return figure.name
+
+
+class FigureRenderer:
+    """Renders figures into ``output_dir``, skipping those that are
+    unchanged since they were last rendered there, and rendering the others
+    in a pool of ``max_workers`` processes.
+
+    Figure ``name`` is saved as ``<output_dir>/<name>_<suffix>.<extension>``
+    for every extension of the style, and the keys of the figures rendered
+    are kept in ``<output_dir>/.figures.json``.
+
+    Examples
+    --------
+    >>> def plot_prices(frame, ax):
+    ...     ax.plot(frame.time, frame.price)
+    >>> renderer = FigureRenderer("figures/", Style(extensions=["png"]))
+    >>> figures = [Figure("prices", plot_prices, frame)]
+    >>> renderer.render(figures)  # doctest: +SKIP
+    ['prices']
+    >>> renderer.render(figures)  # doctest: +SKIP
+    []
+    """
+
+    def __init__(self, output_dir, style=None, max_workers=None):
+        self.output_dir = Path(output_dir)
+        self.style = Style() if style is None else style
+        self.max_workers = max_workers
+
+    @property
+    def manifest_path(self):
+        return self.output_dir.joinpath(MANIFEST)
+
+    def load_manifest(self):
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def paths(self, figure):
+        return [self.output_dir.joinpath(f"{figure.name}_{self.style.suffix}"
+                                         f".{extension}")
+                for extension in self.style.extensions]
+
+    def render(self, figures):
+        """Render those of ``figures`` that changed, and return their
+        names."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest()
+
+        pending = {}
+        for figure in figures:
+
+            key = figure.key(self.style)
+            paths = self.paths(figure)
+
+            if manifest.get(figure.name) == key and \
+                    all(path.exists() for path in paths):
+                continue
+
+            pending[figure.name] = figure, key, paths
+
+        if not pending:
+            return []
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(render, figure, self.style, paths)
+                           for figure, key, paths in pending.values()]
+                for future in futures:
+                    name = future.result()
+                    manifest[name] = pending[name][1]
+        finally:
+            # keep those rendered, even if others failed
+            with open(self.manifest_path, "w") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+
+        return list(pending)
@@ -0,0 +1,135 @@
+"""Fixed-point (scaled int64) representation of prices and quantities.
+
+A value ``x`` with ``decimals`` digits after the decimal point is stored as
+the integer ``x * 10**decimals``. Sums and cumulative sums of such integers
+are exact, unlike those of floats, and run at NumPy speed.
+"""
+import numpy as np
+
+# largest magnitude for which a float64 still resolves units exactly
+MAX_EXACT = 2.**52
+MAX_INT64 = 2.**63
+
+
+def decimals_from_step(step):
+    """Number of decimals of a tick or step size such as ``"0.01000000"``."""
+    step = str(step).rstrip("0")
+    integer, _, fraction = step.partition(".")
+
+    return len(fraction)
+
+
+def symbol_decimals(exchange_info, symbol):
+    """Decimals of the ``price``, ``qty`` and ``quoteQty`` of ``symbol``,
+    driven by its tick size and step size in ``/api/v3/exchangeInfo``."""
+    for symbol_info in exchange_info["symbols"]:
+        if symbol_info["symbol"] == symbol:
+            break
+    else:
+        raise KeyError(f"Symbol {symbol} not found in exchange info.")
+
+    filters = {f["filterType"]: f for f in symbol_info["filters"]}
+
+    price = decimals_from_step(filters["PRICE_FILTER"]["tickSize"])
+    qty = decimals_from_step(filters["LOT_SIZE"]["stepSize"])
+
+    return {"price": price, "qty": qty, "quoteQty": price + qty}
+
+
+def check_range(values, decimals=0, limit=MAX_INT64):
+
+    values = np.asarray(values)
+    if values.size and \
+            float(np.abs(values).max()) * 10.**decimals >= limit:
+        raise OverflowError(f"Values too large to scale by 10**{decimals}.")
+
+
+def to_fixed(values, decimals):
+    """Convert floats (or strings) to integers scaled by ``10**decimals``.
+
+    Exact whenever the values are multiples of ``10**-decimals``, as the
+    prices and quantities of a symbol are of its tick and step sizes.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    check_range(values, decimals, limit=MAX_EXACT)
+
+    return np.rint(values * 10.**decimals).astype(np.int64)
+
+
+def to_float(values, decimals):
+    return np.asarray(values) / 10.**decimals
+
+
+def rescale(values, decimals, new_decimals):
+    """Change the scale of ``values``, rounding half to even if decimals
+    are dropped."""
+    values = np.asarray(values, dtype=np.int64)
+
+    if new_decimals >= decimals:
+        factor = 10**(new_decimals - decimals)
+        check_range(values, new_decimals - decimals)
+        return values * factor
+
+    factor = 10**(decimals - new_decimals)
+    quotient, remainder = np.divmod(values, factor)
+
+    twice = 2 * remainder
+    round_up = (twice > factor) | (twice == factor) & (quotient % 2 == 1)
+
+    return quotient + round_up
+
+
+def add(a, a_decimals, b, b_decimals):
+    """Add fixed-point arrays of possibly different scales.
+
+    Returns the sum and its decimals.
+    """
+    decimals = max(a_decimals, b_decimals)
+    return (rescale(a, a_decimals, decimals) +
+            rescale(b, b_decimals, decimals), decimals)
+
+
+def multiply(a, a_decimals, b, b_decimals, decimals=None):
+    """Multiply fixed-point arrays, e.g. prices by quantities.
+
+    The exact product has ``a_decimals + b_decimals`` decimals, to which
+    it is kept unless fewer ``decimals`` are asked for.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+
+    if a.size and b.size and \
+            float(np.abs(a).max()) * float(np.abs(b).max()) >= MAX_INT64:
+        raise OverflowError("Product overflows int64.")
+
+    product_decimals = a_decimals + b_decimals
+    if decimals is None:
+        decimals = product_decimals
+
+    return rescale(a * b, product_decimals, decimals)
+
+
+def divide(a, a_decimals, b, b_decimals, decimals):
+    """Divide fixed-point arrays, e.g. notionals by quantities, rounding the
+    quotient half to even at ``decimals`` decimals."""
+    shift = decimals - a_decimals + b_decimals
+
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+
+    if shift < 0:
+        raise ValueError("Cannot divide to fewer decimals than "
+                         "a_decimals - b_decimals.")
+
+    check_range(a, shift)
+    numerator = a * 10**shift
+
+    quotient, remainder = np.divmod(numerator, b)
+
+    # `divmod` floors, so the remainder has the sign of the divisor and the
+    # fractional part is `remainder / b`, which is rounded half to even
+    twice = 2 * np.abs(remainder)
+    divisor = np.abs(b)
+    round_up = (twice > divisor) | (twice == divisor) & (quotient % 2 == 1)
+
+    return quotient + round_up
@@ -0,0 +1,172 @@
+"""Klines (candlesticks) ingestion module."""
+import asyncio
+import time
+
+import pandas as pd
+
+from .aio import AsyncClient
+from .decoding import create_klines_frame
+from .store import TradeStore
+
+MAX_LIMIT = 1000
+
+# length of each kline interval, in milliseconds (months vary in length)
+INTERVAL_MILLISECONDS = {
+    "1m": 60000,
+    "3m": 180000,
+    "5m": 300000,
+    "15m": 900000,
+    "30m": 1800000,
+    "1h": 3600000,
+    "2h": 7200000,
+    "4h": 14400000,
+    "6h": 21600000,
+    "8h": 28800000,
+    "12h": 43200000,
+    "1d": 86400000,
+    "3d": 259200000,
+    "1w": 604800000,
+}
+
+
+def interval_milliseconds(interval):
+
+    if interval not in INTERVAL_MILLISECONDS:
+        raise ValueError(f"Unsupported kline interval {interval!r}, expected "
+                         f"one of {list(INTERVAL_MILLISECONDS)}")
+
+    return INTERVAL_MILLISECONDS[interval]
+
+
+def split_time_range(start_time, end_time, interval, limit=MAX_LIMIT):
+    """Windows ``(lo, hi)`` of open times (in ms, ``hi`` inclusive) of at
+    most ``limit`` klines each, covering the klines that open in
+    ``[start_time, end_time)``."""
+    step = interval_milliseconds(interval)
+
+    start_time = -(-start_time // step) * step  # the first open time
+    window = limit * step
+
+    return [(lo, min(lo + window, end_time) - 1)
+            for lo in range(start_time, end_time, window)]
+
+
+async def fetch_klines(client, symbol, interval, start_time, end_time=None,
+                       limit=MAX_LIMIT, closed=True):
+    """Klines of ``symbol`` opening in ``[start_time, end_time)`` (in ms),
+    as a DataFrame.
+
+    The range is split into windows of ``limit`` klines, which are fetched
+    concurrently with an :class:`pynance.aio.AsyncClient`, so that a year of
+    one-minute klines takes 526 requests.
+
+    Parameters
+    ----------
+    closed : bool
+        Drop the kline still open, if any, which would otherwise change.
+    """
+    if end_time is None:
+        end_time = int(1e+3 * time.time())
+
+    windows = split_time_range(start_time, end_time, interval, limit=limit)
+    pages = await asyncio.gather(*(
+        client.klines(symbol, interval, limit=limit, start_time=lo,
+                      end_time=hi) for lo, hi in windows))
+
+    frame = create_klines_frame([kline for page in pages for kline in page])
+
+    if closed:
+        now = pd.Timestamp(time.time(), unit="s")
+        frame = frame[frame.closeTime < now].reset_index(drop=True)
+
+    return frame
+
+
+class KlineStore(TradeStore):
+    """Closed klines of one interval stored on disk, one file per symbol and
+    day.
+
+    Syncing only asks for klines after the last one stored for each symbol,
+    so keeping the store up to date takes a request per symbol and ``limit``
+    klines since the last sync.
+
+    Examples
+    --------
+    >>> store = KlineStore("klines/", interval="1m")
+    >>> start_time = 1577836800000  # 2020-01-01
+    >>> sync_klines(store, ["BTCAUD", "ETHAUD"], start_time)  # doctest: +SKIP
+    >>> store.read("BTCAUD", start="2020-06-01")  # doctest: +SKIP
+    """
+
+    kind = "klines"
+    id_column = "openTime"
+    time_column = "openTime"
+
+    def __init__(self, root, interval="1m"):
+        super().__init__(root)
+        self.interval = interval
+
+    def symbol_path(self, symbol):
+        return self.root.joinpath(self.kind, self.interval, symbol)
+
+    def high_water(self, symbol):
+        """Open time of the last kline stored for ``symbol``, or ``None`` if
+        empty."""
+        partitions = self.partitions(symbol)
+
+        if not partitions:
+            return None
+
+        day, path = partitions[-1]
+        with pd.HDFStore(path, mode="r") as store:
+            return pd.Timestamp(
+                store.select_column(self.kind, self.id_column).max())
+
+    async def sync_symbol(self, client, symbol, start_time, end_time=None,
+                          limit=MAX_LIMIT):
+
+        high_water = self.high_water(symbol)
+        if high_water is not None:
+            start_time = max(start_time, high_water.value // 10**6
+                             + interval_milliseconds(self.interval))
+
+        frame = await fetch_klines(client, symbol, self.interval,
+                                   start_time=start_time, end_time=end_time,
+                                   limit=limit)
+
+        return symbol, frame
+
+    async def sync(self, client, symbols, start_time, end_time=None,
+                   limit=MAX_LIMIT):
+        """Fetch and append the new closed klines of all ``symbols``, opening
+        from ``start_time`` (in ms) if none are stored yet.
+
+        Symbols are fetched concurrently, but written one at a time, as
+        each finishes.
+
+        Returns a dict mapping each symbol to the number of klines appended.
+        """
+        counts = dict.fromkeys(symbols, 0)
+
+        for future in asyncio.as_completed([
+                self.sync_symbol(client, symbol, start_time=start_time,
+                                 end_time=end_time, limit=limit)
+                for symbol in symbols]):
+
+            symbol, frame = await future
+            if len(frame):
+                counts[symbol] = self.append(symbol, frame)
+
+        return counts
+
+
+def sync_klines(store, symbols, start_time, end_time=None, limit=MAX_LIMIT,
+                **kwargs):
+    """Blocking :meth:`KlineStore.sync` with a new
+    :class:`pynance.aio.AsyncClient` created from ``kwargs``."""
+    async def main():
+        async with AsyncClient(**kwargs) as client:
+            return await store.sync(client, symbols, start_time=start_time,
+                                    end_time=end_time, limit=limit)
+
+    return asyncio.run(main())
@@ -0,0 +1,101 @@
+"""Local ledger of account trades module."""
+import asyncio
+
+import pandas as pd
+
+from .aio import AsyncClient
+from .decoding import MY_TRADE_FIELDS, create_trades_frame
+from .store import TradeStore
+
+MAX_LIMIT = 1000
+
+
+async def fetch_my_trades(client, symbol, from_id=0, limit=MAX_LIMIT,
+                          frame=False):
+    """All account trades of ``symbol`` from trade id ``from_id`` onwards,
+    paginated by ``fromId`` with an :class:`pynance.aio.AsyncClient`.
+
+    If ``frame``, pages are decoded from their raw bodies in a single pass
+    each and returned as one DataFrame."""
+    pages = []
+
+    while True:
+
+        if frame:
+            body = await client.my_trades(symbol, limit=limit,
+                                          from_id=from_id, raw=True)
+            page = create_trades_frame(body, fields=MY_TRADE_FIELDS)
+        else:
+            page = await client.my_trades(symbol, limit=limit,
+                                          from_id=from_id)
+        pages.append(page)
+
+        if len(page) < limit:
+            break
+
+        from_id = (page.id.iloc[-1] if frame else page[-1]["id"]) + 1
+
+    if frame:
+        return pd.concat(pages, axis="index", ignore_index=True)
+
+    return [trade for page in pages for trade in page]
+
+
+class Ledger(TradeStore):
+    """Account trades (``/api/v3/myTrades``) stored on disk, one file per
+    symbol and day.
+
+    Syncing only asks for trades after the last id stored for each symbol,
+    so refreshing an account already stored takes one request per symbol.
+
+    Examples
+    --------
+    >>> async def main(symbols):
+    ...     async with AsyncClient(api_key, secret_key) as client:
+    ...         return await Ledger("ledger/").sync(client, symbols)
+    >>> asyncio.run(main(["BTCAUD", "ETHAUD"]))  # doctest: +SKIP
+    {'BTCAUD': 12, 'ETHAUD': 0}
+    """
+
+    kind = "myTrades"
+    min_itemsize = {"values": 16}
+
+    async def sync_symbol(self, client, symbol, limit=MAX_LIMIT):
+
+        high_water = self.high_water(symbol)
+        from_id = 0 if high_water is None else high_water + 1
+
+        frame = await fetch_my_trades(client, symbol, from_id=from_id,
+                                      limit=limit, frame=True)
+
+        return symbol, frame
+
+    async def sync(self, client, symbols, limit=MAX_LIMIT):
+        """Fetch and append the new trades of all ``symbols``.
+
+        Symbols are fetched concurrently, but written one at a time, as
+        each finishes.
+
+        Returns a dict mapping each symbol to the number of trades appended.
+        """
+        counts = dict.fromkeys(symbols, 0)
+
+        for future in asyncio.as_completed([
+                self.sync_symbol(client, symbol, limit=limit)
+                for symbol in symbols]):
+
+            symbol, frame = await future
+            if len(frame):
+                counts[symbol] = self.append(symbol, frame)
+
+        return counts
+
+
+def sync_ledger(ledger, symbols, limit=MAX_LIMIT, **kwargs):
+    """Blocking :meth:`Ledger.sync` with a new
+    :class:`pynance.aio.AsyncClient` created from ``kwargs``."""
+    async def main():
+        async with AsyncClient(**kwargs) as client:
+            return await ledger.sync(client, symbols, limit=limit)
+
+    return asyncio.run(main())
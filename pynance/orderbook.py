@@ -0,0 +1,208 @@
+"""Incremental order book module."""
+import heapq
+
+import numpy as np
+
+from collections import deque
+
+
+class BookSide:
+    """Price levels of one side of the book, in a dict of quantities and a
+    binary heap of their keys.
+
+    Keys are ``-sign * price``, so the best level (highest bid, lowest ask)
+    has the smallest key, at the root of the heap. Updates are O(1) dict
+    operations, plus an O(log n) push for a new level, and the heap never
+    holds an empty level at its root, so the best level is O(1). Levels
+    removed below the root are only dropped from the heap when it outgrows
+    twice the number of levels, when it is rebuilt.
+    """
+
+    def __init__(self, sign):
+        self.sign = sign
+        self.levels = {}
+        self.heap = []
+
+    def __len__(self):
+        return len(self.levels)
+
+    def load(self, levels):
+
+        self.levels = {-self.sign * float(price): float(qty)
+                       for price, qty in levels if float(qty) > 0}
+        self.load_keys()
+
+    def set(self, price, qty):
+
+        key = -self.sign * price
+
+        if qty != 0:
+            if key not in self.levels:
+                heapq.heappush(self.heap, key)
+            self.levels[key] = qty
+            return
+
+        if self.levels.pop(key, None) is None:
+            return
+
+        if len(self.heap) > 2 * len(self.levels) + 64:
+            self.load_keys()
+
+        while self.heap and self.heap[0] not in self.levels:
+            heapq.heappop(self.heap)
+
+    def load_keys(self):
+        self.heap = list(self.levels)
+        heapq.heapify(self.heap)
+
+    def best(self):
+
+        if not self.heap:
+            return None
+
+        key = self.heap[0]
+        return -self.sign * key, self.levels[key]
+
+    def top(self, n=None):
+        """Array of the best ``n`` levels as ``(price, qty)`` rows, best
+        first."""
+        keys = sorted(self.levels) if n is None else \
+            heapq.nsmallest(n, self.levels)
+
+        levels = np.empty((len(keys), 2))
+        if keys:
+            levels[:, 0] = keys
+            levels[:, 0] *= -self.sign
+            levels[:, 1] = [self.levels[key] for key in keys]
+
+        return levels
+
+
+class OrderBook:
+    """Local order book maintained from a REST depth snapshot and the
+    diff-depth stream.
+
+    Events are applied in sequence of their update ids. If an event does
+    not directly follow the last one applied, the book marks itself out of
+    sync and buffers events until a new snapshot is loaded, after which the
+    buffered events are replayed.
+
+    Given ``fetch_snapshot``, the book loads a new snapshot itself whenever
+    it is out of sync, and again after each event until one is recent
+    enough. Otherwise, the caller should do so, as in the example.
+
+    Examples
+    --------
+    >>> book = OrderBook()
+    >>> for event in events:  # doctest: +SKIP
+    ...     book.update(event)
+    ...     if not book.synced:
+    ...         book.load_snapshot(client.depth(symbol, limit=1000))
+
+    Or equivalently
+
+    >>> book = OrderBook(fetch_snapshot=lambda: client.depth(symbol,
+    ...                                                      limit=1000))
+    >>> for event in events:  # doctest: +SKIP
+    ...     book.update(event)
+
+    Parameters
+    ----------
+    max_buffer : int
+        Maximum number of events buffered while out of sync.
+    fetch_snapshot : callable, optional
+        Function returning a new ``/api/v3/depth`` snapshot.
+    """
+
+    def __init__(self, max_buffer=10000, fetch_snapshot=None):
+
+        self.bids = BookSide(sign=1)
+        self.asks = BookSide(sign=-1)
+        self.fetch_snapshot = fetch_snapshot
+
+        self.last_update_id = None
+        self.synced = False
+        self.first = True
+        self.buffer = deque(maxlen=max_buffer)
+
+    def load_snapshot(self, snapshot):
+        """Load a ``/api/v3/depth`` snapshot and replay buffered events.
+
+        Returns whether the book is in sync afterwards. It is not if the
+        snapshot is older than the buffered events, in which case a newer
+        one should be loaded.
+        """
+        self.bids.load(snapshot["bids"])
+        self.asks.load(snapshot["asks"])
+
+        self.last_update_id = snapshot["lastUpdateId"]
+        self.synced = True
+        self.first = True
+
+        buffer = list(self.buffer)
+        self.buffer.clear()
+
+        for event in buffer:
+            self.apply(event)
+
+        return self.synced
+
+    def resync(self):
+        """Load a snapshot from ``fetch_snapshot`` and replay buffered events,
+        see :meth:`load_snapshot`."""
+        return self.load_snapshot(self.fetch_snapshot())
+
+    def update(self, event):
+        """Apply a ``depthUpdate`` event, resyncing if out of sync and given
+        ``fetch_snapshot``.
+
+        Returns whether it was applied, or else, if out of sync, whether it
+        was replayed on a new snapshot. Events already contained in the book
+        are skipped, and events are buffered while out of sync.
+        """
+        applied = self.apply(event)
+
+        if self.synced or self.fetch_snapshot is None:
+            return applied
+
+        return self.resync()
+
+    def apply(self, event):
+
+        if not self.synced:
+            self.buffer.append(event)
+            return False
+
+        first_id, final_id = event["U"], event["u"]
+
+        if final_id <= self.last_update_id:
+            return False  # already contained in the snapshot
+
+        if first_id > self.last_update_id + 1 or \
+                not self.first and first_id != self.last_update_id + 1:
+            # missed some events
+            self.synced = False
+            self.buffer.append(event)
+            return False
+
+        for price, qty in event["b"]:
+            self.bids.set(float(price), float(qty))
+        for price, qty in event["a"]:
+            self.asks.set(float(price), float(qty))
+
+        self.last_update_id = final_id
+        self.first = False
+
+        return True
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def mid_price(self):
+        return 0.5 * (self.bids.best()[0] + self.asks.best()[0])
+
+    def spread(self):
+        return self.asks.best()[0] - self.bids.best()[0]
@@ -0,0 +1,151 @@
+"""Aligned multi-symbol price panel module."""
+import numpy as np
+import pandas as pd
+
+from .klines import INTERVAL_MILLISECONDS
+
+POLICIES = ("ffill", "inner")
+
+
+class Panel:
+    """Prices of many symbols on a shared time index.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        C-contiguous array of shape ``(len(index), len(symbols))``.
+    index : pandas.DatetimeIndex
+        Opening time of each bar.
+    symbols : list of str
+    """
+
+    def __init__(self, values, index, symbols):
+        self.values = values
+        self.index = index
+        self.symbols = list(symbols)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def log_returns(self):
+        """Panel of the log returns over each bar but the first."""
+        values = np.diff(np.log(self.values), axis=0)
+        return Panel(values, self.index[1:], self.symbols)
+
+    def to_frame(self):
+        """The panel as a DataFrame, sharing its values where possible."""
+        return pd.DataFrame(self.values, index=self.index,
+                            columns=self.symbols, copy=False)
+
+
+def ffill(values):
+    """Forward-fill NaNs down each column of 2-D ``values``, in place, a
+    column at a time so as to only need temporaries of a column."""
+    rows = np.arange(len(values))
+
+    for column in values.T:
+        filled = np.where(np.isnan(column), 0, rows)
+        np.maximum.accumulate(filled, out=filled)
+        column[:] = column[filled]
+
+    return values
+
+
+def build_panel(sources, start, end, interval, how="ffill",
+                dtype=np.float32):
+    """Align the prices of many symbols onto bars of ``interval`` from
+    ``start`` to ``end``.
+
+    Prices are written straight into a preallocated array as they arrive,
+    batch by batch, taking the last price in each bar (so bars as well as
+    raw trades may be passed), so that no more than a batch per symbol is
+    ever held besides the panel itself.
+
+    Examples
+    --------
+    >>> def prices(symbol):
+    ...     for frame in store.iter_read(symbol, start, end):
+    ...         yield frame.set_index("time").price
+    >>> sources = {symbol: prices(symbol) for symbol in symbols}
+    >>> panel = build_panel(sources, start, end, "15min")  # doctest: +SKIP
+
+    Parameters
+    ----------
+    sources : dict
+        Mapping from symbol to a Series of prices indexed by time, or an
+        iterable of them in order of time, e.g. a generator of batches.
+    start, end : str or Timestamp
+        Range of the time index, ``end`` excluded.
+    interval : str or Timedelta
+        Bar interval, e.g. ``"15min"``.
+    how : {"ffill", "inner"}
+        Either fill bars without prices with the last price before them, or
+        keep only the bars with prices of every symbol. Either way, bars
+        before all symbols have a price are dropped, so that the panel has
+        no NaNs.
+    dtype : numpy.dtype
+        Dtype of the values, which defaults to single precision to halve
+        the memory of a panel of hundreds of symbols.
+    """
+    if how not in POLICIES:
+        raise ValueError(f"Unknown policy {how!r}, expected one of "
+                         f"{POLICIES}")
+
+    index = pd.date_range(start, end, freq=interval)
+    index = index[index < pd.Timestamp(end)]  # bars starting before `end`
+    width = pd.Timedelta(interval)
+
+    values = np.full((len(index), len(sources)), np.nan, dtype=dtype)
+
+    if not len(index):
+        return Panel(values, index, sources.keys())
+
+    for j, batches in enumerate(sources.values()):
+
+        if isinstance(batches, pd.Series):
+            batches = [batches]
+
+        for batch in batches:
+
+            if not len(batch):
+                continue
+
+            positions = (batch.index - index[0]) // width
+            positions = np.asarray(positions, dtype=np.int64)
+            prices = batch.to_numpy(dtype=dtype)
+
+            # the last price in each bar of the range
+            last = np.append(positions[1:] != positions[:-1], True)
+            last &= (positions >= 0) & (positions < len(index))
+
+            values[positions[last], j] = prices[last]
+
+    if how == "ffill":
+        ffill(values)  # leaving NaNs only before the first price
+
+    keep = ~np.isnan(values).any(axis=1)
+
+    if not keep.all():
+        values = np.ascontiguousarray(values[keep])
+        index = index[keep]
+
+    return Panel(values, index, sources.keys())
+
+
+def kline_panel(store, symbols, start, end, how="ffill", dtype=np.float32):
+    """:func:`build_panel` of the closes of ``symbols`` in
+    :class:`pynance.klines.KlineStore` ``store``, reading a partition per
+    symbol at a time."""
+    interval = pd.Timedelta(milliseconds=INTERVAL_MILLISECONDS[store.interval])
+
+    sources = {symbol: (frame.set_index("openTime").close
+                        for frame in store.iter_read(
+                            symbol, start=start, end=end,
+                            columns=["openTime", "close"]))
+               for symbol in symbols}
+
+    return build_panel(sources, start, end, interval, how=how, dtype=dtype)
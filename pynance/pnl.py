@@ -0,0 +1,220 @@
+"""Lot matching and profit and loss module.
+
+Fills are given in time order as arrays of ``is_buyer`` flags, prices and
+quantities, e.g. the ``isBuyer``, ``price`` and ``qty`` columns of
+``create_trades_frame(client.my_trades(symbol))``. Quantities are best
+given in fixed point (see `pynance.fixedpoint`), so that the quantities of
+matched lots add up exactly.
+
+The account is assumed to be long only, as a spot account is: sells of
+more than the position held (e.g. of deposited coins) are only matched up
+to the position and the excess is left unmatched.
+"""
+import numpy as np
+import pandas as pd
+
+LOT_COLUMNS = ["buy", "sell", "qty", "cost", "price", "pnl"]
+OPEN_LOT_COLUMNS = ["buy", "qty", "cost"]
+
+
+def positions(is_buyer, qtys):
+    """Position held after each fill, with sells clipped at the position.
+
+    This is the running sum of the signed quantities reflected at zero,
+    ``S - min(S, 0)`` with ``S`` the running sum and its running minimum.
+    """
+    qtys = np.asarray(qtys)
+    signed = np.where(is_buyer, qtys, -qtys)
+    total = np.cumsum(signed)
+
+    return total - np.minimum(np.minimum.accumulate(total), 0)
+
+
+def create_lots_frame(buy, sell, qty, cost, price):
+    return pd.DataFrame({"buy": buy, "sell": sell, "qty": qty, "cost": cost,
+                         "price": price, "pnl": qty * (price - cost)},
+                        columns=LOT_COLUMNS)
+
+
+def create_open_lots_frame(buy, qty, cost):
+    return pd.DataFrame({"buy": buy, "qty": qty, "cost": cost},
+                        columns=OPEN_LOT_COLUMNS)
+
+
+def match_fifo(is_buyer, prices, qtys):
+    """Match sells against the earliest open buys.
+
+    Under FIFO the n-th unit sold is always the n-th unit bought, so lots
+    are the intersections of the cumulative quantity intervals of buys and
+    sells, found with a merge of their breakpoints and no loop over fills.
+    """
+    is_buyer = np.asarray(is_buyer, dtype=bool)
+    prices = np.asarray(prices)
+    qtys = np.asarray(qtys)
+
+    held = positions(is_buyer, qtys)
+    sold = np.concatenate(([0], held[:-1])) - held
+
+    buys = np.flatnonzero(is_buyer)
+    sells = np.flatnonzero(~is_buyer)
+
+    bought_total = np.cumsum(qtys[buys])
+    sold_total = np.cumsum(sold[sells])
+    matched = sold_total[-1] if len(sold_total) else 0
+
+    # both are sorted already, so a stable sort merges them in linear time
+    breakpoints = np.sort(np.concatenate(([0], bought_total, sold_total)),
+                          kind="stable")
+    breakpoints = breakpoints[breakpoints <= matched]
+    breakpoints = breakpoints[np.diff(breakpoints, prepend=-1) != 0]
+
+    starts = breakpoints[:-1]
+    buy = buys[np.searchsorted(bought_total, starts, side="right")]
+    sell = sells[np.searchsorted(sold_total, starts, side="right")]
+
+    lots = create_lots_frame(buy, sell, np.diff(breakpoints), prices[buy],
+                             prices[sell])
+
+    remaining = bought_total - np.maximum(bought_total - qtys[buys], matched)
+    remaining = np.maximum(remaining, 0)
+    is_open = remaining > 0
+
+    open_lots = create_open_lots_frame(buys[is_open], remaining[is_open],
+                                       prices[buys[is_open]])
+
+    return lots, open_lots
+
+
+def match_lifo(is_buyer, prices, qtys):
+    """Match sells against the latest open buys.
+
+    Unlike FIFO, which buys a sell matches depends on how buys and sells
+    interleave, so this walks the fills once with a stack of open lots.
+    """
+    is_buyer = np.asarray(is_buyer, dtype=bool).tolist()
+    prices = np.asarray(prices)
+    qty_list = np.asarray(qtys).tolist()
+
+    stack = []  # [index, remaining] of open buys, latest last
+    buy, sell, qty = [], [], []
+
+    for i, (buying, amount) in enumerate(zip(is_buyer, qty_list)):
+
+        if buying:
+            stack.append([i, amount])
+            continue
+
+        while amount > 0 and stack:
+
+            lot = stack[-1]
+            take = min(amount, lot[1])
+
+            buy.append(lot[0])
+            sell.append(i)
+            qty.append(take)
+
+            amount -= take
+            lot[1] -= take
+            if lot[1] <= 0:
+                stack.pop()
+
+    buy = np.array(buy, dtype=np.int64)
+    sell = np.array(sell, dtype=np.int64)
+    qty = np.array(qty, dtype=np.asarray(qtys).dtype)
+
+    lots = create_lots_frame(buy, sell, qty, prices[buy], prices[sell])
+
+    open_buy = np.array([lot[0] for lot in stack], dtype=np.int64)
+    open_qty = np.array([lot[1] for lot in stack], dtype=qty.dtype)
+
+    open_lots = create_open_lots_frame(open_buy, open_qty, prices[open_buy])
+
+    return lots, open_lots
+
+
+def linear_recurrence(a, b):
+    """Values of ``x[i] = a[i] * x[i - 1] + b[i]`` from ``x[-1] = 0``.
+
+    Composing the affine maps ``x -> a[i] * x + b[i]`` is associative, so
+    they are composed as a prefix scan of ``log2(n)`` vectorized steps, each
+    composing every map with the one ``shift`` fills before it.
+    """
+    a = np.array(a, dtype=np.float64)
+    b = np.array(b, dtype=np.float64)
+
+    shift = 1
+    while shift < len(a):
+        b[shift:] = a[shift:] * b[:-shift] + b[shift:]
+        a[shift:] = a[shift:] * a[:-shift]
+        shift *= 2
+
+    return b
+
+
+def match_average(is_buyer, prices, qtys):
+    """Match sells against the average cost of the position.
+
+    Lots have no particular buy (``buy`` is -1) and cost the average price
+    of the position at the time of the sell, which only changes with buys.
+    That average is the cost basis of the position over its quantity, and
+    the cost basis follows a linear recurrence over the fills (buys add to
+    it, sells scale it down with the position), found with
+    :func:`linear_recurrence` rather than a loop.
+    """
+    is_buyer = np.asarray(is_buyer, dtype=bool)
+    prices = np.asarray(prices)
+    qtys = np.asarray(qtys)
+
+    held = positions(is_buyer, qtys)
+    before = np.concatenate(([0], held[:-1]))
+
+    scale = np.divide(held, before, out=np.ones(len(held)),
+                      where=~is_buyer & (before > 0))
+    basis = linear_recurrence(scale, np.where(is_buyer, prices * qtys, 0.))
+
+    # the last average while the position is not flat, e.g. that of the
+    # position a sell closes, or 0 before any
+    is_held = held > 0
+    average = np.divide(basis, held, out=np.zeros(len(held)), where=is_held)
+    last = np.maximum.accumulate(np.where(is_held, np.arange(len(held)), -1))
+    average = np.where(last >= 0, average[last], 0.)
+
+    sells = np.flatnonzero(~is_buyer & (before > held))
+    sold = (before - held)[sells]
+
+    lots = create_lots_frame(np.full(len(sells), -1), sells, sold,
+                             average[sells], prices[sells])
+
+    if len(held) and held[-1] > 0:
+        open_lots = create_open_lots_frame([-1], held[-1:], average[-1:])
+    else:
+        open_lots = create_open_lots_frame([], [], [])
+
+    return lots, open_lots
+
+
+METHODS = {"fifo": match_fifo, "lifo": match_lifo, "average": match_average}
+
+
+def match_trades(is_buyer, prices, qtys, method="fifo"):
+    """Match the sells of an account against its buys.
+
+    Returns
+    -------
+    lots : DataFrame
+        Matched lots, with the index of their ``buy`` and ``sell`` fills,
+        their ``qty``, ``cost`` and sell ``price`` per unit, and their
+        realized ``pnl``.
+    open_lots : DataFrame
+        The ``qty`` and ``cost`` of the position still held.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method}, expected one of "
+                         f"{list(METHODS)}.")
+
+    return METHODS[method](is_buyer, prices, qtys)
+
+
+def unrealized_pnl(open_lots, mark_price):
+    """Profit and loss of the open lots if sold at ``mark_price``."""
+    return open_lots.qty * (mark_price - open_lots.cost)
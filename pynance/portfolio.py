@@ -0,0 +1,128 @@
+"""Portfolio valuation module."""
+import numpy as np
+import pandas as pd
+
+VIA = ("USDT", "BTC", "BUSD", "ETH", "BNB")
+
+
+def price_table(tickers):
+    """Series of last prices indexed by symbol, from the list returned by
+    ``/api/v3/ticker/price`` without a symbol."""
+    frame = pd.DataFrame(tickers, columns=["symbol", "price"])
+    return pd.Series(pd.to_numeric(frame.price).to_numpy(),
+                     index=pd.Index(frame.symbol, name="symbol"),
+                     name="price")
+
+
+def fetch_prices(client):
+    """Last prices of all symbols, in a single request."""
+    return price_table(client.ticker_price())
+
+
+def symbol_assets(exchange_info):
+    """The ``baseAsset`` and ``quoteAsset`` of every symbol, indexed by
+    symbol."""
+    frame = pd.DataFrame(exchange_info["symbols"],
+                         columns=["symbol", "baseAsset", "quoteAsset"])
+    return frame.set_index("symbol")
+
+
+def conversion_rates(prices, assets, target, via=VIA):
+    """Rate of every asset in units of ``target``.
+
+    Assets are converted directly if they trade against ``target`` (in
+    either direction), or else through the first asset of ``via`` that
+    they trade against and which itself converts to ``target``.
+    """
+    pairs = assets.assign(price=prices.reindex(assets.index)) \
+        .dropna(subset=["price"])
+
+    # every pair converts in both directions
+    edges = pd.concat([
+        pd.DataFrame({"source": pairs.baseAsset, "dest": pairs.quoteAsset,
+                      "rate": pairs.price}),
+        pd.DataFrame({"source": pairs.quoteAsset, "dest": pairs.baseAsset,
+                      "rate": 1. / pairs.price})], ignore_index=True)
+    edges = edges[edges.source != target]
+
+    rates = edges[edges.dest == target].groupby("source").rate.first()
+    rates[target] = 1.
+
+    for asset in via:
+
+        if asset not in rates.index:
+            continue
+
+        hops = edges[edges.dest == asset]
+        rates = rates.combine_first(
+            hops.groupby("source").rate.first() * rates[asset])
+
+    return rates.rename_axis("asset").rename("rate")
+
+
+def create_positions(fills):
+    """Net quantity and net cost (in the quote asset) of the position in
+    each symbol, from account fills (e.g. :meth:`Ledger.read` of every
+    symbol, concatenated)."""
+    sign = np.where(fills.isBuyer, 1., -1.)
+
+    return pd.DataFrame({"symbol": fills.symbol,
+                         "qty": sign * fills.qty,
+                         "cost": sign * fills.quoteQty}) \
+        .groupby("symbol").sum()
+
+
+class Portfolio:
+    """Mark-to-market of the positions of an account.
+
+    Positions and their assets are aggregated once, so that revaluing the
+    portfolio at new prices only takes a few vectorized joins, however many
+    positions there are.
+
+    Examples
+    --------
+    >>> portfolio = Portfolio(fills, client.exchange_info(), target="AUD")
+    >>> valuation = portfolio.revalue(fetch_prices(client))  # doctest: +SKIP
+    >>> valuation[["value", "pnl"]].sum()  # doctest: +SKIP
+
+    Parameters
+    ----------
+    fills : DataFrame
+        Account fills with ``symbol``, ``qty``, ``quoteQty`` and ``isBuyer``
+        columns.
+    exchange_info : dict
+        Response of ``/api/v3/exchangeInfo``.
+    target : str
+        Asset to value the portfolio in.
+    via : sequence of str
+        Assets to convert through, in order of preference, for assets that
+        do not trade against ``target``.
+    """
+
+    def __init__(self, fills, exchange_info, target="AUD", via=VIA):
+
+        self.assets = symbol_assets(exchange_info)
+        self.positions = create_positions(fills).join(self.assets)
+        self.target = target
+        self.via = via
+
+    def revalue(self, prices):
+        """Value and profit and loss of each position at ``prices``.
+
+        The ``mark``, ``quote_value`` and ``quote_pnl`` are in the quote
+        asset of each symbol, while ``value`` and ``pnl`` are converted to
+        the target asset, with NaN where no conversion exists.
+        """
+        rates = conversion_rates(prices, self.assets, self.target,
+                                 via=self.via)
+
+        frame = self.positions.assign(
+            mark=prices.reindex(self.positions.index).to_numpy(),
+            rate=rates.reindex(self.positions.quoteAsset).to_numpy())
+
+        frame["quote_value"] = frame.qty * frame.mark
+        frame["quote_pnl"] = frame.quote_value - frame.cost
+        frame["value"] = frame.quote_value * frame.rate
+        frame["pnl"] = frame.quote_pnl * frame.rate
+
+        return frame
@@ -0,0 +1,218 @@
+"""Client-side request weight and order count rate limiting."""
+import re
+import threading
+import time
+
+INTERVAL_SECONDS = {"SECOND": 1, "MINUTE": 60, "HOUR": 3600, "DAY": 86400}
+INTERVAL_LETTERS = {"S": "SECOND", "M": "MINUTE", "H": "HOUR", "D": "DAY"}
+
+# same format as the `rateLimits` field of `/api/v3/exchangeInfo`
+DEFAULT_RATE_LIMITS = [
+    {"rateLimitType": "REQUEST_WEIGHT", "interval": "MINUTE",
+     "intervalNum": 1, "limit": 1200},
+    {"rateLimitType": "ORDERS", "interval": "SECOND",
+     "intervalNum": 10, "limit": 100},
+    {"rateLimitType": "ORDERS", "interval": "DAY",
+     "intervalNum": 1, "limit": 200000},
+]
+
+ENDPOINT_WEIGHTS = {
+    "/api/v3/ping": 1,
+    "/api/v3/time": 1,
+    "/api/v3/exchangeInfo": 1,
+    "/api/v3/trades": 1,
+    "/api/v3/historicalTrades": 5,
+    "/api/v3/aggTrades": 1,
+    "/api/v3/klines": 1,
+    "/api/v3/avgPrice": 1,
+    "/api/v3/myTrades": 10,
+    "/api/v3/order": 1,
+}
+
+# endpoints that also count towards the `ORDERS` limits
+ORDER_ENDPOINTS = {"/api/v3/order"}
+
+# statuses of requests rejected for exceeding a limit (418 once banned)
+RATE_LIMIT_STATUSES = (418, 429)
+
+HEADER_PATTERN = re.compile(r"x-mbx-(used-weight|order-count)-(\d+)([smhd])",
+                            flags=re.IGNORECASE)
+HEADER_TYPES = {"used-weight": "REQUEST_WEIGHT", "order-count": "ORDERS"}
+
+
+def depth_weight(limit):
+    limit = int(limit)
+    if limit <= 100:
+        return 1
+    if limit <= 500:
+        return 5
+    if limit <= 1000:
+        return 10
+    return 50
+
+
+def request_weight(path, params=None):
+    """The request weight of calling endpoint ``path`` with ``params``."""
+    params = params or {}
+
+    if path == "/api/v3/depth":
+        return depth_weight(params.get("limit", 100))
+
+    if path in ("/api/v3/ticker/price", "/api/v3/ticker/bookTicker"):
+        return 1 if params.get("symbol") is not None else 2
+
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+def parse_usage(headers):
+    """Parse the used weight and order count headers of a response.
+
+    Returns a dict mapping ``(rateLimitType, seconds)`` to the amount the
+    exchange reports as used in the current window of that limit.
+    """
+    usage = {}
+
+    for key, value in headers.items():
+
+        match = HEADER_PATTERN.fullmatch(key)
+        if match is None:
+            continue
+
+        kind, num, letter = match.groups()
+        seconds = int(num) * INTERVAL_SECONDS[INTERVAL_LETTERS[letter.upper()]]
+        usage[HEADER_TYPES[kind.lower()], seconds] = int(value)
+
+    return usage
+
+
+class TokenBucket:
+    """Bucket of ``capacity`` tokens, refilled at the start of every
+    ``interval`` seconds.
+
+    Intervals are aligned to the epoch, like the exchange's own fixed
+    windows. A reservation that does not fit in the current window is
+    scheduled into the first window with room for it and the caller is told
+    how long to wait, so requests are paced rather than rejected.
+    """
+
+    def __init__(self, capacity, interval, margin=0.1, clock=time.time):
+
+        self.capacity = capacity
+        self.interval = interval
+        self.margin = margin
+        self.clock = clock
+
+        self.reserved = {}  # tokens reserved per window
+
+    def current(self):
+
+        window = int(self.clock() // self.interval)
+
+        for key in [key for key in self.reserved if key < window]:
+            del self.reserved[key]
+
+        return window
+
+    def reserve(self, tokens):
+
+        window = first = self.current()
+        while 0 < self.reserved.get(window, 0) and \
+                self.reserved[window] + tokens > self.capacity:
+            window += 1
+
+        self.reserved[window] = self.reserved.get(window, 0) + tokens
+
+        if window == first:
+            return 0.
+
+        # allow for clock skew at the window boundary
+        return window * self.interval - self.clock() + self.margin
+
+    def correct(self, used):
+        """Reconcile with the ``used`` amount reported by the exchange for
+        the current window."""
+        window = self.current()
+        self.reserved[window] = max(self.reserved.get(window, 0), used)
+
+
+class RateLimiter:
+    """Paces requests to stay within the exchange's rate limits.
+
+    Keeps one :class:`TokenBucket` per limit, e.g. request weight per minute
+    and order count per 10 seconds and per day. Estimates are corrected
+    from the ``X-MBX-USED-WEIGHT-*`` and ``X-MBX-ORDER-COUNT-*`` response
+    headers, and ``Retry-After`` on 418/429 responses halts all requests.
+
+    Parameters
+    ----------
+    rate_limits : list of dict
+        Limits in the format of the ``rateLimits`` field of
+        ``/api/v3/exchangeInfo``.
+    headroom : float
+        Fraction of each limit to use.
+    margin : float
+        Extra seconds to wait past a window boundary, to allow for clock
+        skew between client and exchange.
+    """
+
+    def __init__(self, rate_limits=DEFAULT_RATE_LIMITS, headroom=0.95,
+                 margin=0.1, clock=time.time):
+
+        self.buckets = {}
+        for rate_limit in rate_limits:
+
+            kind = rate_limit["rateLimitType"]
+            if kind not in HEADER_TYPES.values():
+                continue
+
+            seconds = (rate_limit["intervalNum"] *
+                       INTERVAL_SECONDS[rate_limit["interval"]])
+            self.buckets[kind, seconds] = TokenBucket(
+                headroom * rate_limit["limit"], seconds, margin=margin,
+                clock=clock)
+
+        self.clock = clock
+        self.blocked_until = clock()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_exchange_info(cls, exchange_info, **kwargs):
+        return cls(rate_limits=exchange_info["rateLimits"], **kwargs)
+
+    def costs(self, path, params=None):
+
+        costs = {"REQUEST_WEIGHT": request_weight(path, params)}
+        if path in ORDER_ENDPOINTS:
+            costs["ORDERS"] = 1
+
+        return {key: costs[key[0]] for key in self.buckets if key[0] in costs}
+
+    def reserve(self, path, params=None):
+        """Reserve capacity for a request and return how many seconds the
+        caller must wait before sending it."""
+        with self.lock:
+
+            delay = self.blocked_until - self.clock()
+            for key, cost in self.costs(path, params).items():
+                delay = max(delay, self.buckets[key].reserve(cost))
+
+        return max(0., delay)
+
+    def wait(self, path, params=None):
+        time.sleep(self.reserve(path, params))
+
+    def release(self, path, params=None, headers=None, status=None):
+        """Mark a reserved request as completed, correcting estimates from
+        its response ``headers`` if any."""
+        headers = headers or {}
+
+        with self.lock:
+
+            for key, used in parse_usage(headers).items():
+                if key in self.buckets:
+                    self.buckets[key].correct(used)
+
+            retry_after = headers.get("Retry-After")
+            if status in RATE_LIMIT_STATUSES and retry_after is not None:
+                self.blocked_until = max(self.blocked_until,
+                                         self.clock() + float(retry_after))
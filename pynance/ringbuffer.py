@@ -0,0 +1,118 @@
+"""Fixed-size ring buffers of ticks module."""
+import numpy as np
+import pandas as pd
+
+TRADE_DTYPE = np.dtype([("id", np.int64),
+                        ("time", "datetime64[ms]"),
+                        ("price", np.float64),
+                        ("qty", np.float64),
+                        ("isBuyerMaker", np.bool_)])
+BOOK_TICKER_DTYPE = np.dtype([("updateId", np.int64),
+                              ("bidPrice", np.float64),
+                              ("bidQty", np.float64),
+                              ("askPrice", np.float64),
+                              ("askQty", np.float64)])
+
+# key of each field in events of the `trade`, `aggTrade` and `bookTicker`
+# streams
+TRADE_KEYS = {"id": "t", "time": "T", "price": "p", "qty": "q",
+              "isBuyerMaker": "m"}
+AGG_TRADE_KEYS = dict(TRADE_KEYS, id="a")
+BOOK_TICKER_KEYS = {"updateId": "u", "bidPrice": "b", "bidQty": "B",
+                    "askPrice": "a", "askQty": "A"}
+
+
+class RingBuffer:
+    """Preallocated buffer of the latest ``capacity`` records of a
+    structured dtype.
+
+    Every record is written twice, at positions ``i`` and ``i + capacity``
+    of an array twice the capacity, so that the latest ``n`` records are
+    always contiguous and windows of them are views rather than copies.
+    Appending is O(1) and memory use is fixed, however long it runs.
+
+    Windows are overwritten by later appends, so should be copied (e.g.
+    with :meth:`to_frame`) if they are to be kept.
+
+    Examples
+    --------
+    >>> buffer = RingBuffer(100000, keys=AGG_TRADE_KEYS)
+    >>> buffer.append_event(event)  # doctest: +SKIP
+    >>> buffer.since(60.)["price"].mean()  # doctest: +SKIP
+
+    Parameters
+    ----------
+    capacity : int
+        Number of records kept.
+    dtype : numpy.dtype
+        Structured dtype of the records. Defaults to :data:`TRADE_DTYPE`.
+    keys : dict, optional
+        Key of each field in events, for :meth:`append_event`.
+    """
+
+    def __init__(self, capacity, dtype=TRADE_DTYPE, keys=None):
+
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self.data = np.zeros(2 * capacity, dtype=dtype)
+        self.keys = keys
+        self.count = 0  # number of records ever appended
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def append(self, record):
+        """Append ``record``, a tuple of the fields of the dtype."""
+        i = self.count % self.capacity
+        self.data[i] = self.data[i + self.capacity] = record
+        self.count += 1
+
+    def append_event(self, event):
+        """Append the fields of stream event ``event`` given by
+        :attr:`keys`."""
+        self.append(tuple(event[key] for key in self.keys.values()))
+
+    def extend(self, records):
+        """Append the records of structured array ``records``."""
+        records = np.asarray(records, dtype=self.dtype)
+        count = self.count + len(records)
+
+        # only the latest `capacity` records survive
+        records = records[-self.capacity:]
+        i = np.arange(count - len(records), count) % self.capacity
+
+        self.data[i] = records
+        self.data[i + self.capacity] = records
+        self.count = count
+
+    def last(self, n=None):
+        """View of the latest ``n`` records (all, by default), oldest
+        first."""
+        n = len(self) if n is None else min(n, len(self))
+        stop = self.count % self.capacity + self.capacity
+        return self.data[stop - n:stop]
+
+    def since(self, seconds, field="time"):
+        """View of the records of the last ``seconds`` seconds, up to the
+        latest record, by the (nondecreasing) datetime ``field``."""
+        window = self.last()
+        if not len(window):
+            return window
+
+        times = window[field]
+        start = times[-1] - np.timedelta64(int(1e+3 * seconds), "ms")
+        return window[np.searchsorted(times, start, side="left"):]
+
+    def to_frame(self, n=None):
+        """Copy of the latest ``n`` records, as a DataFrame."""
+        return pd.DataFrame(self.last(n))
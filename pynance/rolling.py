@@ -0,0 +1,124 @@
+"""Rolling cross-asset covariance, correlation and beta module."""
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+
+# bytes of the cumulative cross products of a block of symbols
+BLOCK_BYTES = 2**26
+
+
+def window_ends(length, window, step=1):
+    """Positions one past the last row of each window of ``window`` rows,
+    every ``step`` rows, the last of which ends with the last row."""
+    if window < 2:
+        raise ValueError(f"window must be at least 2, got {window}")
+
+    return np.arange(window + (length - window) % step, length + 1, step)
+
+
+def cumulative(values):
+    """Cumulative sums along the first axis, after a row of zeros, so that
+    sums of ``values[start:end]`` are ``cumsum[end] - cumsum[start]``."""
+    cumsum = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cumsum[1:])
+    return cumsum
+
+
+def rolling_moments(returns, window, step=1, ddof=1, block_size=None,
+                    max_workers=None, dtype=np.float32):
+    """Covariance, correlation and beta matrices of every pair of columns of
+    ``returns`` over rolling windows.
+
+    Sums of every window are differences of two cumulative sums, so each
+    step costs O(1) per pair, however long the window. Cumulative cross
+    products are computed for blocks of ``block_size`` symbols (against all
+    others) at a time, so memory stays bounded, in ``max_workers`` threads,
+    which run in parallel since NumPy releases the GIL.
+
+    Examples
+    --------
+    >>> returns = panel.log_returns()  # doctest: +SKIP
+    >>> cov, corr, beta = rolling_moments(returns.values, 96)  # doctest: +SKIP
+    >>> ends = window_ends(len(returns), 96)
+    >>> times = returns.index[ends - 1]  # doctest: +SKIP
+
+    Parameters
+    ----------
+    returns : array-like
+        Array of shape ``(T, N)`` of returns (without NaNs) of ``N`` symbols.
+    window : int
+        Number of rows in each window.
+    step : int
+        Number of rows between the ends of consecutive windows, see
+        :func:`window_ends`.
+    ddof : int
+        Delta degrees of freedom of the covariances.
+    block_size : int, optional
+        Number of symbols per block. Defaults to as many as fit in
+        :data:`BLOCK_BYTES`.
+    max_workers : int, optional
+        Number of threads. Defaults to that of ``ThreadPoolExecutor``.
+    dtype : numpy.dtype
+        Dtype of the results (sums are accumulated in double precision).
+
+    Returns
+    -------
+    cov, corr, beta : numpy.ndarray
+        Arrays of shape ``(K, N, N)``, one matrix per window, where
+        ``beta[k, i, j]`` is the beta of symbol ``i`` on symbol ``j``, that
+        is ``cov[k, i, j] / cov[k, j, j]``.
+    """
+    # covariances are invariant to shifts, which keep sums small
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns - returns.mean(axis=0)
+
+    length, num_symbols = returns.shape
+
+    ends = window_ends(length, window, step=step)
+    starts = ends - window
+
+    cumsum = cumulative(returns)
+    sums = cumsum[ends] - cumsum[starts]  # (K, N)
+
+    cumsum = cumulative(returns**2)
+    variances = cumsum[ends] - cumsum[starts] - sums**2 / window
+    variances /= window - ddof
+    del cumsum
+
+    if block_size is None:
+        block_size = max(1, BLOCK_BYTES // (8 * (length + 1) * num_symbols))
+
+    shape = len(ends), num_symbols, num_symbols
+    cov, corr, beta = (np.empty(shape, dtype=dtype) for _ in range(3))
+
+    def covariances(lo, hi):
+
+        # cumulative cross products, computed in place
+        cumsum = np.zeros((length + 1, hi - lo, num_symbols))
+        np.multiply(returns[:, lo:hi, np.newaxis], returns[:, np.newaxis],
+                    out=cumsum[1:])
+        np.cumsum(cumsum[1:], axis=0, out=cumsum[1:])
+
+        cross = cumsum[ends] - cumsum[starts]  # (K, hi - lo, N)
+        del cumsum
+
+        cross -= sums[:, lo:hi, np.newaxis] * sums[:, np.newaxis] / window
+        cross /= window - ddof
+
+        cov[:, lo:hi] = cross
+
+    blocks = [(lo, min(lo + block_size, num_symbols))
+              for lo in range(0, num_symbols, block_size)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # surfaces exceptions raised in the threads
+        list(executor.map(lambda block: covariances(*block), blocks))
+
+    std = np.sqrt(variances)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(cov, std[:, :, np.newaxis] * std[:, np.newaxis],
+                  out=corr)
+        np.divide(cov, variances[:, np.newaxis], out=beta)
+
+    return cov, corr, beta
@@ -0,0 +1,136 @@
+"""Persistent, partitioned trade store module."""
+import pandas as pd
+
+from pathlib import Path
+
+from .backfill import backfill_trades
+
+
+class TradeStore:
+    """Trades stored on disk in HDF5 tables, one file per symbol and day.
+
+    Files are laid out as ``<root>/<kind>/<symbol>/<YYYY-MM-DD>.h5``, so
+    reading a time range only opens the partitions that overlap it, and
+    within those only the selected columns of the matching rows are read.
+
+    Parameters
+    ----------
+    root : str or Path
+        Directory of the store.
+    """
+
+    kind = "trades"
+    id_column = "id"
+    time_column = "time"
+    min_itemsize = None  # widths reserved for string columns
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def symbol_path(self, symbol):
+        return self.root.joinpath(self.kind, symbol)
+
+    def partition_path(self, symbol, day):
+        return self.symbol_path(symbol).joinpath(f"{day:%Y-%m-%d}.h5")
+
+    def partitions(self, symbol):
+        """Sorted list of ``(day, path)`` of the partitions of ``symbol``."""
+        return [(pd.Timestamp(path.stem), path)
+                for path in sorted(self.symbol_path(symbol).glob("*.h5"))]
+
+    def high_water(self, symbol):
+        """The largest id stored for ``symbol``, or ``None`` if empty."""
+        partitions = self.partitions(symbol)
+
+        if not partitions:
+            return None
+
+        day, path = partitions[-1]
+        with pd.HDFStore(path, mode="r") as store:
+            return int(store.select_column(self.kind, self.id_column).max())
+
+    def append(self, symbol, frame):
+        """Append the rows of ``frame`` newer than the high-water id.
+
+        Returns the number of rows appended.
+        """
+        high_water = self.high_water(symbol)
+        if high_water is not None:
+            frame = frame[frame[self.id_column] > high_water]
+
+        frame = frame.sort_values(self.id_column)
+        days = frame[self.time_column].dt.floor("D")
+
+        path = self.symbol_path(symbol)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # the id may well be the time
+        data_columns = list(dict.fromkeys([self.id_column, self.time_column]))
+
+        for day, partition in frame.groupby(days, sort=True):
+            partition.to_hdf(self.partition_path(symbol, day), key=self.kind,
+                             format="table", append=True, index=False,
+                             data_columns=data_columns,
+                             min_itemsize=self.min_itemsize)
+
+        return len(frame)
+
+    def iter_read(self, symbol, start=None, end=None, columns=None,
+                  chunksize=None):
+        """Iterate over the rows of ``symbol`` with time in ``[start, end)``
+        in frames of at most ``chunksize`` rows (default one per partition),
+        so that they need not all be held in memory."""
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+
+        where = []
+        if start is not None:
+            where.append(f"{self.time_column} >= Timestamp('{start}')")
+        if end is not None:
+            where.append(f"{self.time_column} < Timestamp('{end}')")
+
+        for day, path in self.partitions(symbol):
+
+            if start is not None and day + pd.Timedelta(days=1) <= start or \
+                    end is not None and day >= end:
+                continue  # partition lies outside the range
+
+            # conditions are only needed for partitions on the boundary
+            inner = (start is None or day >= start) and \
+                (end is None or day + pd.Timedelta(days=1) <= end)
+
+            with pd.HDFStore(path, mode="r") as store:
+                frames = store.select(self.kind, columns=columns,
+                                      where=None if inner else where,
+                                      chunksize=chunksize)
+                if chunksize is None:
+                    frames = [frames]
+                for frame in frames:
+                    yield frame.reset_index(drop=True)
+
+    def read(self, symbol, start=None, end=None, columns=None):
+        """Read the rows of ``symbol`` with time in ``[start, end)``."""
+        frames = list(self.iter_read(symbol, start=start, end=end,
+                                     columns=columns))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+
+        return pd.concat(frames, axis="index", ignore_index=True)
+
+    def ingest(self, client, symbol, start_id=0, **kwargs):
+        """Backfill and append all trades of ``symbol`` after the high-water
+        id (or from ``start_id`` if the store is empty).
+
+        Returns the number of trades appended.
+        """
+        high_water = self.high_water(symbol)
+        if high_water is not None:
+            start_id = high_water + 1
+
+        frame = backfill_trades(client, symbol, start_id=start_id,
+                                frame=True, **kwargs)
+        if not len(frame):
+            return 0
+
+        return self.append(symbol, frame)
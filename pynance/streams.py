@@ -0,0 +1,185 @@
+"""WebSocket market data streams module."""
+import asyncio
+import json
+import random
+
+import aiohttp
+
+STREAM_URL = "wss://stream.binance.com:9443"
+MAX_STREAMS = 1024  # per connection
+
+
+def stream_name(symbol, channel):
+    """Name of the stream of ``channel`` (e.g. ``"trade"``, ``"aggTrade"``,
+    ``"depth@100ms"``, ``"bookTicker"`` or ``"kline_1m"``) of ``symbol``."""
+    return f"{symbol.lower()}@{channel}"
+
+
+def stream_names(symbols, channels):
+    return [stream_name(symbol, channel)
+            for symbol in symbols for channel in channels]
+
+
+class StreamSubscriber:
+    """Subscriber to many streams over few combined-stream connections.
+
+    Streams are split into as few connections as allowed, each of which is
+    read by its own task that hands ``(stream, data)`` pairs to a bounded
+    queue. When the queue is full, reading stops until the consumer catches
+    up, so that a slow consumer is pushed back on (by TCP flow control,
+    ultimately) instead of buffering without bound.
+
+    Dropped connections are reopened with exponential backoff (with jitter),
+    after which ``(stream, None)`` is handed over for every stream of the
+    connection, since events may have been missed in between, e.g. so that
+    order books can be synced again. Connections that go silent are detected
+    by heartbeats, and those sending anything but JSON are dropped too.
+    Events are JSON objects with a ``"stream"``, others (e.g. replies to
+    requests) are skipped. Any other error is raised to the consumer.
+
+    Examples
+    --------
+    >>> async def main(symbols):
+    ...     streams = stream_names(symbols, ["aggTrade", "bookTicker"])
+    ...     async with StreamSubscriber(streams) as subscriber:
+    ...         async for stream, data in subscriber:
+    ...             print(stream, data)
+    >>> asyncio.run(main(["BTCAUD", "ETHAUD"]))  # doctest: +SKIP
+
+    Parameters
+    ----------
+    streams : sequence of str
+        Names of the streams, e.g. as given by :func:`stream_names`.
+    base_url : str
+        Base URL of the WebSocket API.
+    max_streams : int
+        Maximum number of streams per connection.
+    maxsize : int
+        Maximum number of messages waiting to be consumed.
+    min_backoff, max_backoff : float
+        Delay before the first attempt to reconnect, and the most it is
+        doubled to, in seconds.
+    max_retries : int, optional
+        Number of consecutive failed connections (without a single event)
+        after which to give up, raising the last error to the consumer.
+        Retries forever if ``None``.
+    heartbeat : float, optional
+        Seconds between pings, a connection being dropped if a pong is not
+        received within half of it.
+    receive_timeout : float, optional
+        Seconds without any message after which to drop a connection.
+    """
+
+    def __init__(self, streams, base_url=STREAM_URL, max_streams=MAX_STREAMS,
+                 maxsize=10000, min_backoff=0.1, max_backoff=30.,
+                 max_retries=None, heartbeat=30., receive_timeout=None):
+
+        self.streams = list(streams)
+        self.base_url = base_url.rstrip("/")
+        self.max_streams = max_streams
+        self.maxsize = maxsize
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.heartbeat = heartbeat
+        self.receive_timeout = receive_timeout
+
+        self.session = None
+        self.queue = None
+        self.tasks = []
+
+        self.num_messages = 0
+        self.num_reconnects = 0
+
+    def urls(self):
+        return [f"{self.base_url}/stream?streams="
+                + "/".join(self.streams[i:i + self.max_streams])
+                for i in range(0, len(self.streams), self.max_streams)]
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    async def open(self):
+        # must be created from within the running event loop
+        self.session = aiohttp.ClientSession()
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self.tasks = [asyncio.create_task(self.run(url))
+                      for url in self.urls()]
+
+    async def close(self):
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get(self):
+        """Next ``(stream, data)`` pair, waiting for one if need be."""
+        stream, data = await self.queue.get()
+        if stream is None:  # a connection gave up
+            raise data
+        return stream, data
+
+    def backoff(self, attempt):
+        delay = min(self.min_backoff * 2**attempt, self.max_backoff)
+        return random.uniform(0.5 * delay, delay)
+
+    async def run(self, url):
+
+        streams = url.partition("streams=")[2].split("/")
+        attempt = 0
+        connected = False
+
+        while True:
+
+            try:
+                async with self.session.ws_connect(
+                        url, heartbeat=self.heartbeat,
+                        receive_timeout=self.receive_timeout) as ws:
+
+                    if connected:
+                        self.num_reconnects += 1
+                        for stream in streams:
+                            await self.queue.put((stream, None))
+                    connected = True
+
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        payload = json.loads(message.data)
+                        if "stream" not in payload:
+                            continue  # e.g. a reply to a request
+                        self.num_messages += 1
+                        attempt = 0
+                        await self.queue.put((payload["stream"],
+                                              payload["data"]))
+
+            except (aiohttp.ClientError, asyncio.TimeoutError,
+                    ConnectionError, ValueError) as error:
+                # the connection failed, timed out, or sent something that
+                # is not JSON, which is treated as a dropped connection too
+                if self.max_retries is not None and \
+                        attempt >= self.max_retries:
+                    await self.queue.put((None, error))
+                    return
+
+            except Exception as error:
+                await self.queue.put((None, error))  # not to wait forever
+                raise
+
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
@@ -0,0 +1,550 @@
+"""Local stubs of the Binance REST and WebSocket APIs for tests and
+benchmarks."""
+import asyncio
+import json
+import math
+import random
+import socket
+import threading
+import time
+
+from aiohttp import web
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from .auth import Signer
+from .klines import INTERVAL_MILLISECONDS
+from .ratelimit import DEFAULT_RATE_LIMITS, INTERVAL_SECONDS, request_weight
+
+T0 = 1600000000000  # milliseconds
+QUOTE_ASSETS = ("USDT", "BUSD", "AUD", "BTC", "ETH", "BNB")
+
+
+def split_symbol(symbol):
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and symbol != quote:
+            return symbol[:-len(quote)], quote
+    return symbol[:-3], symbol[-3:]
+
+
+def make_trade(trade_id, t0=T0):
+    price = 100. + (trade_id % 97) * 1e-2
+    qty = 1e-3 * (1 + trade_id % 13)
+    return {"id": trade_id,
+            "price": f"{price:.8f}",
+            "qty": f"{qty:.8f}",
+            "quoteQty": f"{price * qty:.8f}",
+            "time": t0 + 100 * trade_id,
+            "isBuyerMaker": trade_id % 2 == 0,
+            "isBestMatch": True}
+
+
+def make_agg_trade(trade_id, t0=T0):
+    # every aggregate trade consists of exactly one trade
+    trade = make_trade(trade_id, t0=t0)
+    return {"a": trade_id, "p": trade["price"], "q": trade["qty"],
+            "f": trade_id, "l": trade_id, "T": trade["time"],
+            "m": trade["isBuyerMaker"], "M": trade["isBestMatch"]}
+
+
+def make_my_trade(symbol, trade_id, t0=T0):
+    # every account fill is a market trade of the account, buying twice as
+    # often as selling
+    trade = make_trade(trade_id, t0=t0)
+    return {"symbol": symbol, "id": trade_id, "orderId": trade_id // 2,
+            "orderListId": -1, "price": trade["price"], "qty": trade["qty"],
+            "quoteQty": trade["quoteQty"], "commission": "0.00000000",
+            "commissionAsset": split_symbol(symbol)[1], "time": trade["time"],
+            "isBuyer": trade_id % 3 != 2, "isMaker": False,
+            "isBestMatch": True}
+
+
+def make_kline(open_time, interval_ms):
+    i = open_time // interval_ms
+    open_, close = (100. + (j % 97) * 1e-2 for j in (i, i + 1))
+    volume = 1. + i % 13
+    return [open_time, f"{open_:.8f}", f"{max(open_, close) + 5e-2:.8f}",
+            f"{min(open_, close) - 5e-2:.8f}", f"{close:.8f}",
+            f"{volume:.8f}", open_time + interval_ms - 1,
+            f"{volume * close:.8f}", 10, f"{0.5 * volume:.8f}",
+            f"{0.5 * volume * close:.8f}", "0"]
+
+
+def make_depth(last_update_id, num_levels=100, mid=100.):
+    bids = [[f"{mid - 1e-2 * (i + 1):.8f}", f"{1. + i % 7:.8f}"]
+            for i in range(num_levels)]
+    asks = [[f"{mid + 1e-2 * (i + 1):.8f}", f"{1. + i % 5:.8f}"]
+            for i in range(num_levels)]
+    return {"lastUpdateId": last_update_id, "bids": bids, "asks": asks}
+
+
+def make_depth_updates(snapshot, num_events, num_levels=10, tick=1e-2,
+                       num_ticks=50, seed=None):
+    """Synthetic ``depthUpdate`` events continuing from ``snapshot``.
+
+    Each event changes or removes ``num_levels`` levels per side within
+    ``num_ticks`` of the mid price, and events are numbered contiguously.
+    """
+    random_state = random.Random(seed)
+
+    mid = 0.5 * (float(snapshot["bids"][0][0]) + float(snapshot["asks"][0][0]))
+    update_id = snapshot["lastUpdateId"]
+
+    events = []
+    for _ in range(num_events):
+
+        first_id = update_id + 1
+        update_id += random_state.randint(1, 5)
+
+        sides = {}
+        for side, sign in (("b", -1), ("a", 1)):
+            ticks = [random_state.randint(1, num_ticks)
+                     for _ in range(num_levels)]
+            sides[side] = [[f"{mid + sign * tick * ticks[i]:.8f}",
+                            f"{random_state.choice([0., 1., 2., 5.]):.8f}"]
+                           for i in range(num_levels)]
+
+        events.append({"e": "depthUpdate", "E": T0 + update_id, "s": "BTCAUD",
+                       "U": first_id, "u": update_id, **sides})
+
+    return events
+
+
+def make_stream_event(stream, event_id, t0=T0):
+    """Event ``event_id`` of combined stream ``stream``, e.g.
+    ``"btcaud@aggTrade"``, following :func:`make_trade`."""
+    symbol, _, channel = stream.partition("@")
+    symbol = symbol.upper()
+
+    trade = make_trade(event_id, t0=t0)
+    event = {"e": channel.split("@")[0], "E": trade["time"], "s": symbol}
+
+    if channel == "trade":
+        event.update(t=event_id, p=trade["price"], q=trade["qty"],
+                     T=trade["time"], m=trade["isBuyerMaker"], M=True)
+    elif channel == "aggTrade":
+        event.update(make_agg_trade(event_id, t0=t0))
+    elif channel.startswith("depth"):
+        event.update(e="depthUpdate", U=event_id, u=event_id,
+                     b=[[trade["price"], trade["qty"]]], a=[])
+    elif channel == "bookTicker":
+        event = {"u": event_id, "s": symbol,
+                 "b": trade["price"], "B": trade["qty"],
+                 "a": f"{float(trade['price']) + 1e-2:.8f}", "A": trade["qty"]}
+
+    return event
+
+
+class StreamStub:
+    """Serves combined streams of synthetic events on ``127.0.0.1``.
+
+    Every stream requested on ``/stream?streams=...`` receives events
+    ``0, 1, ..., num_events - 1`` generated by :func:`make_stream_event`, in
+    turn with the others of the connection. Events continue where they left
+    off when a stream is requested again. Use as a context manager to serve
+    from a background thread.
+
+    Parameters
+    ----------
+    num_events : int
+        Number of events of every stream.
+    drop_after : int, optional
+        Number of messages after which to drop each of the first
+        ``num_drops`` connections.
+    num_drops : int
+        Number of connections to drop.
+    preamble : sequence of str
+        Messages sent as they are at the start of every connection, e.g.
+        replies or malformed messages.
+    """
+
+    def __init__(self, num_events=100, drop_after=None, num_drops=1,
+                 preamble=()):
+
+        self.num_events = num_events
+        self.drop_after = drop_after
+        self.num_drops = num_drops
+        self.preamble = list(preamble)
+
+        self.num_connections = 0
+        self.sent = {}  # number of events sent of each stream
+        self.websockets = set()
+
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.loop = asyncio.new_event_loop()
+
+    @property
+    def base_url(self):
+        host, port = self.sock.getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    def __enter__(self):
+
+        app = web.Application()
+        app.router.add_get("/stream", self.handle)
+        self.runner = web.AppRunner(app)
+
+        self.thread = threading.Thread(target=self.loop.run_forever,
+                                       daemon=True)
+        self.thread.start()
+        self.call(self.start())
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.call(self.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def start(self):
+        await self.runner.setup()
+        await web.SockSite(self.runner, self.sock).start()
+
+    async def stop(self):
+        for ws in list(self.websockets):
+            await ws.close()
+        await self.runner.cleanup()
+
+    async def handle(self, request):
+
+        streams = request.query.get("streams", "").split("/")
+        self.num_connections += 1
+        drop = self.drop_after is not None and \
+            self.num_connections <= self.num_drops
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.websockets.add(ws)
+
+        num_sent = 0
+        try:
+            for message in self.preamble:
+                await ws.send_str(message)
+
+            while any(self.sent.get(stream, 0) < self.num_events
+                      for stream in streams):
+                for stream in streams:
+
+                    if drop and num_sent >= self.drop_after:
+                        return ws
+
+                    event_id = self.sent.get(stream, 0)
+                    if event_id < self.num_events:
+                        await ws.send_json({"stream": stream, "data":
+                                            make_stream_event(stream,
+                                                              event_id)})
+                        self.sent[stream] = event_id + 1
+                        num_sent += 1
+
+            async for _ in ws:  # keep open until the client leaves
+                pass
+        finally:
+            self.websockets.discard(ws)
+            await ws.close()
+
+        return ws
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"  # keep connections alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+
+        status, headers, payload = self.server.dispatch(url.path, params,
+                                                        self.headers,
+                                                        query=url.query)
+        body = json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Serves a deterministic, synthetic market on ``127.0.0.1``.
+
+    Trade ``i`` exists for every ``0 <= i < num_trades`` and is generated by
+    :func:`make_trade`, and klines of every interval by :func:`make_kline`
+    from ``T0`` up to now. Use as a context manager to serve from a background
+    thread.
+
+    Parameters
+    ----------
+    num_trades : int
+        Number of trades in the synthetic history of every symbol.
+    latency : float
+        Artificial processing delay per request, in seconds.
+    rate_limit : dict, optional
+        A ``REQUEST_WEIGHT`` limit, in the format of the ``rateLimits`` field
+        of ``/api/v3/exchangeInfo``, to enforce over fixed windows. Requests
+        exceeding it are rejected with status 429.
+    symbols : sequence of str
+        Symbols listed in ``/api/v3/exchangeInfo``.
+    num_my_trades : dict, optional
+        Number of account trades of each symbol, generated by
+        :func:`make_my_trade` and served by (signed) ``/api/v3/myTrades``.
+    prices : dict, optional
+        Last price of each symbol in ``/api/v3/ticker/price`` (default 100).
+    secret_key : str, optional
+        If given, signatures of signed requests are verified against it.
+    clock_skew : float
+        Seconds the server clock is ahead of the local one. Signed requests
+        are rejected if their timestamp is more than ``recvWindow``
+        milliseconds behind, or a second ahead of, the server time.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, num_trades=100000, latency=0., rate_limit=None,
+                 symbols=("BTCAUD", "ETHAUD"), num_my_trades=None,
+                 prices=None, secret_key=None, clock_skew=0., port=0):
+
+        super().__init__(("127.0.0.1", port), StubHandler)
+
+        self.num_trades = num_trades
+        self.symbols = list(symbols)
+        self.prices = dict(prices or {})
+        self.secret_key = secret_key
+        self.clock_skew = clock_skew
+        self.num_my_trades = dict.fromkeys(self.symbols, 0) \
+            if num_my_trades is None else dict(num_my_trades)
+        self.latency = latency
+        self.num_requests = 0
+        self.num_rejected = 0
+        self.rate_limit = rate_limit
+        self.window = None
+        self.used_weight = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+        self.routes = {
+            "/api/v3/time": self.server_time,
+            "/api/v3/exchangeInfo": self.exchange_info,
+            "/api/v3/trades": self.trades,
+            "/api/v3/historicalTrades": self.historical_trades,
+            "/api/v3/aggTrades": self.agg_trades,
+            "/api/v3/klines": self.klines,
+            "/api/v3/depth": self.depth,
+            "/api/v3/avgPrice": self.avg_price,
+            "/api/v3/ticker/price": self.ticker_price,
+            "/api/v3/ticker/bookTicker": self.book_ticker,
+            "/api/v3/myTrades": self.my_trades,
+        }
+        self.signed_paths = {"/api/v3/myTrades"}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    def process_request(self, request, client_address):
+        self.connections.add(client_address)
+        super().process_request(request, client_address)
+
+    def dispatch(self, path, params, headers, query=""):
+
+        with self.lock:
+            self.num_requests += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        route = self.routes.get(path)
+        if route is None:
+            return 404, {}, {"code": -1, "msg": f"Unknown path {path}"}
+
+        if path in self.signed_paths:
+
+            if not {"timestamp", "signature"} <= params.keys():
+                return 400, {}, {"code": -1102,
+                                 "msg": "Mandatory parameter was not sent."}
+
+            payload, _, signature = query.rpartition("&signature=")
+            if self.secret_key is not None and \
+                    signature != Signer(self.secret_key).signature(payload):
+                return 400, {}, {"code": -1022,
+                                 "msg": "Signature for this request is not "
+                                        "valid."}
+
+            lag = self.now() - int(params["timestamp"])
+            if not -1000 <= lag <= int(params.get("recvWindow", 5000)):
+                return 400, {}, {"code": -1021,
+                                 "msg": "Timestamp for this request is "
+                                        "outside of the recvWindow."}
+
+        headers = {}
+        if self.rate_limit is not None:
+
+            accepted, headers = self.consume(request_weight(path, params))
+
+            if not accepted:
+                return 429, headers, {"code": -1003,
+                                      "msg": "Too many requests."}
+
+        return 200, headers, route(params)
+
+    def consume(self, weight):
+
+        num = self.rate_limit["intervalNum"]
+        interval = self.rate_limit["interval"]
+        seconds = num * INTERVAL_SECONDS[interval]
+
+        now = time.time()
+        window, elapsed = divmod(now, seconds)
+
+        with self.lock:
+
+            if window != self.window:
+                self.window = window
+                self.used_weight = 0
+
+            accepted = self.used_weight + weight <= self.rate_limit["limit"]
+            if accepted:
+                self.used_weight += weight
+            else:
+                self.num_rejected += 1
+
+            headers = {f"X-MBX-USED-WEIGHT-{num}{interval[0]}":
+                       self.used_weight}
+
+        if not accepted:
+            headers["Retry-After"] = math.ceil(seconds - elapsed)
+
+        return accepted, headers
+
+    def now(self):
+        return int(1e+3 * (time.time() + self.clock_skew))
+
+    def server_time(self, params):
+        return {"serverTime": self.now()}
+
+    def exchange_info(self, params):
+
+        rate_limits = DEFAULT_RATE_LIMITS if self.rate_limit is None \
+            else [self.rate_limit]
+
+        # every symbol trades with the tick and step sizes of `make_trade`
+        symbols = [{"symbol": symbol, "status": "TRADING",
+                    "baseAsset": split_symbol(symbol)[0],
+                    "quoteAsset": split_symbol(symbol)[1],
+                    "filters": [{"filterType": "PRICE_FILTER",
+                                 "tickSize": "0.01000000"},
+                                {"filterType": "LOT_SIZE",
+                                 "stepSize": "0.00100000"}]}
+                   for symbol in self.symbols]
+
+        return {"timezone": "UTC", "rateLimits": rate_limits,
+                "symbols": symbols}
+
+    def trades(self, params):
+        limit = int(params.get("limit", 500))
+        start = max(self.num_trades - limit, 0)
+        return [make_trade(i) for i in range(start, self.num_trades)]
+
+    def historical_trades(self, params):
+        limit = int(params.get("limit", 500))
+        start = int(params.get("fromId", self.num_trades - limit))
+        stop = min(max(start, 0) + limit, self.num_trades)
+        return [make_trade(i) for i in range(max(start, 0), stop)]
+
+    def agg_trades(self, params):
+
+        limit = int(params.get("limit", 500))
+
+        if "fromId" in params:
+            start = int(params["fromId"])
+        elif "startTime" in params:
+            start = math.ceil((int(params["startTime"]) - T0) / 100)
+        else:
+            start = self.num_trades - limit
+
+        stop = self.num_trades
+        if "endTime" in params:
+            stop = min(stop, (int(params["endTime"]) - T0) // 100 + 1)
+
+        start = max(start, 0)
+        return [make_agg_trade(i) for i in range(start, min(start + limit,
+                                                            stop))]
+
+    def klines(self, params):
+
+        # every symbol is listed at `T0`
+        step = INTERVAL_MILLISECONDS[params["interval"]]
+        limit = min(int(params.get("limit", 500)), 1000)
+
+        first = -(-T0 // step) * step
+        last = self.now() // step * step  # still open
+
+        if "startTime" in params:
+            start = max(-(-int(params["startTime"]) // step) * step, first)
+            stop = last
+            if "endTime" in params:
+                stop = min(stop, int(params["endTime"]) // step * step)
+            stop = min(stop, start + (limit - 1) * step)
+        else:
+            stop = last
+            if "endTime" in params:
+                stop = min(stop, int(params["endTime"]) // step * step)
+            start = max(stop - (limit - 1) * step, first)
+
+        return [make_kline(open_time, step)
+                for open_time in range(start, stop + 1, step)]
+
+    def depth(self, params):
+        limit = int(params.get("limit", 100))
+        return make_depth(self.num_requests, num_levels=limit)
+
+    def avg_price(self, params):
+        return {"mins": 5, "price": "100.00000000"}
+
+    def ticker_price(self, params):
+
+        if "symbol" not in params:
+            return [self.ticker_price(dict(symbol=symbol))
+                    for symbol in self.symbols]
+
+        price = self.prices.get(params["symbol"], 100.)
+        return {"symbol": params["symbol"], "price": f"{price:.8f}"}
+
+    def book_ticker(self, params):
+        return {"symbol": params.get("symbol"),
+                "bidPrice": "99.99000000", "bidQty": "1.00000000",
+                "askPrice": "100.01000000", "askQty": "1.00000000"}
+
+    def my_trades(self, params):
+
+        symbol = params["symbol"]
+        num_trades = self.num_my_trades.get(symbol, 0)
+        limit = min(int(params.get("limit", 500)), 1000)
+
+        start = int(params.get("fromId", num_trades - limit))
+        stop = min(max(start, 0) + limit, num_trades)
+
+        return [make_my_trade(symbol, i) for i in range(max(start, 0), stop)]
@@ -1,5 +1,19 @@
-import requests, requests_cache
+import logging
+import threading
+import time
+
+import requests
+
+from collections import deque
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import CachePolicy
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+logger = logging.getLogger(__name__)
 
 
 def to_milliseconds(seconds):
@@ -14,17 +28,136 @@ def create_datetime(timestamp_ms):
     return datetime.fromtimestamp(to_seconds(timestamp_ms))
 
 
-def create_session(api_key, expire_after=None, location="foo/"):
+def create_adapter(pool_connections=10, pool_maxsize=10, max_retries=3,
+                   backoff_factor=0.3, retry_statuses=RETRY_STATUSES,
+                   respect_retry_after=True):
 
-    headers = {"X-MBX-APIKEY": api_key}
+    # urllib3 retries any 429 with a Retry-After header unless told not to
+    retry = Retry(total=max_retries, backoff_factor=backoff_factor,
+                  status_forcelist=retry_statuses,
+                  respect_retry_after_header=respect_retry_after,
+                  raise_on_status=False)
 
-    session = requests_cache.CachedSession(backend="sqlite",
-                                           include_get_headers=False)
-    # session = requests.Session()
-    session.headers.update(headers)
+    return HTTPAdapter(pool_connections=pool_connections,
+                       pool_maxsize=pool_maxsize, max_retries=retry)
+
+
+def mount_adapter(session, adapter):
+
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, adapter)
 
     return session
 
 
-def create_timestamp(dt=datetime.now()):
+def create_session(api_key=None, expire_after=None, location="pynance_cache",
+                   backend="sqlite", policy=None, **kwargs):
+    """Cached session following ``policy`` (by default a
+    :class:`pynance.cache.CachePolicy` caching endpoints without a time to
+    live of their own for ``expire_after`` seconds), stored at
+    ``location`` in ``backend``."""
+    if policy is None:
+        policy = CachePolicy() if expire_after is None \
+            else CachePolicy(default_ttl=expire_after)
+
+    session = policy.create_session(cache_name=location, backend=backend)
+    if api_key is not None:
+        session.headers.update({"X-MBX-APIKEY": api_key})
+
+    return mount_adapter(session, create_adapter(**kwargs))
+
+
+def create_timestamp(dt=None):
+    # the default must not be evaluated once, at import
+    if dt is None:
+        dt = datetime.now()
     return int(to_milliseconds(dt.timestamp()))
+
+
+class ClockSync:
+    """Tracks the offset of the exchange's clock from the local one, so
+    that timestamps of signed requests are in server time.
+
+    Every sample takes the server time half way through its round trip, so
+    its offset is off by at most half the round-trip time. Of the latest
+    ``window`` samples, the one with the shortest round trip is used.
+
+    Examples
+    --------
+    >>> with ClockSync(client.server_time) as clock:  # doctest: +SKIP
+    ...     clock.offset, clock.rtt
+    (-352.5, 3.1)
+
+    Parameters
+    ----------
+    server_time : callable
+        Returns the server time in milliseconds, e.g.
+        :meth:`pynance.client.Client.server_time`.
+    interval : float
+        Seconds between samples when running in the background.
+    window : int
+        Number of latest samples to filter.
+    """
+
+    def __init__(self, server_time, interval=60., window=8, clock=time.time):
+
+        self.server_time = server_time
+        self.interval = interval
+        self.clock = clock
+        self.samples = deque(maxlen=window)  # (rtt, offset) in milliseconds
+
+        self.offset = 0.
+        self.rtt = None
+
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def sample(self):
+        """Measure the offset once and update the estimate."""
+        start = self.clock()
+        server_time = self.server_time()
+        end = self.clock()
+
+        rtt = to_milliseconds(end - start)
+        offset = server_time - to_milliseconds(0.5 * (start + end))
+
+        self.samples.append((rtt, offset))
+        self.rtt, self.offset = min(self.samples)
+
+        return offset
+
+    def timestamp(self):
+        """Current server time in milliseconds."""
+        return int(to_milliseconds(self.clock()) + self.offset)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.sample()
+            except requests.RequestException as error:
+                # keep the last estimate until the next sample
+                logger.warning("Failed to sample the server time: %s", error)
+
+    def start(self):
+        """Take a first sample, then keep sampling in a background
+        thread."""
+        self.sample()
+
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
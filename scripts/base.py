@@ -2,9 +2,9 @@ import sys
 import click
 import pandas as pd
 
-from datetime import datetime
 from pynance.auth import signed_params
-from pynance.utils import create_session, create_datetime, to_milliseconds
+from pynance.client import Client
+from pynance.utils import ClockSync
 
 import configparser
 
@@ -21,13 +21,14 @@ def main(symbol, credentials_file):
     api_key = config["binance"]["api_key"]
     secret_key = config["binance"]["secret_key"]
 
-    s = create_session(api_key)
-    r = s.get("https://api.binance.com/api/v3/time")
-    timestamp = r.json().get("serverTime")
-    # click.echo(f" Local time: {datetime.now()}")
-    # click.echo(f"Server time: {create_datetime(timestamp)}")
+    client = Client(api_key=api_key, secret_key=secret_key)
+
+    clock_sync = ClockSync(client.server_time)
+    for _ in range(clock_sync.samples.maxlen):
+        clock_sync.sample()
 
-    click.echo(f"Difference: {to_milliseconds((datetime.now() - create_datetime(timestamp)).total_seconds())}")
+    click.echo(f"Offset: {clock_sync.offset:.1f}ms "
+               f"(round trip: {clock_sync.rtt:.1f}ms)")
 
     # r = s.get("https://api.binance.com/api/v3/avgPrice",
     #           params=dict(symbol=symbol))
@@ -0,0 +1,71 @@
+import sys
+import time
+import click
+import requests
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from pynance.client import Client
+from pynance.testing import StubServer
+from pynance.utils import create_session
+
+
+def run(get, num_requests, num_workers):
+
+    def timed(i):
+        start = time.perf_counter()
+        get()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        latencies = np.fromiter(executor.map(timed, range(num_requests)),
+                                dtype=float, count=num_requests)
+    elapsed = time.perf_counter() - start
+
+    return {"requests/sec": num_requests / elapsed,
+            "p50 (ms)": 1e+3 * np.percentile(latencies, 50),
+            "p99 (ms)": 1e+3 * np.percentile(latencies, 99)}
+
+
+@click.command()
+@click.option("--num-requests", "-n", default=2000)
+@click.option("--num-workers", "-w", default=8)
+@click.option("--latency", default=0., help="Stub server latency (s).")
+def main(num_requests, num_workers, latency):
+
+    params = dict(symbol="BTCAUD")
+
+    with StubServer(latency=latency) as server:
+
+        url = server.base_url + "/api/v3/ticker/bookTicker"
+
+        results = {}
+        # what `scripts/plot_orderbook.py` does: a new connection per request
+        results["requests.get"] = run(lambda: requests.get(url, params=params),
+                                      num_requests, num_workers)
+
+        # the cached session of `create_session`, which the client replaces
+        with TemporaryDirectory() as cache_dir:
+            session = create_session(location=f"{cache_dir}/cache",
+                                     pool_maxsize=num_workers)
+            results["create_session"] = run(
+                lambda: session.get(url, params=params), num_requests,
+                num_workers)
+            session.close()
+
+        with Client(base_url=server.base_url,
+                    pool_maxsize=num_workers) as client:
+            results["Client"] = run(lambda: client.book_ticker(**params),
+                                    num_requests, num_workers)
+
+    click.echo(pd.DataFrame(results).T.to_markdown(floatfmt=".2f"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
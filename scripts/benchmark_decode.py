@@ -0,0 +1,60 @@
+import sys
+import json
+import time
+import click
+
+import pandas as pd
+
+from pynance.decoding import create_trades_frame
+from pynance.testing import make_trade
+
+
+def create_trades_frame_baseline(trades_list):
+    # as previously copy-pasted across the scripts
+    trades = pd.DataFrame(trades_list)
+    return trades.assign(time=pd.to_datetime(trades.time, unit="ms"),
+                         price=pd.to_numeric(trades.price),
+                         qty=pd.to_numeric(trades.qty),
+                         quoteQty=pd.to_numeric(trades.quoteQty))
+
+
+def timeit(func, num_repeats):
+
+    timings = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+@click.command()
+@click.option("--num-trades", "-n", default=1000000)
+@click.option("--num-repeats", "-r", default=3)
+def main(num_trades, num_repeats):
+
+    body = json.dumps([make_trade(i) for i in range(num_trades)],
+                      separators=(",", ":")).encode("utf-8")
+
+    results = {
+        "json.loads + baseline": lambda: create_trades_frame_baseline(
+            json.loads(body)),
+        "json.loads + create_trades_frame": lambda: create_trades_frame(
+            json.loads(body)),
+        "create_trades_frame (bytes)": lambda: create_trades_frame(body),
+    }
+
+    timings = pd.Series({name: timeit(func, num_repeats)
+                         for name, func in results.items()}, name="seconds")
+    frame = timings.to_frame().assign(
+        speedup=lambda x: x.seconds.iloc[0] / x.seconds)
+
+    click.echo(f"Decoding {num_trades} trades ({len(body) / 2**20:.1f} MiB)")
+    click.echo(frame.to_markdown(floatfmt=".2f"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
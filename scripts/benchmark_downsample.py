@@ -0,0 +1,76 @@
+import io
+import sys
+import time
+import click
+
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+
+from pynance.downsample import bin2d, lttb, minmax
+from pynance.figures import Style
+
+
+@click.command()
+@click.option("--num-points", "-n", default=1000000)
+@click.option("--dpi", type=float, default=100)
+@click.option("--seed", default=8888)
+def main(num_points, dpi, seed):
+
+    matplotlib.use("Agg")
+
+    style = Style(dpi=dpi)
+    style.apply()
+    width, height = style.pixels
+
+    rng = np.random.default_rng(seed)
+    x = np.arange(num_points)
+    y = np.cumsum(rng.normal(size=num_points))
+
+    def render(plot):
+
+        def func():
+            fig, ax = plt.subplots()
+            plot(ax)
+            fig.savefig(io.BytesIO(), format="png", dpi=dpi)
+            plt.close(fig)
+
+        return func
+
+    def line(select):
+
+        def plot(ax):
+            indices = select(x, y)
+            ax.plot(x[indices], y[indices])
+
+        return render(plot)
+
+    def density(ax):
+        counts, xedges, yedges = bin2d(x, y, (width // 4, height // 4))
+        ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts, 0))
+
+    results = {
+        "line (all points)": line(lambda x, y: slice(None)),
+        "line (minmax)": line(lambda x, y: minmax(x, y, width)),
+        "line (lttb)": line(lambda x, y: lttb(x, y, width)),
+        "scatter (all points)": render(lambda ax: ax.scatter(x, y, s=1)),
+        "scatter (bin2d)": render(density),
+    }
+
+    timings = {}
+    for name, func in results.items():
+        start = time.perf_counter()
+        func()
+        timings[name] = time.perf_counter() - start
+
+    frame = pd.Series(timings, name="seconds").to_frame()
+
+    click.echo(f"{num_points} points drawn {width}x{height} pixels")
+    click.echo(frame.to_markdown(floatfmt=".3f"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
@@ -0,0 +1,66 @@
+import sys
+import json
+import time
+import click
+
+from pynance.orderbook import OrderBook
+from pynance.testing import make_depth, make_depth_updates
+
+
+def read_json_lines(f):
+    return [json.loads(line) for line in f if line.strip()]
+
+
+@click.command()
+@click.option("--snapshot-file", type=click.File("r"),
+              help="Recorded `/api/v3/depth` snapshot (JSON).")
+@click.option("--events-file", type=click.File("r"),
+              help="Recorded `depthUpdate` events (JSON lines).")
+@click.option("--num-events", "-n", default=100000)
+@click.option("--num-levels", default=10,
+              help="Levels changed per side per synthetic event.")
+@click.option("--depth", default=1000,
+              help="Levels per side of the synthetic snapshot.")
+@click.option("--num-ticks", default=50, help="Ticks from the mid price "
+              "within which synthetic events change levels, e.g. the depth "
+              "to change levels throughout the book.")
+@click.option("--seed", default=8888)
+def main(snapshot_file, events_file, num_events, num_levels, depth, num_ticks,
+         seed):
+
+    if snapshot_file is not None:
+        snapshot = json.load(snapshot_file)
+    else:
+        snapshot = make_depth(last_update_id=1, num_levels=depth)
+
+    if events_file is not None:
+        events = read_json_lines(events_file)
+    else:
+        events = make_depth_updates(snapshot, num_events=num_events,
+                                    num_levels=num_levels,
+                                    num_ticks=num_ticks, seed=seed)
+
+    num_updates = sum(len(event["b"]) + len(event["a"]) for event in events)
+
+    book = OrderBook()
+
+    start = time.perf_counter()
+    book.load_snapshot(snapshot)
+    for event in events:
+        book.update(event)
+        book.best_bid()
+        book.best_ask()
+    elapsed = time.perf_counter() - start
+
+    click.echo(f"Replayed {len(events)} events ({num_updates} level updates) "
+               f"in {elapsed:.2f}s")
+    click.echo(f"{len(events) / elapsed:.0f} events/sec, "
+               f"{num_updates / elapsed:.0f} level updates/sec")
+    click.echo(f"In sync: {book.synced}, "
+               f"best bid: {book.best_bid()}, best ask: {book.best_ask()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
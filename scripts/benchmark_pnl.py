@@ -0,0 +1,38 @@
+import sys
+import time
+import click
+
+import numpy as np
+import pandas as pd
+
+from pynance.pnl import match_trades
+
+
+@click.command()
+@click.option("--num-fills", "-n", default=1000000)
+@click.option("--buy-fraction", default=0.55)
+@click.option("--seed", default=8888)
+def main(num_fills, buy_fraction, seed):
+
+    rng = np.random.default_rng(seed)
+    is_buyer = rng.random(num_fills) < buy_fraction
+    prices = np.round(100. + rng.standard_normal(num_fills).cumsum(), 2)
+    qtys = rng.integers(1, 1000, size=num_fills)
+
+    timings, num_lots = {}, {}
+    for method in ("fifo", "lifo", "average"):
+        start = time.perf_counter()
+        lots, open_lots = match_trades(is_buyer, prices, qtys, method=method)
+        timings[method] = time.perf_counter() - start
+        num_lots[method] = len(lots)
+
+    frame = pd.DataFrame(dict(seconds=timings, lots=num_lots))
+
+    click.echo(f"{num_fills} fills, {buy_fraction:.0%} of them buys")
+    click.echo(frame.to_markdown(floatfmt=("", ".3f", ".0f")))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
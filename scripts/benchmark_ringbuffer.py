@@ -0,0 +1,58 @@
+import sys
+import time
+import click
+
+import pandas as pd
+
+from pynance.ringbuffer import AGG_TRADE_KEYS, RingBuffer
+from pynance.testing import make_stream_event
+
+
+@click.command()
+@click.option("--num-events", "-n", default=200000)
+@click.option("--capacity", default=100000)
+@click.option("--window", default=60., help="Window of each query, in "
+              "seconds.")
+@click.option("--query-every", default=1000,
+              help="Number of events between queries of the window.")
+def main(num_events, capacity, window, query_every):
+
+    events = [make_stream_event("btcaud@aggTrade", i)
+              for i in range(num_events)]
+
+    def baseline():
+        # frames appended to a list and concatenated for every query
+        frames = []
+        for i, event in enumerate(events, start=1):
+            frames.append(pd.DataFrame([event]))
+            if not i % query_every:
+                frame = pd.concat(frames[-capacity:], ignore_index=True)
+                times = pd.to_datetime(frame["T"], unit="ms")
+                frame[times >= times.iloc[-1] - pd.Timedelta(seconds=window)]
+
+    def ring_buffer():
+        buffer = RingBuffer(capacity, keys=AGG_TRADE_KEYS)
+        for i, event in enumerate(events, start=1):
+            buffer.append_event(event)
+            if not i % query_every:
+                buffer.since(window)
+
+    timings = {}
+    for name, func in [("list + concat", baseline),
+                       ("RingBuffer", ring_buffer)]:
+        start = time.perf_counter()
+        func()
+        timings[name] = 1e+6 * (time.perf_counter() - start) / num_events
+
+    frame = pd.Series(timings, name="microseconds").to_frame().assign(
+        speedup=lambda x: x.microseconds.iloc[0] / x.microseconds)
+
+    click.echo(f"Appending {num_events} events, querying the last "
+               f"{window:.0f}s every {query_every}")
+    click.echo(frame.to_markdown(floatfmt=".2f"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
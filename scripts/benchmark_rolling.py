@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import click
+
+import numpy as np
+import pandas as pd
+
+from pynance.rolling import rolling_moments
+
+
+@click.command()
+@click.option("--num-symbols", "-n", default=50)
+@click.option("--num-bars", default=2000)
+@click.option("--window", "-w", default=96)
+@click.option("--seed", default=8888)
+def main(num_symbols, num_bars, window, seed):
+
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(scale=1e-3, size=(num_bars, num_symbols))
+
+    def baseline():
+        frame = pd.DataFrame(returns)
+        rolling = frame.rolling(window)
+        rolling.cov()
+        rolling.corr()
+
+    def moments(max_workers):
+        return lambda: rolling_moments(returns, window,
+                                       max_workers=max_workers,
+                                       block_size=max(1, num_symbols // 32))
+
+    results = {
+        "pandas rolling cov + corr": baseline,
+        "rolling_moments (1 thread)": moments(1),
+        f"rolling_moments ({os.cpu_count()} threads)":
+            moments(os.cpu_count()),
+    }
+
+    timings = {}
+    for name, func in results.items():
+        start = time.perf_counter()
+        func()
+        timings[name] = time.perf_counter() - start
+
+    frame = pd.Series(timings, name="seconds").to_frame().assign(
+        speedup=lambda x: x.seconds.iloc[0] / x.seconds)
+
+    num_pairs = num_symbols * (num_symbols - 1) // 2
+    click.echo(f"{num_pairs} pairs over {num_bars - window + 1} windows of "
+               f"{window} bars")
+    click.echo(frame.to_markdown(floatfmt=".3f"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
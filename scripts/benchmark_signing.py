@@ -0,0 +1,71 @@
+import sys
+import time
+import click
+
+import pandas as pd
+
+from urllib.parse import urlencode
+
+from pynance.auth import Signer, signed_params
+from pynance.utils import create_timestamp
+
+SECRET_KEY = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+
+
+def timeit(func, num_requests, num_repeats):
+
+    timings = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return 1e+6 * min(timings) / num_requests
+
+
+@click.command()
+@click.option("--num-requests", "-n", default=100000)
+@click.option("--num-repeats", "-r", default=3)
+def main(num_requests, num_repeats):
+
+    params_list = [dict(symbol="BTCAUD", limit=1000, fromId=i)
+                   for i in range(num_requests)]
+    signer = Signer(SECRET_KEY)
+
+    def baseline():
+        # signed dict, which is encoded again when the request is sent
+        for params in params_list:
+            urlencode(signed_params(params, secret_key=SECRET_KEY))
+
+    def sign():
+        for params in params_list:
+            signer.sign(params)
+
+    def sign_many():
+        signer.sign_many(params_list)
+
+    def timestamp():
+        for params in params_list:
+            create_timestamp()
+
+    results = {
+        "signed_params + urlencode": baseline,
+        "Signer.sign": sign,
+        "Signer.sign_many": sign_many,
+        "(create_timestamp alone)": timestamp,
+    }
+
+    timings = pd.Series({name: timeit(func, num_requests, num_repeats)
+                         for name, func in results.items()},
+                        name="microseconds")
+    frame = timings.to_frame().assign(
+        speedup=lambda x: x.microseconds.iloc[0] / x.microseconds)
+
+    click.echo(f"Signing {num_requests} requests")
+    click.echo(frame.to_markdown(floatfmt=".2f"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
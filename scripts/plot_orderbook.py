@@ -1,177 +1,67 @@
 import sys
 import click
-import requests
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 
 from pathlib import Path
-from datetime import datetime
 from mpl_toolkits.axes_grid1 import make_axes_locatable
-from utils import WIDTH, GOLDEN_RATIO, pt_to_in
+from pynance.client import Client
+from pynance.decoding import create_trades_frame
+from pynance.depth import book_arrays, cumulative_depth
+from pynance.downsample import bin2d
+from pynance.figures import Figure, FigureRenderer
+from utils import style_options
 
 
-def create_trades_frame(trades_list):
+def plot_density(binned, ax):
 
-    trades = pd.DataFrame(trades_list)
-    return trades.assign(time=pd.to_datetime(trades.time, unit="ms"),
-                         price=pd.to_numeric(trades.price),
-                         qty=pd.to_numeric(trades.qty),
-                         quoteQty=pd.to_numeric(trades.quoteQty)) \
-                 .set_index(["time", "id"])
+    counts, xedges, yedges = binned
+    # empty bins left blank, as in a scatter plot
+    return ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts, 0),
+                         cmap="crest")
 
 
-@click.command()
-@click.argument("symbol")
-@click.argument("output_dir", default="figures/",
-                type=click.Path(file_okay=False, dir_okay=True))
-@click.option('--binwidth', '-b', default=1e-4, type=float)
-@click.option('--transparent', is_flag=True)
-@click.option('--context', default="paper")
-@click.option('--style', default="ticks")
-@click.option('--palette', default="muted")
-@click.option('--width', '-w', type=float, default=pt_to_in(WIDTH))
-@click.option('--height', '-h', type=float)
-@click.option('--aspect', '-a', type=float, default=GOLDEN_RATIO)
-@click.option('--dpi', type=float, default=300)
-@click.option('--extension', '-e', multiple=True, default=["png"])
-def main(symbol, output_dir, binwidth, transparent, context, style, palette,
-         width, height, aspect, dpi, extension):
-
-    # preamble
-    if height is None:
-        height = width / aspect
-    # height *= num_iterations
-    # figsize = size(width, aspect)
-    figsize = (width, height)
-
-    suffix = f"{width*dpi:.0f}x{height*dpi:.0f}"
-
-    rc = {
-        "figure.figsize": figsize,
-        "font.serif": ["Times New Roman"],
-        "text.usetex": True,
-    }
-    sns.set(context=context, style=style, palette=palette, font="serif", rc=rc)
-
-    output_path = Path(output_dir).joinpath(symbol)
-    output_path.mkdir(parents=True, exist_ok=True)
-
-    # r = requests.get("https://api.binance.com/api/v3/ticker/price",
-    #                  params=dict(symbol=symbol))
-    # print(r.json())
-
-    # r = requests.get("https://api.binance.com/api/v3/avgPrice",
-    #                  params=dict(symbol=symbol))
-    # avg_price = r.json()
-    # print(f"Average price in the last {avg_price['mins']} minutes: {avg_price['price']}")
-
-    r = requests.get("https://api.binance.com/api/v3/trades",
-                     params=dict(symbol=symbol))
-    frame = create_trades_frame(r.json())
-
-    fig, ax = plt.subplots()
-
-    sns.scatterplot(x="time", y="price", size="qty", data=frame.reset_index(), ax=ax)
-
-    ax.set_xlabel("Price")
-    ax.set_ylabel("Quantity")
-
-    plt.tight_layout()
-
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"trades_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
+def plot_trades(binned, ax):
 
-    plt.show()
+    plot_density(binned, ax)
 
-    r = requests.get("https://api.binance.com/api/v3/ticker/bookTicker",
-                     params=dict(symbol=symbol))
-    book_top = r.json()
-
-    bid_price = book_top.get("bidPrice")
-    bid_qty = book_top.get("bidQty")
-    ask_price = book_top.get("askPrice")
-    ask_qty = book_top.get("askQty")
-
-    name = book_top.pop("symbol")
-    s = pd.Series(book_top, name=name, dtype=float)
-
-    click.echo(s.to_markdown())
-
-    r = requests.get("https://api.binance.com/api/v3/depth",
-                     params=dict(symbol=symbol))
-    results = r.json()
-    last_update_id = results.get('lastUpdateId')
-
-    t = datetime.now()
-
-    click.echo(f"Last update ID: {last_update_id}")
-    frames = {side: pd.DataFrame(data=results[side], columns=["price", "quantity"], dtype=float)
-              for side in ["bids", "asks"]}
-    frames_list = [frames[side].assign(side=side) for side in frames]
-    data = pd.concat(frames_list, axis="index", ignore_index=True, sort=True)
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Price")
 
-    click.echo(data.groupby("side").price.describe().to_markdown())
 
-    fig, ax = plt.subplots()
+def plot_scatter(data, title, ax):
 
-    ax.set_title(f"Last update: {t} (ID: {last_update_id})")
+    ax.set_title(title)
 
     sns.scatterplot(x="price", y="quantity", hue="side", data=data, ax=ax)
 
     ax.set_xlabel("Price")
     ax.set_ylabel("Quantity")
 
-    plt.tight_layout()
 
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"scatter_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
+def plot_box(data, title, ax):
 
-    plt.show()
-
-    fig, ax = plt.subplots()
-
-    ax.set_title(f"Last update: {t} (ID: {last_update_id})")
+    ax.set_title(title)
 
     sns.boxplot(x="price", y="side", data=data, ax=ax)
 
     ax.set_xlabel("Price")
     # ax.set_ylabel("Quantity")
 
-    plt.tight_layout()
-
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"box_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
 
-    plt.show()
-
-    # g = sns.displot(x="price", hue="side", kind="hist", rug=True, data=data,
-    #                 height=height, aspect=aspect, binwidth=binwidth)
-    # for ext in extension:
-    #     g.savefig(output_path.joinpath(f"hist_{context}_{suffix}.{ext}"))
+def plot_hist(data, title, binwidth, ax):
 
-    fig, ax = plt.subplots()
-
-    ax.set_title(f"Last update: {t} (ID: {last_update_id})")
+    ax.set_title(title)
 
     sns.histplot(x="price", hue="side", binwidth=binwidth, data=data, ax=ax)
     sns.rugplot(x="price", hue="side", data=data, ax=ax)
 
-    plt.tight_layout()
-
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"hist_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
-
-    plt.show()
 
-    fig, ax = plt.subplots()
+def plot_hist_weighted(data, title, binwidth, ax):
 
-    ax.set_title(f"Last update: {t} (ID: {last_update_id})")
+    ax.set_title(title)
 
     sns.histplot(x="price", weights="quantity", hue="side", binwidth=binwidth,
                  data=data, ax=ax)
@@ -180,38 +70,22 @@ def main(symbol, output_dir, binwidth, transparent, context, style, palette,
     ax.set_xlabel("Price")
     ax.set_ylabel("Quantity")
 
-    plt.tight_layout()
 
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"hist_weighted_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
+def plot_ecdf(data, depths, title, ax):
 
-    plt.show()
+    ax.set_title(title)
 
-    fig, ax = plt.subplots()
-
-    ax.set_title(f"Last update: {t} (ID: {last_update_id})")
-
-    sns.ecdfplot(x="price", weights="quantity", stat="count",
-                 complementary=True, data=frames["bids"], ax=ax)
-    sns.ecdfplot(x="price", weights="quantity", stat="count",
-                 data=frames["asks"], ax=ax)
+    for prices, depth in depths:
+        ax.step(prices, depth, where="post")
     sns.scatterplot(x="price", y="quantity", hue="side", data=data, ax=ax)
 
     ax.set_xlabel("Price")
     ax.set_ylabel("Quantity")
 
-    plt.tight_layout()
-
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"ecdf_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
 
-    plt.show()
+def plot_trades_depth(binned, data, depths, ax):
 
-    fig, ax = plt.subplots()
-
-    sns.scatterplot(x="time", y="price", hue="qty", data=frame.reset_index(), ax=ax)
+    plot_density(binned, ax)
 
     ax.set_xlabel("Time")
     ax.set_ylabel("Price")
@@ -220,22 +94,90 @@ def main(symbol, output_dir, binwidth, transparent, context, style, palette,
 
     ax_right = divider.append_axes("right", size=0.9, pad=0.1, sharey=ax)
 
-    sns.ecdfplot(y="price", weights="quantity", stat="count",
-                 complementary=True, data=frames["bids"], ax=ax_right)
-    sns.ecdfplot(y="price", weights="quantity", stat="count",
-                 data=frames["asks"], ax=ax_right)
-    sns.scatterplot(x="quantity", y="price", hue="side", data=data, ax=ax_right)
+    for prices, depth in depths:
+        ax_right.step(depth, prices, where="post")
+    sns.scatterplot(x="quantity", y="price", hue="side", data=data,
+                    ax=ax_right)
 
     ax_right.set_xlabel("Quantity")
     ax_right.yaxis.set_tick_params(labelleft=False)
 
-    plt.tight_layout()
 
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"trades_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
+@click.command()
+@click.argument("symbol")
+@click.argument("output_dir", default="figures/",
+                type=click.Path(file_okay=False, dir_okay=True))
+@click.option('--binwidth', '-b', default=1e-4, type=float)
+@click.option('--max-workers', type=int)
+@click.option('--bin-pixels', default=4, type=int, help="Width and height "
+              "in pixels of the bins of trades, drawn in place of markers.")
+@style_options
+def main(symbol, output_dir, binwidth, max_workers, bin_pixels, style):
+
+    output_path = Path(output_dir).joinpath(symbol)
+    renderer = FigureRenderer(output_path, style=style,
+                              max_workers=max_workers)
+
+    # r = requests.get("https://api.binance.com/api/v3/ticker/price",
+    #                  params=dict(symbol=symbol))
+    # print(r.json())
+
+    # r = requests.get("https://api.binance.com/api/v3/avgPrice",
+    #                  params=dict(symbol=symbol))
+    # avg_price = r.json()
+    # print(f"Average price in the last {avg_price['mins']} minutes: {avg_price['price']}")
+
+    client = Client()
+
+    trades = create_trades_frame(client.trades(symbol))
+
+    # quantity traded per bin, which stays as small however many trades
+    width, height = style.pixels
+    binned = bin2d(trades.time, trades.price,
+                   (width // bin_pixels, height // bin_pixels),
+                   weights=trades.qty)
+
+    book_top = client.book_ticker(symbol)
+
+    name = book_top.pop("symbol")
+    s = pd.Series(book_top, name=name, dtype=float)
+
+    click.echo(s.to_markdown())
+
+    results = client.depth(symbol)
+    last_update_id = results.get('lastUpdateId')
+
+    click.echo(f"Last update ID: {last_update_id}")
+    frames = {side: pd.DataFrame(data=results[side], columns=["price", "quantity"], dtype=float)
+              for side in ["bids", "asks"]}
+    frames_list = [frames[side].assign(side=side) for side in frames]
+    data = pd.concat(frames_list, axis="index", ignore_index=True, sort=True)
+
+    bid_prices, bid_qtys, ask_prices, ask_qtys = book_arrays([results])
+    depths = [(bid_prices[0], cumulative_depth(bid_qtys)[0]),
+              (ask_prices[0], cumulative_depth(ask_qtys)[0])]
+
+    click.echo(data.groupby("side").price.describe().to_markdown())
+
+    # not the time fetched, which would change the key of every figure
+    title = f"Last update ID: {last_update_id}"
+
+    # g = sns.displot(x="price", hue="side", kind="hist", rug=True, data=data,
+    #                 height=height, aspect=aspect, binwidth=binwidth)
 
-    plt.show()
+    figures = [
+        Figure("trades", plot_trades, binned),
+        Figure("scatter", plot_scatter, data, title),
+        Figure("box", plot_box, data, title),
+        Figure("hist", plot_hist, data, title, binwidth),
+        Figure("hist_weighted", plot_hist_weighted, data, title, binwidth),
+        Figure("ecdf", plot_ecdf, data, depths, title),
+        Figure("trades_depth", plot_trades_depth, binned, data, depths),
+    ]
+
+    rendered = renderer.render(figures)
+    click.echo(f"Rendered {len(rendered)} of {len(figures)} figures to "
+               f"{output_path}")
 
     return 0
 
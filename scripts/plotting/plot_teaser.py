@@ -15,6 +15,7 @@ import seaborn as sns
 from pathlib import Path
 
 from pynance.datasets import make_regression_dataset
+from pynance.figures import Style
 from pynance.plotting import fill_between_stddev
 
 from sklearn.svm import SVR
@@ -84,7 +85,7 @@ def relative(ratio_inverse, gamma):
 @click.option('--width', '-w', type=float, default=pt_to_in(WIDTH))
 @click.option('--height', '-h', type=float)
 @click.option('--aspect', '-a', type=float, default=GOLDEN_RATIO)
-@click.option('--dpi', type=float)
+@click.option('--dpi', type=float, default=300)
 @click.option('--extension', '-e', multiple=True, default=["png"])
 @click.option("--seed", default=8888)
 def main(name, gamma, output_dir, transparent, context, style, palette, width,
@@ -98,18 +99,11 @@ def main(name, gamma, output_dir, transparent, context, style, palette, width,
     num_index_points = 512
     x_min, x_max = -1.0, 2.0
 
-    if height is None:
-        height = width / aspect
-    # figsize = size(width, aspect)
-    figsize = (width, height)
-    suffix = f"{width*dpi:.0f}x{height*dpi:.0f}"
-
-    rc = {
-        "figure.figsize": figsize,
-        "font.serif": ["Times New Roman"],
-        "text.usetex": True,
-    }
-    sns.set(context=context, style=style, palette=palette, font="serif", rc=rc)
+    style = Style(context=context, style=style, palette=palette,
+                  width=width, height=height, aspect=aspect, dpi=dpi,
+                  transparent=transparent, usetex=True, extensions=extension)
+    style.apply()
+    suffix = style.suffix
 
     output_path = Path(output_dir).joinpath(name)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -1,18 +1,10 @@
-import numpy as np
 import pandas as pd
 import yaml
 
 from pynance.benchmarks import make_benchmark
+from pynance.figures import GOLDEN_RATIO, WIDTH, pt_to_in
 from pathlib import Path
 
-GOLDEN_RATIO = 0.5 * (1 + np.sqrt(5))
-WIDTH = 397.48499
-
-
-def pt_to_in(x):
-    pt_per_in = 72.27
-    return x / pt_per_in
-
 
 def size(width, aspect=GOLDEN_RATIO):
     width_in = pt_to_in(width)
@@ -1,27 +1,139 @@
 import sys
+import time
 import click
-import requests
-import requests_cache
+import asyncio
 import configparser
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from matplotlib.patches import Rectangle
 from pandas.tseries.frequencies import to_offset
 from pathlib import Path
+from pynance.aggtrades import iter_agg_trades
+from pynance.aio import AsyncClient
+from pynance.backfill import backfill_trades
+from pynance.bars import build_bars
+from pynance.client import Client
+from pynance.downsample import lttb
+from pynance.figures import Figure, FigureRenderer
+from pynance.klines import (KlineStore, fetch_klines, interval_milliseconds,
+                            sync_klines)
+from pynance.panel import build_panel
+from pynance.ratelimit import RateLimiter
+from pynance.store import TradeStore
 from pynance.utils import create_session
-from utils import WIDTH, GOLDEN_RATIO, pt_to_in
+from utils import style_options
 
 
-def create_trades_frame(trades_list):
+def fetch_trades(client, symbol, num_trades, max_workers=8, high_water=None):
+    """Id of the first of the latest `num_trades` trades of `symbol`, and
+    those of them after `high_water` (e.g. the last id stored)."""
+    stop_id = client.trades(symbol, limit=1)[-1]["id"] + 1
+    start_id = stop_id - num_trades
 
-    trades = pd.DataFrame(trades_list)
-    return trades.assign(time=pd.to_datetime(trades.time, unit="ms"),
-                         price=pd.to_numeric(trades.price),
-                         qty=pd.to_numeric(trades.qty),
-                         quoteQty=pd.to_numeric(trades.quoteQty))
+    first_id = start_id if high_water is None \
+        else min(max(start_id, high_water + 1), stop_id)
+
+    return start_id, backfill_trades(client, symbol, start_id=first_id,
+                                     stop_id=stop_id, max_workers=max_workers,
+                                     frame=True)
+
+
+def fetch_agg_trades(client, symbol, num_trades):
+    """Batches of the latest `num_trades` aggregate trades of `symbol`."""
+    stop_id = client.agg_trades(symbol, limit=1)[-1]["a"] + 1
+    start_id = max(stop_id - num_trades, 0)
+    return list(iter_agg_trades(client, symbol, from_id=start_id))
+
+
+def store_trades(store, symbol, start_id, frame, chunksize=100000):
+    """Batches of the trades of `symbol` from `start_id`, after appending
+    the new ones in `frame` to `store`."""
+    if len(frame):
+        store.append(symbol, frame)
+
+    for batch in store.iter_read(symbol, chunksize=chunksize):
+        yield batch[batch.id >= start_id]
+
+
+def fetch_trade_closes(symbols, nums_trades, store_dir=None, cache_name=None,
+                       agg_trades=False, **kwargs):
+    """Closes of 15 minute bars of the latest trades (or aggregate trades)
+    of each of `symbols`, as many as in `nums_trades`, appending new trades
+    to a `TradeStore` in `store_dir` if given."""
+    store = None if store_dir is None else TradeStore(store_dir)
+    high_waters = {symbol: None if store is None else store.high_water(symbol)
+                   for symbol in symbols}
+
+    session = None if cache_name is None \
+        else create_session(location=cache_name)
+
+    def fetch(client, symbol, num_trades):
+
+        if agg_trades:
+            return fetch_agg_trades(client, symbol, num_trades=num_trades)
+
+        return fetch_trades(client, symbol, num_trades=num_trades,
+                            high_water=high_waters[symbol])
+
+    def closes(symbol, result):
+
+        if agg_trades:
+            batches = result
+        else:
+            start_id, frame = result
+            batches = [frame] if store is None \
+                else store_trades(store, symbol, start_id, frame)
+
+        return build_bars(batches, intervals=["15min"])["15min"].close
+
+    series = {}
+
+    # symbols are fetched concurrently, so the slowest one sets the pace,
+    # but bars are built (and trades stored) one at a time, as each finishes
+    with Client(session=session, pool_maxsize=16, rate_limiter=RateLimiter(),
+                **kwargs) as client, \
+            ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+
+        futures = {executor.submit(fetch, client, symbol, num_trades): symbol
+                   for symbol, num_trades in zip(symbols, nums_trades)}
+
+        for future in as_completed(futures):
+            symbol = futures[future]
+            series[symbol] = closes(symbol, future.result())
+
+    return series
+
+
+def fetch_kline_closes(symbols, start_time, store_dir=None, **kwargs):
+    """Closes of the 15 minute klines of each of `symbols` opening from
+    `start_time` (in ms), synced to a `KlineStore` in `store_dir` if given,
+    all fetched concurrently with an `AsyncClient` created from `kwargs`."""
+    if store_dir is not None:
+        store = KlineStore(store_dir, interval="15m")
+        sync_klines(store, symbols, start_time, **kwargs)
+        start = pd.Timestamp(start_time, unit="ms")
+        frames = [store.read(symbol, start=start) for symbol in symbols]
+    else:
+        async def main():
+            async with AsyncClient(**kwargs) as client:
+                return await asyncio.gather(*(
+                    fetch_klines(client, symbol, "15m", start_time)
+                    for symbol in symbols))
+
+        frames = asyncio.run(main())
+
+    return {symbol: frame.set_index("openTime").close
+            for symbol, frame in zip(symbols, frames)}
+
+
+def plot_price(data, ax):
+
+    sns.lineplot(x="ETH", y="BTC", estimator=None, sort=False, data=data,
+                 ax=ax)
+    # fig.autofmt_xdate()
 
 
 @click.command()
@@ -30,98 +142,59 @@ def create_trades_frame(trades_list):
                 type=click.Path(file_okay=False, dir_okay=True))
 @click.option("--credentials-file", type=click.File('r'),
               default="scripts/credentials")
-@click.option('--transparent', is_flag=True)
-@click.option('--context', default="paper")
-@click.option('--style', default="ticks")
-@click.option('--palette', default="muted")
-@click.option('--width', '-w', type=float, default=pt_to_in(WIDTH))
-@click.option('--height', '-h', type=float)
-@click.option('--aspect', '-a', type=float, default=GOLDEN_RATIO)
-@click.option('--dpi', type=float, default=300)
-@click.option('--extension', '-e', multiple=True, default=["png"])
-def main(symbol, credentials_file, output_dir, transparent, context, style,
-         palette, width, height, aspect, dpi, extension):
-
-    # preamble
-    if height is None:
-        height = width / aspect
-    # height *= num_iterations
-    # figsize = size(width, aspect)
-    figsize = (width, height)
-
-    suffix = f"{width*dpi:.0f}x{height*dpi:.0f}"
-
-    rc = {
-        "figure.figsize": figsize,
-        "font.serif": ["Times New Roman"],
-        "text.usetex": False,
-    }
-    sns.set(context=context, style=style, palette=palette, font="serif", rc=rc)
+@click.option("--store-dir", type=click.Path(file_okay=False, dir_okay=True))
+@click.option("--cache-name", help="Cache responses (per the default "
+              "cache policy) in this sqlite database.")
+@click.option("--agg-trades", is_flag=True, help="Build bars from aggregate "
+              "trades, which are fewer (and fewer bytes) for the same prices.")
+@click.option("--klines", is_flag=True, help="Take closes from the 15 "
+              "minute klines instead of building bars from trades.")
+@click.option("--num-klines", default=1000, help="Number of the latest 15 "
+              "minute klines to take closes from.")
+@style_options
+def main(symbol, credentials_file, output_dir, store_dir, cache_name,
+         agg_trades, klines, num_klines, style):
 
     output_path = Path(output_dir).joinpath(symbol)
-    output_path.mkdir(parents=True, exist_ok=True)
+    renderer = FigureRenderer(output_path, style=style)
 
     config = configparser.ConfigParser()
     config.read_file(credentials_file)
 
     api_key = config["binance"]["api_key"]
-    headers = {"X-MBX-APIKEY": api_key}
 
     limit = 500
     num_blocks_list = [100, 100]
 
-    s = requests_cache.CachedSession(backend="sqlite", expire=6000)
-    # s = requests.Session()
-    s.headers.update(headers)
-
     targets = ["BTC", "ETH"]
     source = "AUD"
 
-    series = {}
-
-    for target, num_blocks in zip(targets, num_blocks_list):
+    symbols = {target: ''.join((target, source)) for target in targets}
 
-        symbol = ''.join((target, source))
+    if klines:
+        start_time = int(1e+3 * time.time()) \
+            - num_klines * interval_milliseconds("15m")
+        closes = fetch_kline_closes(list(symbols.values()), start_time,
+                                    store_dir=store_dir, api_key=api_key)
+    else:
+        nums_trades = [limit * num_blocks for num_blocks in num_blocks_list]
+        closes = fetch_trade_closes(list(symbols.values()), nums_trades,
+                                    store_dir=store_dir,
+                                    cache_name=cache_name,
+                                    agg_trades=agg_trades, api_key=api_key)
 
-        top_id = None
-        frames = []
+    series = {target: closes[symbol] for target, symbol in symbols.items()}
 
-        for block in range(num_blocks):
-
-            if top_id is None:
-                url = "https://api.binance.com/api/v3/trades"
-                params = dict(symbol=symbol, limit=limit)
-            else:
-                url = "https://api.binance.com/api/v3/historicalTrades"
-                params = dict(symbol=symbol, limit=limit, fromId=top_id-limit)
-
-            r = s.get(url, params=params)
-            trades_list = r.json()
-
-            top_id = trades_list[0]["id"]
-
-            frame = create_trades_frame(trades_list)
-            frames.append(frame)
-
-        data = pd.concat(frames, axis="index", ignore_index=True, sort=True) \
-                 .set_index("time")
-        se = data.resample("15T").price.last()
-        series[target] = se
-
-    data = pd.DataFrame(series).dropna(axis="index", how="any").reset_index()
-
-    fig, ax = plt.subplots()
-
-    sns.lineplot(x="ETH", y="BTC", estimator=None, sort=False, data=data, ax=ax)
-
-    plt.tight_layout()
-    # fig.autofmt_xdate()
+    start = max(closes.index[0] for closes in series.values())
+    end = min(closes.index[-1] for closes in series.values())
+    panel = build_panel(series, start, end + to_offset("15min"), "15min",
+                        how="inner")
+    data = panel.to_frame().reset_index()
 
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"price_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
+    # no more points than pixels across
+    data = data.iloc[lttb(data.ETH, data.BTC, style.pixels[0])]
 
-    plt.show()
+    renderer.render([Figure("price", plot_price, data)])
 
     # foo = data.groupby("target").resample("15T", on="time").price.last()
 
@@ -3,26 +3,18 @@ import click
 import requests, requests_cache
 import configparser
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 
 from pathlib import Path
 from datetime import datetime
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
-from pynance.auth import signed_params
-from pynance.utils import create_session, create_datetime, to_milliseconds
-from utils import WIDTH, GOLDEN_RATIO, pt_to_in
-
-
-def create_trades_frame(trades_list):
-
-    trades = pd.DataFrame(trades_list)
-    return trades.assign(time=pd.to_datetime(trades.time, unit="ms"),
-                         price=pd.to_numeric(trades.price),
-                         qty=pd.to_numeric(trades.qty),
-                         quoteQty=pd.to_numeric(trades.quoteQty))
+from pynance.client import Client
+from pynance.fixedpoint import symbol_decimals, to_fixed, to_float
+from pynance.ledger import Ledger, sync_ledger
+from utils import style_options
 
 
 @click.command()
@@ -31,33 +23,10 @@ def create_trades_frame(trades_list):
                 type=click.Path(file_okay=False, dir_okay=True))
 @click.option("--credentials-file", type=click.File('r'),
               default="scripts/credentials")
-@click.option('--transparent', is_flag=True)
-@click.option('--context', default="paper")
-@click.option('--style', default="ticks")
-@click.option('--palette', default="muted")
-@click.option('--width', '-w', type=float, default=pt_to_in(WIDTH))
-@click.option('--height', '-h', type=float)
-@click.option('--aspect', '-a', type=float, default=GOLDEN_RATIO)
-@click.option('--dpi', type=float, default=300)
-@click.option('--extension', '-e', multiple=True, default=["png"])
-def main(symbol, credentials_file, output_dir, transparent, context, style,
-         palette, width, height, aspect, dpi, extension):
-
-    # preamble
-    if height is None:
-        height = width / aspect
-    # height *= num_iterations
-    # figsize = size(width, aspect)
-    figsize = (width, height)
-
-    suffix = f"{width*dpi:.0f}x{height*dpi:.0f}"
-
-    rc = {
-        "figure.figsize": figsize,
-        "font.serif": ["Times New Roman"],
-        "text.usetex": False,
-    }
-    sns.set(context=context, style=style, palette=palette, font="serif", rc=rc)
+@click.option("--ledger-dir", default="ledger/",
+              type=click.Path(file_okay=False, dir_okay=True))
+@style_options
+def main(symbol, credentials_file, ledger_dir, output_dir, style):
 
     output_path = Path(output_dir).joinpath(symbol)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -70,16 +39,15 @@ def main(symbol, credentials_file, output_dir, transparent, context, style,
 
     # s = requests_cache.CachedSession(backend="sqlite")
 
-    s = create_session(api_key)
-    r = s.get("https://api.binance.com/api/v3/myTrades",
-              params=signed_params(params=dict(symbol=symbol),
-                                   secret_key=secret_key))
+    client = Client(api_key=api_key, secret_key=secret_key)
 
-    frame = create_trades_frame(r.json()).set_index(["orderId", "id", "time"]) \
-        .assign(commission=lambda x: pd.to_numeric(x.commission))
+    # only trades newer than those already in the ledger are downloaded
+    ledger = Ledger(ledger_dir)
+    sync_ledger(ledger, [symbol], api_key=api_key, secret_key=secret_key)
 
-    r = s.get("https://api.binance.com/api/v3/avgPrice", params=dict(symbol=symbol))
-    avg_price = r.json()
+    frame = ledger.read(symbol).set_index(["orderId", "id", "time"])
+
+    avg_price = client.avg_price(symbol)
     print(f"Average price in the last {avg_price['mins']} minutes: "
           f"{avg_price['price']}")
 
@@ -92,8 +60,13 @@ def main(symbol, credentials_file, output_dir, transparent, context, style,
                          delta_pct=lambda x: 100.0 * x.delta_rate,
                          relative_qty=lambda x: (-1)**(~x.isBuyer) * x.qty)
 
+    # accumulate exactly in fixed-point so the position does not drift
+    decimals = symbol_decimals(client.exchange_info(), symbol)["qty"]
+    relative_qty = to_fixed(frame.relative_qty, decimals)
+    position = to_float(np.cumsum(relative_qty), decimals)
+
     print(frame)
-    print(frame.relative_qty.cumsum())
+    print(pd.Series(position, index=frame.index, name="position"))
 
     # # r = requests.get("https://api.binance.com/api/v3/trades",
     # #                  params=dict(symbol=symbol))
@@ -2,26 +2,43 @@ import sys
 import click
 import configparser
 
-import requests, requests_cache
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
 from pathlib import Path
 from matplotlib.patches import Rectangle
 
-from pynance.auth import signed_params
-from pynance.utils import create_session
-from utils import WIDTH, GOLDEN_RATIO, pt_to_in
+from pynance.client import Client
+from pynance.figures import Figure, FigureRenderer
+from pynance.ledger import Ledger, sync_ledger
+from pynance.pnl import match_trades, unrealized_pnl
+from utils import style_options
+
+
+def plot_rectangles(buys, sells, lots, current_price, ax):
+
+    for x, price, qty in zip(buys.qty.cumsum() - buys.qty, buys.price,
+                             buys.qty):
+        rect = Rectangle((x, 0.), qty, price, linewidth=0.25,
+                         edgecolor="k", facecolor="none")
+        ax.add_patch(rect)
+
+    for x, price, qty in zip(sells.qty.cumsum() - sells.qty, sells.price,
+                             sells.qty):
+        rect = Rectangle((x, 0.), qty, price, linewidth=0.25,
+                         edgecolor="tab:red", facecolor="none")
+        ax.add_patch(rect)
 
+    for x, lot in zip(lots.qty.cumsum() - lots.qty, lots.itertuples()):
+        rect = Rectangle((x, lot.cost), lot.qty, lot.price - lot.cost,
+                         linewidth=0.25, edgecolor="tab:green",
+                         facecolor="tab:green", alpha=0.2)
+        ax.add_patch(rect)
 
-def create_trades_frame(trades_list):
+    # ax.set_xlim(-0.1, 17)
+    # ax.set_ylim(-0.1, 1900)
+
+    ax.set_xlim(None, max(buys.qty.sum(), sells.qty.sum()))
+    ax.set_ylim(None, max(current_price, buys.price.max(), sells.price.max()))
 
-    trades = pd.DataFrame(trades_list)
-    return trades.assign(time=pd.to_datetime(trades.time, unit="ms"),
-                         price=pd.to_numeric(trades.price),
-                         qty=pd.to_numeric(trades.qty),
-                         quoteQty=pd.to_numeric(trades.quoteQty))
+    ax.axhline(y=current_price)
 
 
 @click.command()
@@ -30,36 +47,13 @@ def create_trades_frame(trades_list):
                 type=click.Path(file_okay=False, dir_okay=True))
 @click.option("--credentials-file", type=click.File('r'),
               default="scripts/credentials")
-@click.option('--transparent', is_flag=True)
-@click.option('--context', default="paper")
-@click.option('--style', default="ticks")
-@click.option('--palette', default="muted")
-@click.option('--width', '-w', type=float, default=pt_to_in(WIDTH))
-@click.option('--height', '-h', type=float)
-@click.option('--aspect', '-a', type=float, default=GOLDEN_RATIO)
-@click.option('--dpi', type=float, default=300)
-@click.option('--extension', '-e', multiple=True, default=["png"])
-def main(symbol, credentials_file, output_dir, transparent, context, style,
-         palette, width, height, aspect, dpi, extension):
-
-    # preamble
-    if height is None:
-        height = width / aspect
-    # height *= num_iterations
-    # figsize = size(width, aspect)
-    figsize = (width, height)
-
-    suffix = f"{width*dpi:.0f}x{height*dpi:.0f}"
-
-    rc = {
-        "figure.figsize": figsize,
-        "font.serif": ["Times New Roman"],
-        "text.usetex": False,
-    }
-    sns.set(context=context, style=style, palette=palette, font="serif", rc=rc)
+@click.option("--ledger-dir", default="ledger/",
+              type=click.Path(file_okay=False, dir_okay=True))
+@style_options
+def main(symbol, credentials_file, ledger_dir, output_dir, style):
 
     output_path = Path(output_dir).joinpath(symbol)
-    output_path.mkdir(parents=True, exist_ok=True)
+    renderer = FigureRenderer(output_path, style=style)
 
     config = configparser.ConfigParser()
     config.read_file(credentials_file)
@@ -71,38 +65,23 @@ def main(symbol, credentials_file, output_dir, transparent, context, style,
 
     # s = create_session(api_key)
 
-    headers = {"X-MBX-APIKEY": api_key}
-
     # s = requests_cache.CachedSession(backend="sqlite", ignored_parameters=["timestamp", "signature"])
-    s = requests.Session()
-    s.headers.update(headers)
+    client = Client(api_key=api_key, secret_key=secret_key)
 
-    r = s.get("https://api.binance.com/api/v3/avgPrice", params=dict(symbol=symbol))
-    avg_price = r.json()
+    avg_price = client.avg_price(symbol)
     print(f"Average price in the last {avg_price['mins']} minutes: "
           f"{avg_price['price']}")
 
     current_price = float(avg_price.get("price"))
 
-    if output_path.joinpath("transactions.csv").exists():
-
-        frame = pd.read_csv(output_path.joinpath("transactions.csv"),
-                            index_col=["orderId", "id"])
-
-        print(frame)
-
-    else:
+    # only trades newer than those already in the ledger are downloaded
+    ledger = Ledger(ledger_dir)
+    sync_ledger(ledger, [symbol], api_key=api_key, secret_key=secret_key)
 
-        r = s.get("https://api.binance.com/api/v3/myTrades",
-                  params=signed_params(params=dict(symbol=symbol),
-                                       secret_key=secret_key))
+    frame = ledger.read(symbol).set_index(["orderId", "id"]) \
+        .drop(columns=["quoteQty", "isMaker", "isBestMatch"])
 
-        frame = create_trades_frame(r.json()).set_index(["orderId", "id"]) \
-            .assign(commission=lambda x: pd.to_numeric(x.commission)) \
-            .drop(columns=["quoteQty", "isMaker", "isBestMatch"])
-        frame.to_csv(output_path.joinpath("transactions.csv"))
-
-        print(frame)
+    print(frame)
 
     new_frame = frame.groupby(level="orderId").agg({"time": "last",
                                                     "price": "last",
@@ -111,76 +90,20 @@ def main(symbol, credentials_file, output_dir, transparent, context, style,
                                                     "commissionAsset": "last",
                                                     "isBuyer": "last"})
 
-    buys = new_frame.query("isBuyer").sort_values(by="time", ascending=True)
-    sells = new_frame.query("not isBuyer").sort_values(by="time", ascending=True)
-
-    buys_arr = buys[["price", "qty"]].to_numpy()
-    sells_arr = sells[["price", "qty"]].to_numpy()
-
-    print(buys_arr, sells_arr)
-
-    n = len(buys_arr)
-    m = len(sells_arr)
-
-    buy_qty_acc = sell_qty_acc = 0.
-    i = j = 0
+    new_frame = new_frame.sort_values(by="time", ascending=True)
 
-    spill = 0
-
-    fig, ax = plt.subplots()
-
-    while i < n:
-
-        if sell_qty_acc >= buy_qty_acc or j >= m:
-
-            buy_price, buy_qty = buys_arr[i]
-
-            rect = Rectangle((buy_qty_acc, 0.), buy_qty, buy_price, linewidth=0.25,
-                             edgecolor="k", facecolor="none")
-            ax.add_patch(rect)
-
-            buy_qty_acc += buy_qty
-            i += 1
-        else:
-
-            if spill <= 0:
-                sell_price, sell_qty = sells_arr[j]
-
-                rect = Rectangle((sell_qty_acc, 0.),
-                                 sell_qty, sell_price, linewidth=0.25,
-                                 edgecolor="tab:red", facecolor="none")
-                ax.add_patch(rect)
-
-            rect = Rectangle((sell_qty_acc, buy_price),
-                             min(sell_qty, buy_qty_acc-sell_qty_acc),
-                             sell_price - buy_price, linewidth=0.25,
-                             edgecolor="tab:green", facecolor="tab:green", alpha=0.2)
-            ax.add_patch(rect)
-
-            spill = sell_qty_acc + sell_qty - buy_qty_acc
-
-            if spill > 0:
-                sell_qty_acc = buy_qty_acc
-                sell_qty = spill
-            else:
-                sell_qty_acc += sell_qty
-                j += 1
-
-    # ax.set_xlim(-0.1, 17)
-    # ax.set_ylim(-0.1, 1900)
-
-    ax.set_xlim(None, max(buys.qty.sum(), sells.qty.sum()))
-    ax.set_ylim(None, max(current_price, buys.price.max(), sells.price.max()))
-
-    ax.axhline(y=current_price)
+    lots, open_lots = match_trades(new_frame.isBuyer, new_frame.price,
+                                   new_frame.qty, method="fifo")
 
-    plt.tight_layout()
+    print(lots)
+    print(f"Realized: {lots.pnl.sum()}, unrealized: "
+          f"{unrealized_pnl(open_lots, current_price).sum()}")
 
-    for ext in extension:
-        fig.savefig(output_path.joinpath(f"rectangles_{context}_{suffix}.{ext}"),
-                    dpi=dpi, transparent=transparent)
+    buys = new_frame.query("isBuyer")
+    sells = new_frame.query("not isBuyer")
 
-    plt.show()
+    renderer.render([Figure("rectangles", plot_rectangles, buys, sells, lots,
+                            current_price)])
 
     # fig, ax = plt.subplots()
 
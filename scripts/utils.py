@@ -1,9 +1,35 @@
-import numpy as np
+import functools
+import click
 
-GOLDEN_RATIO = 0.5 * (1 + np.sqrt(5))
-WIDTH = 397.48499
+from pynance.figures import GOLDEN_RATIO, WIDTH, Style, pt_to_in
 
 
-def pt_to_in(x):
-    pt_per_in = 72.27
-    return x / pt_per_in
+def style_options(func):
+    """Add the options of a :class:`pynance.figures.Style` to click command
+    ``func``, which is passed the style in their place as ``style``."""
+    options = [
+        click.option('--transparent', is_flag=True),
+        click.option('--usetex', is_flag=True),
+        click.option('--context', default="paper"),
+        click.option('--style', default="ticks"),
+        click.option('--palette', default="muted"),
+        click.option('--width', '-w', type=float, default=pt_to_in(WIDTH)),
+        click.option('--height', '-h', type=float),
+        click.option('--aspect', '-a', type=float, default=GOLDEN_RATIO),
+        click.option('--dpi', type=float, default=300),
+        click.option('--extension', '-e', multiple=True, default=["png"]),
+    ]
+
+    @functools.wraps(func)
+    def wrapper(*args, transparent, usetex, context, style, palette, width,
+                height, aspect, dpi, extension, **kwargs):
+        style = Style(context=context, style=style, palette=palette,
+                      width=width, height=height, aspect=aspect, dpi=dpi,
+                      transparent=transparent, usetex=usetex,
+                      extensions=extension)
+        return func(*args, style=style, **kwargs)
+
+    for option in reversed(options):
+        wrapper = option(wrapper)
+
+    return wrapper
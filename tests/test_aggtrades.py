@@ -0,0 +1,58 @@
+"""Tests for `pynance.aggtrades` module."""
+
+import numpy as np
+import pytest
+
+from pynance.aggtrades import fetch_agg_trades, iter_agg_trades
+from pynance.bars import build_bars
+from pynance.client import Client
+from pynance.testing import T0, StubServer
+
+
+@pytest.fixture
+def client():
+    with StubServer(num_trades=2500) as server:
+        with Client(base_url=server.base_url) as client:
+            yield client
+
+
+def test_iter_agg_trades(client):
+
+    pages = list(iter_agg_trades(client, "BTCAUD", from_id=100, limit=1000))
+
+    assert [len(page) for page in pages] == [1000, 1000, 400]
+    np.testing.assert_array_equal(pages[1].id, np.arange(1100, 2100))
+
+
+@pytest.mark.parametrize("limit", [100, 1000])
+def test_time_window(client, limit):
+
+    # aggregate trades are 100ms apart, so two hours hold more than there are
+    start_time, end_time = T0 + 1050, T0 + 2 * 3600 * 1000
+    frame = fetch_agg_trades(client, "BTCAUD", start_time=start_time,
+                             end_time=end_time, limit=limit)
+
+    np.testing.assert_array_equal(frame.id, np.arange(11, 2500))
+
+    frame = fetch_agg_trades(client, "BTCAUD", start_time=start_time,
+                             end_time=T0 + 20000, limit=limit)
+
+    np.testing.assert_array_equal(frame.id, np.arange(11, 201))
+    assert frame.time.iloc[-1] == np.datetime64(T0 + 20000, "ms")
+
+
+def test_empty(client):
+
+    frame = fetch_agg_trades(client, "BTCAUD", from_id=2500)
+    assert frame.empty
+    assert list(frame.columns)[:3] == ["id", "price", "qty"]
+
+
+def test_build_bars(client):
+
+    bars = build_bars(iter_agg_trades(client, "BTCAUD", limit=500),
+                      intervals=["1min"])["1min"]
+
+    assert bars["count"].sum() == 2500
+    assert bars.volume.sum() == pytest.approx(
+        sum(1e-3 * (1 + i % 13) for i in range(2500)))
@@ -0,0 +1,47 @@
+"""Tests for `pynance.aio` module."""
+
+import asyncio
+import time
+
+from pynance.aio import AsyncClient
+from pynance.testing import StubServer
+
+
+def test_gather_concurrent():
+
+    num_symbols = 20
+    latency = 0.1
+
+    symbols = [f"SYM{i}AUD" for i in range(num_symbols)]
+
+    async def fetch(base_url):
+        async with AsyncClient(base_url=base_url,
+                               max_concurrency=num_symbols) as client:
+            return await client.gather(client.historical_trades, symbols,
+                                       limit=5, from_id=10)
+
+    with StubServer(num_trades=100, latency=latency) as server:
+        start = time.perf_counter()
+        results = asyncio.run(fetch(server.base_url))
+        elapsed = time.perf_counter() - start
+
+    assert list(results) == symbols
+    assert all([t["id"] for t in trades] == list(range(10, 15))
+               for trades in results.values())
+    # requests overlap instead of running back to back
+    assert elapsed < 0.5 * num_symbols * latency
+
+
+def test_concurrency_cap():
+
+    async def fetch(base_url):
+        async with AsyncClient(base_url=base_url,
+                               max_concurrency=2) as client:
+            await client.gather(client.book_ticker, ["A", "B", "C", "D"])
+
+    with StubServer(latency=0.1) as server:
+        start = time.perf_counter()
+        asyncio.run(fetch(server.base_url))
+        elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.2
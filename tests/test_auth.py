@@ -0,0 +1,74 @@
+"""Tests for `pynance.auth` module."""
+
+import asyncio
+
+import pytest
+import requests
+
+from urllib.parse import parse_qsl, urlencode
+
+from pynance.aio import AsyncClient
+from pynance.auth import Signer, create_signature, encode_params
+from pynance.client import Client
+from pynance.testing import StubServer
+
+SECRET_KEY = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+
+
+def test_encode_params():
+
+    params = dict(symbol="BTCAUD", limit=1000, price=0.1, side="BUY",
+                  note="a b&c=d/é", flag=True)
+    assert encode_params(params) == urlencode(params)
+
+
+def test_sign():
+
+    signer = Signer(SECRET_KEY)
+    params = dict(symbol="LTCBTC", side="BUY", quantity=1)
+
+    query = signer.sign(params, timestamp=1499827319559)
+    signed = dict(parse_qsl(query))
+
+    assert list(signed) == ["symbol", "side", "quantity", "timestamp",
+                            "signature"]
+    assert signed.pop("signature") == create_signature(signed, SECRET_KEY)
+
+    # the pre-keyed state is not consumed
+    assert signer.sign(params, timestamp=1499827319559) == query
+    assert signer.sign({}, timestamp=1).startswith("timestamp=1&signature=")
+
+
+def test_sign_many():
+
+    signer = Signer(SECRET_KEY)
+    params_list = [dict(symbol=symbol) for symbol in ("BTCAUD", "ETHAUD")]
+
+    queries = signer.sign_many(params_list, timestamp=1)
+    assert queries == [signer.sign(params, timestamp=1)
+                       for params in params_list]
+
+
+def test_signed_requests():
+
+    num_my_trades = {"BTCAUD": 10}
+
+    with StubServer(num_my_trades=num_my_trades,
+                    secret_key=SECRET_KEY) as server:
+
+        with Client(api_key="foo", secret_key=SECRET_KEY,
+                    base_url=server.base_url) as client:
+            assert len(client.my_trades("BTCAUD")) == 10
+
+        with Client(api_key="foo", secret_key="bar",
+                    base_url=server.base_url) as client:
+            with pytest.raises(requests.HTTPError):
+                client.my_trades("BTCAUD")
+
+        async def fetch():
+            async with AsyncClient(api_key="foo", secret_key=SECRET_KEY,
+                                   base_url=server.base_url) as client:
+                return await client.my_trades("BTCAUD", from_id=5)
+
+        assert [trade["id"] for trade in asyncio.run(fetch())] == \
+            list(range(5, 10))
@@ -0,0 +1,152 @@
+"""Tests for `pynance.backfill` module."""
+
+import pandas as pd
+import pytest
+
+from pynance.backfill import (Checkpoint, backfill_trades, find_gaps,
+                              find_trade_id)
+from pynance.client import Client
+from pynance.decoding import create_trades_frame
+from pynance.testing import StubServer, T0
+
+
+@pytest.fixture
+def client():
+    with StubServer(num_trades=10000) as server:
+        with Client(base_url=server.base_url, pool_maxsize=8) as client:
+            yield client
+
+
+def test_find_gaps():
+    assert find_gaps([0, 1, 4, 5, 9], 0, 12) == [(2, 4), (6, 9), (10, 12)]
+    assert find_gaps([], 3, 5) == [(3, 5)]
+    assert find_gaps(range(5), 0, 5) == []
+
+
+def test_find_trade_id(client):
+    assert find_trade_id(client, "BTCAUD", T0 + 100 * 42) == 42
+    assert find_trade_id(client, "BTCAUD", T0 + 100 * 42 - 1) == 42
+
+
+def test_backfill_trades(client):
+
+    trades = backfill_trades(client, "BTCAUD", start_id=1234, limit=500)
+    assert [trade["id"] for trade in trades] == list(range(1234, 10000))
+
+    trades = backfill_trades(client, "BTCAUD", start_time=T0 + 100 * 10,
+                             end_time=T0 + 100 * 2000, limit=100)
+    assert [trade["id"] for trade in trades] == list(range(10, 2000))
+
+    # after the last trade
+    assert backfill_trades(client, "BTCAUD", start_time=T0 + 100 * 10000) \
+        == []
+    assert len(backfill_trades(client, "BTCAUD", frame=True,
+                               start_time=T0 + 100 * 10000)) == 0
+
+
+def test_backfill_frame(client, tmp_path):
+
+    trades = backfill_trades(client, "BTCAUD", start_id=1234, stop_id=5678,
+                             limit=500)
+    frame = backfill_trades(client, "BTCAUD", start_id=1234, stop_id=5678,
+                            limit=500, frame=True)
+    pd.testing.assert_frame_equal(frame, create_trades_frame(trades))
+
+    # resumed from the raw bodies checkpointed
+    backfill_trades(client, "BTCAUD", start_id=0, stop_id=500, limit=100,
+                    checkpoint_dir=tmp_path, frame=True)
+    client.historical_trades = None
+    frame = backfill_trades(client, "BTCAUD", start_id=100, stop_id=400,
+                            checkpoint_dir=tmp_path, frame=True)
+    assert frame.id.tolist() == list(range(100, 400))
+
+
+def test_backfill_checkpoint_kept(client, tmp_path):
+
+    historical_trades = client.historical_trades
+
+    def overlapping_historical_trades(symbol, limit=None, from_id=None,
+                                      raw=False):
+        # five trades either side of the window
+        return historical_trades(symbol, limit=limit + 10,
+                                 from_id=max(from_id - 5, 0), raw=raw)
+
+    client.historical_trades = overlapping_historical_trades
+    frame = backfill_trades(client, "BTCAUD", start_id=100, stop_id=400,
+                            limit=100, checkpoint_dir=tmp_path, frame=True)
+    assert frame.id.tolist() == list(range(100, 400))
+
+    checkpoint = Checkpoint(tmp_path.joinpath("BTCAUD"))
+    pd.testing.assert_frame_equal(
+        pd.concat(checkpoint.load_frames(), ignore_index=True), frame)
+
+
+def test_backfill_refetch_holes(client):
+
+    historical_trades = client.historical_trades
+    calls = []
+
+    def short_historical_trades(symbol, limit=None, from_id=None):
+        calls.append(from_id)
+        trades = historical_trades(symbol, limit=limit, from_id=from_id)
+        # first round of responses come back short
+        return trades[:-10] if len(calls) <= 10 else trades
+
+    client.historical_trades = short_historical_trades
+    trades = backfill_trades(client, "BTCAUD", start_id=0, stop_id=1000,
+                             limit=100)
+
+    assert [trade["id"] for trade in trades] == list(range(1000))
+    assert sorted(calls[10:]) == list(range(90, 1000, 100))
+
+
+def test_backfill_failures(client):
+
+    historical_trades = client.historical_trades
+    failed = set()
+
+    def flaky_historical_trades(symbol, limit=None, from_id=None):
+        if from_id % 200 == 0 and from_id not in failed:
+            failed.add(from_id)
+            raise ConnectionError("reset")
+        return historical_trades(symbol, limit=limit, from_id=from_id)
+
+    client.historical_trades = flaky_historical_trades
+    trades = backfill_trades(client, "BTCAUD", start_id=0, stop_id=1000,
+                             limit=100, max_workers=4)
+
+    assert [trade["id"] for trade in trades] == list(range(1000))
+    assert failed == set(range(0, 1000, 200))
+
+
+def test_backfill_resume(client, tmp_path):
+
+    historical_trades = client.historical_trades
+    calls = []
+
+    def failing_historical_trades(symbol, limit=None, from_id=None):
+        calls.append(from_id)
+        if from_id >= 500:
+            raise ConnectionError("crash")
+        return historical_trades(symbol, limit=limit, from_id=from_id)
+
+    client.historical_trades = failing_historical_trades
+    with pytest.raises(RuntimeError) as excinfo:
+        backfill_trades(client, "BTCAUD", start_id=0, stop_id=1000,
+                        limit=100, max_workers=1, max_rounds=3,
+                        checkpoint_dir=tmp_path)
+
+    assert isinstance(excinfo.value.__cause__, ConnectionError)
+    # failed windows are retried every round
+    assert sorted(calls) == list(range(0, 500, 100)) + \
+        sorted(list(range(500, 1000, 100)) * 3)
+
+    calls.clear()
+    client.historical_trades = lambda *args, **kwargs: \
+        calls.append(kwargs["from_id"]) or historical_trades(*args, **kwargs)
+
+    trades = backfill_trades(client, "BTCAUD", start_id=0, stop_id=1000,
+                             limit=100, checkpoint_dir=tmp_path)
+
+    assert [trade["id"] for trade in trades] == list(range(1000))
+    assert sorted(calls) == list(range(500, 1000, 100))
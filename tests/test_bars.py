@@ -0,0 +1,79 @@
+"""Tests for `pynance.bars` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.bars import BarAggregator, build_bars
+from pynance.decoding import create_trades_frame
+from pynance.testing import make_trade
+
+
+@pytest.fixture
+def trades():
+
+    # irregular spacing, with gaps spanning several bars
+    rng = np.random.default_rng(8888)
+    ids = np.cumsum(rng.geometric(1e-3, size=5000))
+
+    return create_trades_frame([make_trade(i) for i in ids])
+
+
+def resample(trades, interval):
+
+    resampler = trades.set_index("time").resample(interval, origin="epoch")
+
+    bars = resampler.price.ohlc()
+    bars["volume"] = resampler.qty.sum()
+    bars["vwap"] = (trades.price * trades.qty).groupby(
+        trades.set_index("time").index.floor(interval)).sum() / bars.volume
+    bars["count"] = resampler.size()
+
+    return bars
+
+
+@pytest.mark.parametrize("batch_size", [3, 1000, 10000])
+def test_build_bars(trades, batch_size):
+
+    intervals = ["1min", "15min", "1h"]
+    batches = (trades.iloc[i:i + batch_size]
+               for i in range(0, len(trades), batch_size))
+
+    results = build_bars(batches, intervals)
+
+    for interval in intervals:
+
+        bars = results[interval]
+        expected = resample(trades, interval)
+
+        pd.testing.assert_index_equal(bars.index, expected.index,
+                                      check_names=False)
+        for key in ("open", "high", "low", "close", "count"):
+            np.testing.assert_array_equal(bars[key], expected[key])
+        # summed in a different order
+        for key in ("volume", "vwap"):
+            np.testing.assert_allclose(bars[key], expected[key], rtol=1e-12)
+
+
+def test_emit(trades):
+
+    aggregator = BarAggregator("1min")
+    times = pd.to_datetime([0, 30000, 60000, 200000], unit="ms")
+
+    bars = aggregator.update(times[:2], [1., 2.], [1., 1.])
+    assert len(bars) == 0  # the first bar is still open
+
+    bars = aggregator.update(times[2:3], [3.], [1.])
+    assert bars.close.tolist() == [2.]
+    assert bars.vwap.tolist() == [1.5]
+
+    # the empty bar in between is emitted too
+    bars = aggregator.update(times[3:], [4.], [3.])
+    assert bars["count"].tolist() == [1, 0]
+    assert np.isnan(bars.open.iloc[1])
+
+    bars = aggregator.flush()
+    assert bars.index.tolist() == [pd.Timestamp(180000, unit="ms")]
+
+    with pytest.raises(ValueError):
+        aggregator.update(times[::-1], [1.] * 4, [1.] * 4)
@@ -0,0 +1,169 @@
+"""Tests for `pynance.cache` module."""
+
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pynance.backfill import backfill_trades
+from pynance.cache import MemoryCache
+from pynance.client import Client
+from pynance.testing import StubServer
+from pynance.utils import create_session
+
+
+@pytest.fixture
+def server():
+    num_my_trades = {"BTCAUD": 1500}
+    with StubServer(num_trades=10000, num_my_trades=num_my_trades) as server:
+        yield server
+
+
+@pytest.fixture(params=["memory", "sqlite", "filesystem"])
+def session(request, tmp_path):
+    return create_session(location=str(tmp_path.joinpath("cache")),
+                          backend=request.param)
+
+
+def test_ttls(server, session):
+
+    with Client(api_key="foo", secret_key="bar", base_url=server.base_url,
+                session=session) as client:
+
+        # complete pages by id never change
+        trades = client.historical_trades("BTCAUD", limit=100, from_id=0)
+        assert client.historical_trades("BTCAUD", limit=100,
+                                        from_id=0) == trades
+        assert server.num_requests == 1
+
+        # the latest trades and partial pages do
+        client.historical_trades("BTCAUD", limit=100)
+        client.historical_trades("BTCAUD", limit=100)
+        client.historical_trades("BTCAUD", limit=100, from_id=9950)
+        client.historical_trades("BTCAUD", limit=100, from_id=9950)
+        assert server.num_requests == 5
+
+        # volatile endpoints are not cached
+        client.depth("BTCAUD")
+        client.depth("BTCAUD")
+        client.avg_price("BTCAUD")
+        client.avg_price("BTCAUD")
+        assert server.num_requests == 9
+
+        # signed requests are keyed without their timestamp and signature
+        client.my_trades("BTCAUD", limit=1000, from_id=0)
+        client.my_trades("BTCAUD", limit=1000, from_id=0)
+        assert server.num_requests == 10
+
+
+def test_accounts(server, session):
+
+    for api_key in ["alice", "bob", "alice"]:
+        with Client(api_key=api_key, secret_key="bar",
+                    base_url=server.base_url, session=session) as client:
+            client.my_trades("BTCAUD", limit=1000, from_id=0)
+            # public data is shared between accounts
+            client.historical_trades("BTCAUD", limit=100, from_id=0)
+
+    # each account's own trades are cached separately
+    assert server.num_requests == 3
+
+
+def test_rerun(server, session):
+
+    def backfill():
+        with Client(base_url=server.base_url, session=session) as client:
+            return backfill_trades(client, "BTCAUD", start_id=0,
+                                   stop_id=5000, limit=1000, max_workers=1)
+
+    trades_list = backfill()
+    num_requests = server.num_requests
+
+    assert backfill() == trades_list
+    assert server.num_requests == num_requests  # all served from cache
+
+
+def test_memory_cache(server):
+
+    memory_cache = MemoryCache()
+
+    with Client(base_url=server.base_url,
+                memory_cache=memory_cache) as client:
+
+        for _ in range(100):
+            info = client.exchange_info()
+            client.depth("BTCAUD")
+
+    assert info["symbols"][0]["symbol"] == "BTCAUD"
+    assert server.num_requests == 101  # depth is never cached
+    assert (memory_cache.hits, memory_cache.misses) == (99, 101)
+    assert len(memory_cache.hit_latency) == 99
+    # hits never leave the process
+    assert memory_cache.hit_latency.mean() < memory_cache.miss_latency.mean()
+
+
+def test_memory_cache_accounts(server):
+
+    memory_cache = MemoryCache()
+
+    for api_key in ["alice", "bob", "alice"]:
+        with Client(api_key=api_key, secret_key="bar",
+                    base_url=server.base_url,
+                    memory_cache=memory_cache) as client:
+            client.my_trades("BTCAUD", limit=1000, from_id=0)
+            client.historical_trades("BTCAUD", limit=100, from_id=0)
+
+    assert server.num_requests == 3
+    assert (memory_cache.hits, memory_cache.misses) == (3, 3)
+
+
+def test_memory_cache_threads(server):
+
+    memory_cache = MemoryCache()
+
+    with Client(base_url=server.base_url,
+                memory_cache=memory_cache) as client:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: client.historical_trades(
+                "BTCAUD", limit=10, from_id=10 * (i % 20)), range(2000)))
+
+    # every lookup is counted once
+    assert memory_cache.hits + memory_cache.misses == 2000
+    assert len(memory_cache.hit_latency) == memory_cache.hits
+    assert len(memory_cache.miss_latency) == memory_cache.misses
+
+
+def test_memory_cache_eviction(server):
+
+    now = [0.]
+    memory_cache = MemoryCache(max_bytes=20000, decoded=True,
+                               clock=lambda: now[0])
+
+    with Client(base_url=server.base_url,
+                memory_cache=memory_cache) as client:
+
+        def fetch(from_id):
+            # about 7.5kB each
+            return client.historical_trades("BTCAUD", limit=50,
+                                            from_id=from_id)
+
+        trades = fetch(0)
+        fetch(50)
+        assert fetch(0) is trades  # decoded responses are shared
+        fetch(100)  # evicts the least recently used, i.e. from id 50
+
+        assert len(memory_cache) == 2
+        assert memory_cache.num_bytes <= memory_cache.max_bytes
+
+        num_requests = server.num_requests
+        fetch(0)
+        assert server.num_requests == num_requests
+        fetch(50)
+        assert server.num_requests == num_requests + 1
+
+        # ticker prices expire after a second
+        client.ticker_price("BTCAUD")
+        client.ticker_price("BTCAUD")
+        assert server.num_requests == num_requests + 2
+        now[0] += 1.5
+        client.ticker_price("BTCAUD")
+        assert server.num_requests == num_requests + 3
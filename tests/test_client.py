@@ -0,0 +1,56 @@
+"""Tests for `pynance.client` module."""
+
+import pandas as pd
+import pytest
+
+from pynance.cache import MemoryCache
+from pynance.client import Client
+from pynance.decoding import create_trades_frame
+from pynance.testing import StubServer
+
+
+@pytest.fixture
+def server():
+    with StubServer(num_trades=1000) as server:
+        yield server
+
+
+def test_endpoints(server):
+
+    with Client(base_url=server.base_url) as client:
+
+        trades = client.historical_trades("BTCAUD", limit=10, from_id=100)
+        assert [trade["id"] for trade in trades] == list(range(100, 110))
+
+        trades = client.trades("BTCAUD", limit=5)
+        assert trades[-1]["id"] == server.num_trades - 1
+
+        assert client.book_ticker("BTCAUD")["symbol"] == "BTCAUD"
+        assert "price" in client.avg_price("BTCAUD")
+
+
+@pytest.mark.parametrize("memory_cache", [None, MemoryCache(decoded=True)])
+def test_raw(server, memory_cache):
+
+    with Client(base_url=server.base_url,
+                memory_cache=memory_cache) as client:
+
+        trades = client.historical_trades("BTCAUD", limit=10, from_id=100)
+        body = client.historical_trades("BTCAUD", limit=10, from_id=100,
+                                        raw=True)
+
+        assert isinstance(body, bytes)
+        pd.testing.assert_frame_equal(create_trades_frame(body),
+                                      create_trades_frame(trades))
+        assert client.get_content("/api/v3/historicalTrades", params=dict(
+            symbol="BTCAUD", limit=10, fromId=100)) == body
+
+
+def test_connection_reuse(server):
+
+    with Client(base_url=server.base_url, pool_maxsize=1) as client:
+        for _ in range(10):
+            client.server_time()
+
+    # a single connection was opened and kept alive for all requests
+    assert len(server.connections) == 1
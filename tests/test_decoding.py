@@ -0,0 +1,104 @@
+"""Tests for `pynance.decoding` module."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.decoding import (MY_TRADE_FIELDS, create_agg_trades_frame,
+                              create_trades_frame, decode_trades)
+from pynance.testing import make_agg_trade, make_trade
+
+
+@pytest.fixture
+def trades_list():
+    return [make_trade(i) for i in range(1000)]
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])
+def test_decode_bytes(trades_list, separators):
+
+    body = json.dumps(trades_list, separators=separators).encode("utf-8")
+
+    columns = decode_trades(body)
+    expected = decode_trades(trades_list)
+
+    assert list(columns) == list(expected)
+    for key in expected:
+        assert columns[key].dtype == expected[key].dtype
+        np.testing.assert_array_equal(columns[key], expected[key])
+
+
+def test_create_trades_frame(trades_list):
+
+    frame = create_trades_frame(trades_list)
+
+    assert frame.id.dtype == np.int64
+    assert frame.time.dtype == np.dtype("datetime64[ms]")
+    assert frame.isBuyerMaker.dtype == np.bool_
+
+    expected = pd.DataFrame(trades_list)
+    np.testing.assert_array_equal(frame.price, pd.to_numeric(expected.price))
+    np.testing.assert_array_equal(frame.time,
+                                  pd.to_datetime(expected.time, unit="ms"))
+
+
+def test_decode_my_trades():
+
+    my_trades = [{"symbol": "BNBBTC", "id": 28457, "orderId": 100234,
+                  "orderListId": -1, "price": "4.00000100",
+                  "qty": "12.00000000", "quoteQty": "48.000012",
+                  "commission": "10.10000000", "commissionAsset": "BNB",
+                  "time": 1499865549590, "isBuyer": True, "isMaker": False,
+                  "isBestMatch": True}]
+
+    frame = create_trades_frame(json.dumps(my_trades))
+
+    assert frame.symbol.tolist() == ["BNBBTC"]
+    assert frame.orderListId.tolist() == [-1]
+    assert frame.commission.tolist() == [10.1]
+    assert frame.isMaker.tolist() == [False]
+
+    # whitespace is only dropped between tokens
+    my_trades[0]["commissionAsset"] = "B N B"
+    frame = create_trades_frame(json.dumps(my_trades, indent=2))
+
+    assert frame.commissionAsset.tolist() == ["B N B"]
+    assert frame.commission.tolist() == [10.1]
+
+
+def test_decode_empty(trades_list):
+
+    frame = create_trades_frame(b"[]")
+    assert len(frame) == 0
+    pd.testing.assert_series_equal(
+        frame.dtypes, create_trades_frame(trades_list[:1]).dtypes)
+    pd.testing.assert_frame_equal(create_trades_frame([]), frame)
+
+    frame = create_trades_frame(b"[]", fields=MY_TRADE_FIELDS)
+    assert list(frame.columns) == MY_TRADE_FIELDS
+
+    frame = create_agg_trades_frame(b"[]")
+    assert list(frame.columns) == ["id", "price", "qty", "firstId", "lastId",
+                                   "time", "isBuyerMaker", "isBestMatch"]
+
+
+def test_create_agg_trades_frame():
+
+    agg_trades = [make_agg_trade(i) for i in range(100)]
+    body = json.dumps(agg_trades).encode("utf-8")
+
+    frame = create_agg_trades_frame(body)
+    expected = create_trades_frame([make_trade(i) for i in range(100)])
+
+    assert list(frame.columns) == ["id", "price", "qty", "firstId", "lastId",
+                                   "time", "isBuyerMaker", "isBestMatch"]
+    expected = expected.drop(columns="quoteQty")
+    pd.testing.assert_frame_equal(frame[expected.columns], expected)
+    pd.testing.assert_frame_equal(create_agg_trades_frame(agg_trades), frame)
+
+    decimals = {"price": 2, "qty": 3}
+    fixed = create_agg_trades_frame(body, decimals=decimals)
+    assert fixed.price.dtype == np.int64
+    assert fixed.qty.iloc[12] == 13
@@ -0,0 +1,80 @@
+"""Tests for `pynance.depth` module."""
+
+import numpy as np
+import pytest
+
+from pynance.depth import (book_arrays, cumulative_depth, impact, imbalance,
+                           microprice, mid_price, spread, vwap)
+from pynance.testing import make_depth
+
+
+@pytest.fixture
+def arrays():
+
+    snapshots = [make_depth(last_update_id=1, num_levels=5, mid=100.),
+                 make_depth(last_update_id=2, num_levels=3, mid=200.)]
+
+    return book_arrays(snapshots)
+
+
+def test_book_arrays(arrays):
+
+    bid_prices, bid_qtys, ask_prices, ask_qtys = arrays
+
+    assert bid_prices.shape == (2, 5)
+    np.testing.assert_allclose(bid_prices[0], [99.99, 99.98, 99.97, 99.96,
+                                               99.95])
+    np.testing.assert_allclose(ask_qtys[1], [1., 2., 3., 0., 0.])
+    assert np.isnan(ask_prices[1, 3:]).all()
+
+
+def test_top_of_book(arrays):
+
+    bid_prices, bid_qtys, ask_prices, ask_qtys = arrays
+
+    np.testing.assert_allclose(mid_price(bid_prices, ask_prices), [100., 200.])
+    np.testing.assert_allclose(spread(bid_prices, ask_prices), [0.02, 0.02])
+
+    # equal quantities at the top
+    np.testing.assert_allclose(
+        microprice(bid_prices, bid_qtys, ask_prices, ask_qtys), [100., 200.])
+    np.testing.assert_allclose(
+        microprice(bid_prices, bid_qtys * [[3.], [1.]], ask_prices, ask_qtys),
+        [100.005, 200.])
+
+    np.testing.assert_allclose(imbalance(bid_qtys, ask_qtys), [0., 0.])
+    # both sides hold 1, 2, 3, ... at successive levels
+    np.testing.assert_allclose(imbalance(bid_qtys, ask_qtys, n=4),
+                               [0., 0.])
+    np.testing.assert_allclose(imbalance(bid_qtys[:, ::-1], ask_qtys, n=1),
+                               [(5. - 1.) / 6., -1.])
+
+
+def test_cumulative_depth(arrays):
+
+    bid_prices, bid_qtys, ask_prices, ask_qtys = arrays
+
+    np.testing.assert_allclose(cumulative_depth(ask_qtys),
+                               [[1., 3., 6., 10., 15.], [1., 3., 6., 6., 6.]])
+
+
+def test_vwap(arrays):
+
+    bid_prices, bid_qtys, ask_prices, ask_qtys = arrays
+
+    # 1 @ 100.01 and 1.5 @ 100.02
+    expected = (100.01 + 1.5 * 100.02) / 2.5
+    np.testing.assert_allclose(vwap(ask_prices, ask_qtys, 2.5)[0], expected)
+
+    # more than the second book holds
+    result = vwap(ask_prices, ask_qtys, 10.)
+    np.testing.assert_allclose(result[0], np.dot(ask_prices[0, :4],
+                                                 ask_qtys[0, :4]) / 10.)
+    assert np.isnan(result[1])
+
+    # one size per snapshot
+    np.testing.assert_allclose(vwap(bid_prices, bid_qtys, [1., 1.]),
+                               bid_prices[:, 0])
+
+    assert (impact(ask_prices, ask_qtys, 5.)[0] > 0.)
+    assert (impact(bid_prices, bid_qtys, 5.)[0] < 0.)
@@ -0,0 +1,118 @@
+"""Tests for `pynance.downsample` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance import downsample
+from pynance.downsample import bin2d, decimate, lttb, minmax
+
+
+@pytest.fixture
+def series():
+
+    rng = np.random.default_rng(42)
+    num_points = 100000
+
+    time = pd.Timestamp("2021-01-01") + pd.to_timedelta(
+        np.cumsum(rng.integers(1, 1000, size=num_points)), unit="ms")
+    price = 100. + np.cumsum(rng.normal(size=num_points))
+
+    return pd.DataFrame(dict(time=time, price=price))
+
+
+def test_minmax(series):
+
+    indices = minmax(series.time, series.price, 200)
+
+    assert len(indices) <= 4 * 200
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == len(series) - 1
+
+    # the same extremes in every bin
+    bins = pd.cut(series.time, 200, labels=False)
+    full = series.price.groupby(bins).agg(["min", "max"])
+    kept = series.price.iloc[indices].groupby(bins.iloc[indices]) \
+        .agg(["min", "max"])
+    pd.testing.assert_frame_equal(kept, full)
+
+    np.testing.assert_array_equal(minmax([0, 1, 2], [3, 1, 2], 200),
+                                  np.arange(3))
+
+
+def reference_lttb(x, y, num_points):
+
+    buckets = np.array_split(np.arange(1, len(x) - 1), num_points - 2)
+    buckets.append([len(x) - 1])
+
+    indices = [0]
+    for bucket, following in zip(buckets[:-1], buckets[1:]):
+        a = indices[-1]
+        xc, yc = np.mean(x[following]), np.mean(y[following])
+        areas = [abs((x[a] - xc) * (y[i] - y[a]) - (x[a] - x[i]) * (yc - y[a]))
+                 for i in bucket]
+        indices.append(bucket[np.argmax(areas)])
+
+    return indices + [len(x) - 1]
+
+
+def test_lttb(series):
+
+    indices = lttb(series.time, series.price, 500)
+
+    assert len(indices) == 500
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == len(series) - 1
+
+    x = (series.time - series.time[0]).dt.total_seconds().to_numpy()
+    y = series.price.to_numpy()
+    np.testing.assert_array_equal(lttb(x[:5000], y[:5000], 100),
+                                  reference_lttb(x[:5000], y[:5000], 100))
+
+    # most of the range is kept
+    kept = series.price.iloc[indices]
+    assert kept.max() - kept.min() > \
+        0.95 * (series.price.max() - series.price.min())
+
+    # curves need not be monotonic in x
+    angle = np.linspace(0, 4 * np.pi, 10000)
+    indices = lttb(np.cos(angle), np.sin(angle), 100)
+    assert len(indices) == 100
+    assert np.abs(np.sin(angle[indices])).max() > 0.99
+
+    np.testing.assert_array_equal(lttb([0, 1, 2], [3, 1, 2], 200),
+                                  np.arange(3))
+
+
+def test_decimate(series):
+
+    np.testing.assert_array_equal(
+        decimate(series.time, series.price, 300, method="lttb"),
+        lttb(series.time, series.price, 300))
+
+    with pytest.raises(ValueError):
+        decimate(series.time, series.price, 300, method="mean")
+
+
+def test_bin2d(monkeypatch, series):
+
+    monkeypatch.setattr(downsample, "CHUNK_SIZE", 30000)
+
+    rng = np.random.default_rng(0)
+    weights = rng.uniform(size=len(series))
+
+    counts, xedges, yedges = bin2d(series.time, series.price, (40, 30),
+                                   weights=weights)
+
+    assert counts.shape == (30, 40)
+    assert xedges.dtype == series.time.dtype
+    assert xedges[0] == series.time.min() and \
+        xedges[-1] == series.time.max()
+
+    expected, *_ = np.histogram2d(series.time.to_numpy().view(np.int64),
+                                  series.price, bins=(40, 30),
+                                  weights=weights)
+    np.testing.assert_allclose(counts, expected.T)
+
+    counts, *_ = bin2d(np.zeros(5), np.arange(5), (4, 4))
+    assert counts.sum() == 5
@@ -0,0 +1,62 @@
+"""Tests for `pynance.figures` module."""
+
+import numpy as np
+import pandas as pd
+
+from pynance.figures import Figure, FigureRenderer, Style
+
+
+def plot_line(frame, ax, color="C0"):
+    ax.plot(frame.x, frame.y, color=color)
+
+
+def plot_hist(values, bins, ax):
+    ax.hist(values, bins=bins)
+
+
+def make_figures(offset=0.):
+
+    x = np.linspace(0., 1., 50)
+    frame = pd.DataFrame(dict(x=x, y=x**2 + offset))
+
+    return [Figure("line", plot_line, frame, color="C1"),
+            Figure("hist", plot_hist, np.arange(100.), 10)]
+
+
+def test_key():
+
+    style = Style()
+    line, hist = make_figures()
+
+    assert line.key(style) == make_figures()[0].key(style)
+    assert line.key(style) != make_figures(offset=1.)[0].key(style)
+    assert line.key(style) != line.key(Style(dpi=100))
+
+    recolored = Figure("line", plot_line, *line.args, color="C2")
+    assert line.key(style) != recolored.key(style)
+
+
+def test_render(tmp_path):
+
+    style = Style(dpi=50, extensions=["png", "pdf"])
+    renderer = FigureRenderer(tmp_path, style=style, max_workers=2)
+
+    assert renderer.render(make_figures()) == ["line", "hist"]
+    for name in ["line", "hist"]:
+        for extension in ["png", "pdf"]:
+            assert tmp_path.joinpath(f"{name}_{style.suffix}.{extension}") \
+                .exists()
+
+    # nothing changed
+    assert renderer.render(make_figures()) == []
+
+    # only the figure whose data changed
+    assert renderer.render(make_figures(offset=1.)) == ["line"]
+
+    # missing files are rendered again
+    renderer.paths(make_figures()[1])[0].unlink()
+    assert renderer.render(make_figures(offset=1.)) == ["hist"]
+
+    # every figure in a new style
+    renderer = FigureRenderer(tmp_path, style=Style(dpi=60), max_workers=2)
+    assert renderer.render(make_figures(offset=1.)) == ["line", "hist"]
@@ -0,0 +1,72 @@
+"""Tests for `pynance.fixedpoint` module."""
+
+import numpy as np
+import pytest
+
+from pynance.client import Client
+from pynance.decoding import decode_trades
+from pynance.fixedpoint import (add, decimals_from_step, divide, multiply,
+                                rescale, symbol_decimals, to_fixed, to_float)
+from pynance.testing import StubServer, make_trade
+
+
+def test_decimals_from_step():
+    assert decimals_from_step("0.01000000") == 2
+    assert decimals_from_step("1.00000000") == 0
+    assert decimals_from_step("0.00000100") == 6
+
+
+def test_symbol_decimals():
+
+    with StubServer() as server:
+        with Client(base_url=server.base_url) as client:
+            decimals = symbol_decimals(client.exchange_info(), "BTCAUD")
+
+    assert decimals == {"price": 2, "qty": 3, "quoteQty": 5}
+
+
+def test_exact_cumsum():
+
+    qty = np.full(100000, 0.1)
+
+    assert np.cumsum(qty)[-1] != 10000.  # floats drift
+    assert to_float(np.cumsum(to_fixed(qty, 8)), 8)[-1] == 10000.
+
+
+def test_arithmetic():
+
+    a = to_fixed([1.25, 2.5], 2)
+    b = to_fixed([0.001, 3.0], 3)
+
+    total, decimals = add(a, 2, b, 3)
+    np.testing.assert_array_equal(total, [1251, 5500])
+    assert decimals == 3
+
+    np.testing.assert_array_equal(multiply(a, 2, b, 3), [125, 750000])
+    np.testing.assert_array_equal(multiply(a, 2, b, 3, decimals=2), [0, 750])
+
+    # half to even
+    np.testing.assert_array_equal(rescale([125, 135, -125], 2, 1),
+                                  [12, 14, -12])
+    np.testing.assert_array_equal(divide([7, -7, 15], 0, [2, 2, 10], 0, 0),
+                                  [4, -4, 2])
+    np.testing.assert_array_equal(divide([1], 0, [3], 0, 4), [3333])
+
+
+def test_overflow():
+    with pytest.raises(OverflowError):
+        multiply([2**40], 8, [2**40], 8)
+
+
+def test_decode_fixed():
+
+    trades_list = [make_trade(i) for i in range(100)]
+    decimals = {"price": 2, "qty": 3, "quoteQty": 5}
+
+    columns = decode_trades(trades_list, decimals=decimals)
+
+    assert columns["price"].dtype == np.int64
+    expected = [round(float(trade["price"]) * 100) for trade in trades_list]
+    np.testing.assert_array_equal(columns["price"], expected)
+    np.testing.assert_array_equal(
+        multiply(columns["price"], 2, columns["qty"], 3), columns["quoteQty"])
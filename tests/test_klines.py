@@ -0,0 +1,130 @@
+"""Tests for `pynance.klines` module."""
+
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.aio import AsyncClient
+from pynance.client import Client
+from pynance.decoding import create_klines_frame
+from pynance.klines import (KlineStore, fetch_klines, split_time_range,
+                            sync_klines)
+from pynance.testing import T0, StubServer, make_kline
+from pynance.utils import create_session
+
+MINUTE = 60000
+DAY = 1440 * MINUTE
+
+
+def test_split_time_range():
+
+    windows = split_time_range(10, 2500 * MINUTE + 1, "1m", limit=1000)
+    assert windows == [(MINUTE, 1001 * MINUTE - 1),
+                       (1001 * MINUTE, 2001 * MINUTE - 1),
+                       (2001 * MINUTE, 2500 * MINUTE)]
+
+    assert split_time_range(0, 0, "1h") == []
+
+    with pytest.raises(ValueError):
+        split_time_range(0, 1, "1M")
+
+
+def test_create_klines_frame():
+
+    klines = [make_kline(open_time, MINUTE)
+              for open_time in range(0, 100 * MINUTE, MINUTE)]
+
+    frame = create_klines_frame(json.dumps(klines).encode("utf-8"))
+    pd.testing.assert_frame_equal(create_klines_frame(klines), frame)
+
+    assert frame.openTime.dtype == np.dtype("datetime64[ms]")
+    assert frame["count"].dtype == np.int64
+    assert (frame.closeTime - frame.openTime == pd.Timedelta("59.999s")).all()
+    assert (frame.high >= frame[["open", "close"]].max(axis="columns")).all()
+    np.testing.assert_array_equal(frame.open.iloc[1:], frame.close.iloc[:-1])
+
+    assert create_klines_frame([]).shape == (0, 11)
+
+
+def test_fetch_klines():
+
+    start_time = T0 - 5 * DAY  # before the symbol is listed
+    end_time = T0 + 3 * DAY + 1
+
+    async def fetch(base_url):
+        async with AsyncClient(base_url=base_url) as client:
+            return await fetch_klines(client, "BTCAUD", "1m", start_time,
+                                      end_time)
+
+    with StubServer() as server:
+        frame = asyncio.run(fetch(server.base_url))
+        # windows of 1000 minutes fetched at once
+        assert server.num_requests == 12
+
+    first = -(-T0 // MINUTE) * MINUTE
+    expected = np.arange(first, end_time, MINUTE).astype("datetime64[ms]")
+    np.testing.assert_array_equal(frame.openTime, expected)
+
+
+def test_fetch_closed():
+
+    async def fetch(base_url):
+        async with AsyncClient(base_url=base_url) as client:
+            return await fetch_klines(client, "BTCAUD", "1d", T0)
+
+    with StubServer() as server:
+        frame = asyncio.run(fetch(server.base_url))
+
+    now = pd.Timestamp(time.time(), unit="s")
+    assert now - pd.Timedelta("1D") < frame.closeTime.iloc[-1] < now
+
+
+def test_sync(tmp_path):
+
+    store = KlineStore(tmp_path, interval="1h")
+    symbols = ["BTCAUD", "ETHAUD"]
+    start_time = T0 + 40 * DAY
+
+    with StubServer() as server:
+
+        counts = sync_klines(store, symbols, start_time=start_time,
+                             end_time=start_time + 60 * DAY,
+                             base_url=server.base_url)
+        assert counts == {"BTCAUD": 1440, "ETHAUD": 1440}
+
+        server.num_requests = 0
+        counts = sync_klines(store, symbols, start_time=start_time,
+                             end_time=start_time + 61 * DAY,
+                             base_url=server.base_url)
+        # only klines after the last stored are asked for
+        assert counts == {"BTCAUD": 24, "ETHAUD": 24}
+        assert server.num_requests == 2
+
+    frame = store.read("BTCAUD")
+    assert len(frame) == 1464
+    assert frame.openTime.is_monotonic_increasing
+    assert frame.openTime.diff().iloc[1:].eq(pd.Timedelta("1h")).all()
+
+    assert store.high_water("BTCAUD") == frame.openTime.iloc[-1]
+    assert store.symbol_path("BTCAUD") == tmp_path.joinpath("klines", "1h",
+                                                            "BTCAUD")
+
+
+def test_cache(tmp_path):
+
+    session = create_session(location=str(tmp_path.joinpath("cache")))
+
+    with StubServer() as server:
+        with Client(base_url=server.base_url, session=session) as client:
+
+            for _ in range(2):
+                # closed klines never change
+                client.klines("BTCAUD", "1h", start_time=T0, limit=1000)
+                # the latest kline is still open
+                client.klines("BTCAUD", "1h", limit=10)
+
+        assert server.num_requests == 3
@@ -0,0 +1,38 @@
+"""Tests for `pynance.ledger` module."""
+
+from pynance.ledger import Ledger, sync_ledger
+from pynance.testing import StubServer
+
+
+def sync(ledger, base_url, symbols):
+    return sync_ledger(ledger, symbols, api_key="foo", secret_key="bar",
+                       base_url=base_url)
+
+
+def test_sync(tmp_path):
+
+    ledger = Ledger(tmp_path)
+    symbols = ["BTCAUD", "ETHAUD", "XRPAUD"]
+
+    with StubServer(num_my_trades={"BTCAUD": 2500, "ETHAUD": 10}) as server:
+
+        counts = sync(ledger, server.base_url, symbols)
+        assert counts == {"BTCAUD": 2500, "ETHAUD": 10, "XRPAUD": 0}
+        # 3 pages, 1 page and 1 page
+        assert server.num_requests == 5
+
+        server.num_my_trades["BTCAUD"] = 2600
+        server.num_requests = 0
+
+        counts = sync(ledger, server.base_url, symbols)
+        assert counts == {"BTCAUD": 100, "ETHAUD": 0, "XRPAUD": 0}
+        # only trades after the last stored id are asked for
+        assert server.num_requests == 3
+
+    frame = ledger.read("BTCAUD")
+    assert frame.id.tolist() == list(range(2600))
+    assert frame.symbol.unique().tolist() == ["BTCAUD"]
+    assert frame.isBuyer.sum() == 1734  # ids not congruent to 2 mod 3
+
+    assert ledger.read("ETHAUD").id.tolist() == list(range(10))
+    assert len(ledger.read("XRPAUD")) == 0
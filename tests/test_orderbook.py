@@ -0,0 +1,138 @@
+"""Tests for `pynance.orderbook` module."""
+
+import numpy as np
+import pytest
+
+from pynance.orderbook import OrderBook
+from pynance.testing import make_depth, make_depth_updates
+
+
+@pytest.fixture
+def snapshot():
+    return make_depth(last_update_id=100, num_levels=100)
+
+
+def reference_book(snapshot, events):
+
+    bids = {float(p): float(q) for p, q in snapshot["bids"]}
+    asks = {float(p): float(q) for p, q in snapshot["asks"]}
+
+    for event in events:
+        for side, levels in ((bids, event["b"]), (asks, event["a"])):
+            for price, qty in levels:
+                side[float(price)] = float(qty)
+
+    bids = sorted(((p, q) for p, q in bids.items() if q), reverse=True)
+    asks = sorted((p, q) for p, q in asks.items() if q)
+
+    return np.array(bids), np.array(asks)
+
+
+def test_load_snapshot(snapshot):
+
+    book = OrderBook()
+    assert book.load_snapshot(snapshot)
+
+    assert book.best_bid() == (99.99, 1.)
+    assert book.best_ask() == (100.01, 1.)
+    assert book.spread() == pytest.approx(0.02)
+    assert book.mid_price() == pytest.approx(100.)
+    assert book.bids.top(3)[:, 0].tolist() == [99.99, 99.98, 99.97]
+
+
+def test_update(snapshot):
+
+    events = make_depth_updates(snapshot, num_events=500, seed=8888)
+
+    book = OrderBook()
+    book.load_snapshot(snapshot)
+
+    assert all(book.update(event) for event in events)
+    assert book.last_update_id == events[-1]["u"]
+
+    bids, asks = reference_book(snapshot, events)
+    np.testing.assert_array_equal(book.bids.top(), bids)
+    np.testing.assert_array_equal(book.asks.top(), asks)
+
+
+def test_buffer_before_snapshot(snapshot):
+
+    events = make_depth_updates(snapshot, num_events=50, seed=8888)
+
+    book = OrderBook()
+    for event in events[:20]:
+        assert not book.update(event)
+
+    # snapshot taken after the first 10 events were buffered
+    newer = make_depth(last_update_id=events[9]["u"], num_levels=100)
+    assert book.load_snapshot(newer)
+    assert book.last_update_id == events[19]["u"]
+
+    for event in events[:20]:
+        assert not book.update(event)  # stale
+    for event in events[20:]:
+        assert book.update(event)
+
+    bids, asks = reference_book(newer, events[10:])
+    np.testing.assert_array_equal(book.bids.top(), bids)
+    np.testing.assert_array_equal(book.asks.top(), asks)
+
+
+def test_gap(snapshot):
+
+    events = make_depth_updates(snapshot, num_events=50, seed=8888)
+
+    book = OrderBook()
+    book.load_snapshot(snapshot)
+
+    for event in events[:10]:
+        book.update(event)
+
+    assert not book.update(events[20])  # events 10 to 19 missed
+    assert not book.synced
+
+    for event in events[21:]:
+        book.update(event)
+    assert len(book.buffer) == 30
+
+    # a snapshot older than the buffered events does not resync
+    assert not book.load_snapshot(make_depth(events[9]["u"]))
+
+    resync = make_depth(last_update_id=events[24]["u"], num_levels=100)
+    assert book.load_snapshot(resync)
+    assert book.last_update_id == events[-1]["u"]
+
+    bids, asks = reference_book(resync, events[25:])
+    np.testing.assert_array_equal(book.bids.top(), bids)
+    np.testing.assert_array_equal(book.asks.top(), asks)
+
+
+def test_resync(snapshot):
+
+    events = make_depth_updates(snapshot, num_events=50, seed=8888)
+
+    # the first snapshot is older than the first event, the second is not
+    snapshots = [make_depth(last_update_id=events[0]["U"] - 2),
+                 make_depth(last_update_id=events[4]["u"], num_levels=100)]
+    book = OrderBook(fetch_snapshot=lambda: snapshots.pop(0))
+
+    assert not book.update(events[0])
+    assert book.update(events[5])
+    assert book.last_update_id == events[5]["u"]
+
+    for event in events[6:20]:
+        assert book.update(event)
+
+    # events 20 to 29 missed
+    resync = make_depth(last_update_id=events[29]["u"], num_levels=100)
+    snapshots.append(resync)
+
+    for event in events[30:]:
+        assert book.update(event)
+
+    assert not snapshots
+    assert book.last_update_id == events[-1]["u"]
+
+    bids, asks = reference_book(resync, events[30:])
+    np.testing.assert_array_equal(book.bids.top(), bids)
+    np.testing.assert_array_equal(book.asks.top(), asks)
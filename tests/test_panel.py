@@ -0,0 +1,112 @@
+"""Tests for `pynance.panel` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.klines import KlineStore, sync_klines
+from pynance.panel import build_panel, ffill, kline_panel
+from pynance.testing import T0, StubServer
+
+
+@pytest.fixture
+def sources():
+
+    rng = np.random.default_rng(8888)
+    sources = {}
+
+    for symbol, num_prices in [("BTCAUD", 5000), ("ETHAUD", 500),
+                               ("BNBAUD", 50)]:
+        times = np.sort(rng.integers(0, 86400000, size=num_prices))
+        times = pd.Timestamp("2021-01-01") + pd.to_timedelta(times, unit="ms")
+        sources[symbol] = pd.Series(rng.normal(size=num_prices).cumsum(),
+                                    index=times)
+
+    return sources
+
+
+def resample(sources, interval, how):
+
+    frame = pd.DataFrame({symbol: series.resample(interval).last()
+                          for symbol, series in sources.items()})
+    frame = frame.reindex(pd.date_range("2021-01-01", "2021-01-02",
+                                        freq=interval, inclusive="left"))
+    if how == "ffill":
+        frame = frame.ffill()
+
+    return frame.dropna(how="any").astype(np.float32)
+
+
+@pytest.mark.parametrize("how", ["ffill", "inner"])
+@pytest.mark.parametrize("interval", ["1min", "15min"])
+def test_build_panel(sources, how, interval):
+
+    panel = build_panel(sources, "2021-01-01", "2021-01-02", interval,
+                        how=how)
+    expected = resample(sources, interval, how)
+
+    assert panel.values.dtype == np.float32
+    assert panel.values.flags.c_contiguous
+    assert panel.symbols == list(sources)
+    assert not np.isnan(panel.values).any()
+
+    pd.testing.assert_frame_equal(panel.to_frame(), expected,
+                                  check_freq=False)
+
+
+def test_batches(sources):
+
+    def split(series, batch_size=77):
+        for i in range(0, len(series), batch_size):
+            yield series.iloc[i:i + batch_size]
+
+    batches = {symbol: split(series) for symbol, series in sources.items()}
+
+    panel = build_panel(batches, "2021-01-01 06:00", "2021-01-01 18:00",
+                        "1h", dtype=np.float64)
+    expected = build_panel(sources, "2021-01-01 06:00", "2021-01-01 18:00",
+                           "1h", dtype=np.float64)
+
+    assert panel.shape == (12, 3)
+    np.testing.assert_array_equal(panel.values, expected.values)
+
+
+def test_empty_range(sources):
+
+    panel = build_panel(sources, "2021-01-01 06:00", "2021-01-01 06:00",
+                        "1h")
+
+    assert panel.shape == (0, 3)
+    assert panel.symbols == list(sources)
+    assert len(panel.to_frame()) == 0
+
+
+def test_ffill():
+
+    values = np.array([[np.nan, 1.], [2., np.nan], [np.nan, np.nan],
+                       [3., 4.]])
+    np.testing.assert_array_equal(ffill(values), [[np.nan, 1.], [2., 1.],
+                                                  [2., 1.], [3., 4.]])
+
+    with pytest.raises(ValueError):
+        build_panel({}, "2021-01-01", "2021-01-02", "1h", how="outer")
+
+
+def test_kline_panel(tmp_path):
+
+    store = KlineStore(tmp_path, interval="1h")
+    start_time = T0 + 10 * 86400000
+
+    with StubServer() as server:
+        sync_klines(store, ["BTCAUD", "ETHAUD"], start_time=start_time,
+                    end_time=start_time + 3 * 86400000,
+                    base_url=server.base_url)
+
+    start = pd.Timestamp(start_time, unit="ms")
+    panel = kline_panel(store, ["BTCAUD", "ETHAUD"], start,
+                        start + pd.Timedelta("2D"))
+
+    assert panel.shape == (48, 2)
+    np.testing.assert_array_equal(
+        panel.values[:, 0],
+        store.read("BTCAUD").close.iloc[:48].astype(np.float32))
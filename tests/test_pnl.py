@@ -0,0 +1,145 @@
+"""Tests for `pynance.pnl` module."""
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from pynance.pnl import match_trades, positions, unrealized_pnl
+
+
+@pytest.fixture
+def fills():
+
+    # fixed-point quantities, with sells sometimes exceeding the position
+    rng = np.random.default_rng(8888)
+    is_buyer = rng.random(2000) < 0.55
+    prices = np.round(100. + rng.standard_normal(2000).cumsum(), 2)
+    qtys = rng.integers(1, 1000, size=2000)
+
+    return is_buyer, prices, qtys
+
+
+def reference_fifo(is_buyer, prices, qtys):
+
+    queue = deque()
+    lots = []
+
+    for i, (buying, amount) in enumerate(zip(is_buyer, qtys)):
+
+        if buying:
+            queue.append([i, amount])
+            continue
+
+        while amount and queue:
+            take = min(amount, queue[0][1])
+            lots.append((queue[0][0], i, take))
+            amount -= take
+            queue[0][1] -= take
+            if not queue[0][1]:
+                queue.popleft()
+
+    return lots, [tuple(lot) for lot in queue]
+
+
+def test_positions():
+    np.testing.assert_array_equal(
+        positions([True, False, False, True, False], [3, 1, 5, 2, 1]),
+        [3, 2, 0, 2, 1])
+
+
+def test_fifo(fills):
+
+    lots, open_lots = match_trades(*fills, method="fifo")
+    expected, expected_open = reference_fifo(*fills)
+
+    assert list(zip(lots.buy, lots.sell, lots.qty)) == expected
+    assert list(zip(open_lots.buy, open_lots.qty)) == expected_open
+
+    is_buyer, prices, qtys = fills
+    np.testing.assert_allclose(lots.pnl,
+                               lots.qty * (prices[lots.sell] -
+                                           prices[lots.buy]))
+
+
+def test_lifo():
+
+    is_buyer = [True, True, False, True, False, False]
+    prices = [10., 20., 30., 40., 50., 60.]
+    qtys = [2, 2, 3, 2, 1, 1]
+
+    lots, open_lots = match_trades(is_buyer, prices, qtys, method="lifo")
+
+    assert list(zip(lots.buy, lots.sell, lots.qty)) == \
+        [(1, 2, 2), (0, 2, 1), (3, 4, 1), (3, 5, 1)]
+    assert lots.pnl.tolist() == [20., 20., 10., 20.]
+    assert list(zip(open_lots.buy, open_lots.qty)) == [(0, 1)]
+    assert unrealized_pnl(open_lots, 15.).tolist() == [5.]
+
+
+def test_average():
+
+    is_buyer = [True, True, False, True, False, False]
+    prices = [10., 20., 30., 40., 50., 60.]
+    qtys = [2, 2, 3, 1, 1, 5]
+
+    lots, open_lots = match_trades(is_buyer, prices, qtys, method="average")
+
+    # averages 15, then (1 * 15 + 1 * 40) / 2 = 27.5
+    assert lots.cost.tolist() == [15., 27.5, 27.5]
+    # the last sell exceeds the position
+    assert lots.qty.tolist() == [3, 1, 1]
+    assert lots.pnl.tolist() == [45., 22.5, 32.5]
+    assert len(open_lots) == 0
+
+
+def reference_average(is_buyer, prices, qtys):
+
+    position, cost, costs = 0, 0., []
+
+    for buying, price, amount in zip(is_buyer, prices, qtys):
+
+        if buying:
+            if position + amount:
+                cost = (cost * position + price * amount) / (position + amount)
+            position += amount
+        elif min(amount, position):
+            costs.append(cost)
+            position -= min(amount, position)
+
+    return costs
+
+
+def test_average_recurrence(fills):
+
+    is_buyer, prices, qtys = fills
+    qtys = np.where(np.arange(len(qtys)) % 7, qtys, 0)  # and empty fills
+
+    lots, _ = match_trades(is_buyer, prices, qtys, method="average")
+    np.testing.assert_allclose(lots.cost,
+                               reference_average(is_buyer, prices, qtys))
+
+    # an empty buy while flat leaves the cost as it was
+    lots, open_lots = match_trades([True, False, True, True, False],
+                                   [10., 20., 30., 40., 50.],
+                                   [1, 1, 0, 1, 1], method="average")
+    assert lots.cost.tolist() == [10., 40.]
+    assert len(open_lots) == 0
+
+
+def test_realized_total(fills):
+
+    # all methods realize the same total over a round trip at one price
+    is_buyer, prices, qtys = fills
+    held = positions(is_buyer, qtys)[-1]
+
+    is_buyer = np.append(is_buyer, False)
+    prices = np.append(prices, 100.)
+    qtys = np.append(qtys, held)
+
+    totals = [match_trades(is_buyer, prices, qtys, method=method)[0].pnl.sum()
+              for method in ("fifo", "lifo", "average")]
+    np.testing.assert_allclose(totals, totals[0])
+
+    with pytest.raises(ValueError):
+        match_trades(is_buyer, prices, qtys, method="hifo")
@@ -0,0 +1,85 @@
+"""Tests for `pynance.portfolio` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.client import Client
+from pynance.decoding import create_trades_frame
+from pynance.portfolio import (Portfolio, conversion_rates, fetch_prices,
+                               symbol_assets)
+from pynance.testing import StubServer, make_my_trade
+
+PRICES = {"BTCAUD": 50000., "ETHBTC": 0.05, "XRPUSDT": 0.5,
+          "AUDUSDT": 0.625, "BTCUSDT": 32000.}
+
+
+@pytest.fixture
+def market():
+
+    with StubServer(symbols=list(PRICES), prices=PRICES) as server:
+        with Client(base_url=server.base_url) as client:
+            exchange_info = client.exchange_info()
+            prices = fetch_prices(client)
+            num_requests = server.num_requests
+
+    return exchange_info, prices, num_requests
+
+
+def test_fetch_prices(market):
+
+    exchange_info, prices, num_requests = market
+
+    assert num_requests == 2  # one for all prices
+    assert prices.to_dict() == PRICES
+
+
+def test_conversion_rates(market):
+
+    exchange_info, prices, num_requests = market
+    rates = conversion_rates(prices, symbol_assets(exchange_info), "AUD")
+
+    assert rates["AUD"] == 1.
+    assert rates["BTC"] == 50000.  # direct
+    assert rates["USDT"] == 1. / 0.625  # inverse
+    assert rates["ETH"] == pytest.approx(0.05 * 50000.)  # via BTC
+    assert rates["XRP"] == pytest.approx(0.5 / 0.625)  # via USDT
+
+
+def test_revalue(market):
+
+    exchange_info, prices, num_requests = market
+
+    symbols = ["BTCAUD", "ETHBTC", "XRPUSDT"]
+    fills = create_trades_frame([make_my_trade(symbol, i)
+                                 for symbol in symbols for i in range(30)])
+
+    portfolio = Portfolio(fills, exchange_info, target="AUD")
+    valuation = portfolio.revalue(prices)
+
+    assert valuation.index.tolist() == symbols
+
+    # same as valuing each symbol on its own
+    for symbol in symbols:
+
+        own = fills[fills.symbol == symbol]
+        sign = np.where(own.isBuyer, 1., -1.)
+        qty, cost = (sign * own.qty).sum(), (sign * own.quoteQty).sum()
+
+        row = valuation.loc[symbol]
+        np.testing.assert_allclose(row.qty, qty)
+        np.testing.assert_allclose(row.quote_pnl, qty * PRICES[symbol] - cost)
+
+    np.testing.assert_allclose(
+        valuation.pnl, valuation.quote_pnl * [1., 50000., 1.6])
+
+    # USDT converts through BTC without AUDUSDT
+    valuation = portfolio.revalue(prices.drop("AUDUSDT"))
+    np.testing.assert_allclose(valuation.rate["XRPUSDT"], 50000. / 32000.)
+
+    # and not at all without BTCUSDT either
+    valuation = portfolio.revalue(prices.drop(["AUDUSDT", "BTCUSDT"]))
+    assert np.isnan(valuation.pnl["XRPUSDT"])
+    assert not valuation.pnl.drop("XRPUSDT").isna().any()
+
+    assert isinstance(valuation[["value", "pnl"]].sum(), pd.Series)
@@ -0,0 +1,111 @@
+"""Tests for `pynance.ratelimit` module."""
+
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pynance.client import Client
+from pynance.ratelimit import RateLimiter, TokenBucket, parse_usage
+from pynance.testing import StubServer
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket():
+
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=10, interval=60., margin=0., clock=clock)
+
+    clock.now = 15.
+    assert bucket.reserve(10) == 0.
+    assert bucket.reserve(5) == 45.  # paced into the next window
+    assert bucket.reserve(5) == 45.
+    assert bucket.reserve(1) == 105.
+
+    # exchange reports more usage than estimated
+    clock.now = 125.
+    bucket.correct(used=8)
+    assert bucket.reserve(5) == 55.
+
+
+def test_parse_usage():
+
+    headers = {"X-MBX-USED-WEIGHT-1M": "42",
+               "x-mbx-order-count-10s": "3",
+               "Content-Type": "application/json"}
+
+    assert parse_usage(headers) == {("REQUEST_WEIGHT", 60): 42,
+                                    ("ORDERS", 10): 3}
+
+
+def test_rate_limiter_retry_after():
+
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+
+    limiter.reserve("/api/v3/time")
+    limiter.release("/api/v3/time", headers={"Retry-After": "30"},
+                    status=429)
+
+    assert limiter.reserve("/api/v3/time") == 30.
+
+
+def test_paced_against_stub():
+
+    rate_limit = {"rateLimitType": "REQUEST_WEIGHT", "interval": "SECOND",
+                  "intervalNum": 1, "limit": 50}
+    num_requests = 100
+
+    with StubServer(rate_limit=rate_limit) as server:
+
+        limiter = RateLimiter(rate_limits=[rate_limit], headroom=0.9)
+
+        with Client(base_url=server.base_url, rate_limiter=limiter,
+                    max_retries=0) as client:
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda i: client.server_time(),
+                                            range(num_requests)))
+            elapsed = time.perf_counter() - start
+
+    assert len(results) == num_requests
+    assert server.num_rejected == 0
+    assert elapsed > 1.
+
+
+def test_rejected_against_stub():
+
+    rate_limit = {"rateLimitType": "REQUEST_WEIGHT", "interval": "SECOND",
+                  "intervalNum": 1, "limit": 30}
+    num_requests = 100
+
+    with StubServer(rate_limit=rate_limit) as server:
+
+        # overestimating the limit, so that some requests are rejected
+        limiter = RateLimiter(rate_limits=[dict(rate_limit, limit=60)],
+                              headroom=1.)
+
+        statuses = []
+        release = limiter.release
+        limiter.release = lambda *args, **kwargs: \
+            statuses.append(kwargs.get("status")) or release(*args, **kwargs)
+
+        with Client(base_url=server.base_url, rate_limiter=limiter) as client:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda i: client.server_time(),
+                                            range(num_requests)))
+
+    # rejected requests are paced and resent, rather than failing
+    assert len(results) == num_requests
+    assert all(result is not None for result in results)
+    assert 0 < server.num_rejected < num_requests // 2
+    # every rejection reached the limiter, which held back the other threads
+    assert statuses.count(429) == server.num_rejected
@@ -0,0 +1,85 @@
+"""Tests for `pynance.ringbuffer` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.decoding import create_trades_frame
+from pynance.ringbuffer import (AGG_TRADE_KEYS, BOOK_TICKER_DTYPE,
+                                BOOK_TICKER_KEYS, TRADE_DTYPE,
+                                RingBuffer)
+from pynance.testing import make_stream_event, make_trade
+
+
+def create_records(trade_ids):
+    frame = create_trades_frame([make_trade(i) for i in trade_ids])
+    return frame[list(TRADE_DTYPE.names)].to_records(index=False)
+
+
+def test_append():
+
+    buffer = RingBuffer(5, keys=AGG_TRADE_KEYS)
+    assert len(buffer) == 0
+    assert len(buffer.last()) == 0
+    assert len(buffer.since(60.)) == 0
+
+    nbytes = buffer.nbytes
+    for i in range(12):
+        buffer.append_event(make_stream_event("btcaud@aggTrade", i))
+
+        window = buffer.last()
+        assert window["id"].tolist() == list(range(max(i - 4, 0), i + 1))
+        assert np.shares_memory(window, buffer.data)  # a view
+
+    assert len(buffer) == 5
+    assert buffer.count == 12
+    assert buffer.nbytes == nbytes
+    assert buffer.last(2)["id"].tolist() == [10, 11]
+    assert buffer.last(100)["id"].tolist() == list(range(7, 12))
+    assert buffer.last()["price"][-1] == float(make_trade(11)["price"])
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 7, 20])
+def test_extend(batch_size):
+
+    buffer = RingBuffer(7)
+    for start in range(0, 30, batch_size):
+        buffer.extend(create_records(range(start, min(start + batch_size,
+                                                      30))))
+
+    assert buffer.count == 30
+    assert buffer.last()["id"].tolist() == list(range(23, 30))
+
+
+def test_since():
+
+    # trades are 100ms apart
+    buffer = RingBuffer(100)
+    buffer.extend(create_records(range(250)))
+
+    assert buffer.since(1.)["id"].tolist() == list(range(239, 250))
+    assert len(buffer.since(60.)) == 100  # no more than kept
+
+
+def test_to_frame():
+
+    buffer = RingBuffer(10, dtype=BOOK_TICKER_DTYPE, keys=BOOK_TICKER_KEYS)
+    for i in range(15):
+        buffer.append_event(make_stream_event("btcaud@bookTicker", i))
+
+    frame = buffer.to_frame(3)
+    assert list(frame.columns) == list(BOOK_TICKER_DTYPE.names)
+    assert frame.updateId.tolist() == [12, 13, 14]
+    assert (frame.askPrice > frame.bidPrice).all()
+
+    # a copy, unaffected by later appends
+    buffer.append_event(make_stream_event("btcaud@bookTicker", 15))
+    assert frame.updateId.tolist() == [12, 13, 14]
+
+    expected = pd.DataFrame(buffer.last())
+    pd.testing.assert_frame_equal(buffer.to_frame(), expected)
+
+
+def test_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
@@ -0,0 +1,80 @@
+"""Tests for `pynance.rolling` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pynance.panel import Panel
+from pynance.rolling import rolling_moments, window_ends
+
+
+@pytest.fixture
+def returns():
+
+    rng = np.random.default_rng(8888)
+
+    # correlated returns around a common factor
+    factor = rng.normal(scale=1e-3, size=(500, 1))
+    loadings = rng.uniform(0.5, 1.5, size=7)
+    noise = rng.normal(scale=1e-3, size=(500, 7))
+
+    return 1e-4 + factor * loadings + noise
+
+
+def test_window_ends():
+
+    np.testing.assert_array_equal(window_ends(10, 4), np.arange(4, 11))
+    np.testing.assert_array_equal(window_ends(10, 4, step=4), [6, 10])
+    assert len(window_ends(3, 4)) == 0
+
+    with pytest.raises(ValueError):
+        window_ends(10, 1)
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 3])
+def test_rolling_moments(returns, block_size):
+
+    window, step = 60, 7
+    cov, corr, beta = rolling_moments(returns, window, step=step,
+                                      block_size=block_size, max_workers=4,
+                                      dtype=np.float64)
+
+    ends = window_ends(len(returns), window, step=step)
+    assert cov.shape == corr.shape == beta.shape == (len(ends), 7, 7)
+
+    frame = pd.DataFrame(returns)
+    rolling = frame.rolling(window)
+
+    expected_cov = rolling.cov().to_numpy().reshape(-1, 7, 7)[ends - 1]
+    expected_corr = rolling.corr().to_numpy().reshape(-1, 7, 7)[ends - 1]
+
+    np.testing.assert_allclose(cov, expected_cov, rtol=1e-8, atol=1e-14)
+    np.testing.assert_allclose(corr, expected_corr, rtol=1e-8, atol=1e-10)
+
+    # beta of each symbol on the first
+    expected_beta = rolling.cov(frame[0]).div(rolling.var()[0], axis=0)
+    np.testing.assert_allclose(beta[:, :, 0],
+                               expected_beta.to_numpy()[ends - 1],
+                               rtol=1e-8)
+
+
+def test_panel(returns):
+
+    prices = 100. * np.exp(np.cumsum(returns, axis=0))
+    panel = Panel(prices.astype(np.float32),
+                  pd.date_range("2021-01-01", periods=len(prices),
+                                freq="15min"), list("ABCDEFG"))
+
+    log_returns = panel.log_returns()
+    assert log_returns.index[0] == panel.index[1]
+
+    cov, corr, beta = rolling_moments(log_returns.values, window=96)
+
+    assert cov.dtype == corr.dtype == beta.dtype == np.float32
+    assert len(cov) == len(panel) - 96
+    np.testing.assert_allclose(np.diagonal(corr, axis1=1, axis2=2), 1.,
+                               rtol=1e-5)
+    np.testing.assert_allclose(np.diagonal(beta, axis1=1, axis2=2), 1.,
+                               rtol=1e-5)
+    # the common factor
+    assert corr.mean() > 0.3
@@ -0,0 +1,48 @@
+"""Tests for `pynance.store` module."""
+
+import pandas as pd
+
+from pynance.client import Client
+from pynance.decoding import create_trades_frame
+from pynance.store import TradeStore
+from pynance.testing import StubServer, make_trade
+
+# 100ms apart, so 864000 trades per day
+TRADES_PER_DAY = 864000
+
+
+def test_append_read(tmp_path):
+
+    store = TradeStore(tmp_path)
+    ids = [0, 1, TRADES_PER_DAY - 1, TRADES_PER_DAY, 2 * TRADES_PER_DAY]
+    frame = create_trades_frame([make_trade(i) for i in ids])
+
+    assert store.high_water("BTCAUD") is None
+    assert store.append("BTCAUD", frame.iloc[:3]) == 3
+    # only rows newer than the high-water id are appended
+    assert store.append("BTCAUD", frame) == 2
+    assert store.high_water("BTCAUD") == 2 * TRADES_PER_DAY
+
+    assert len(store.partitions("BTCAUD")) == 3
+    pd.testing.assert_frame_equal(store.read("BTCAUD"), frame)
+
+    start = frame.time.iloc[1]
+    end = frame.time.iloc[4]
+    result = store.read("BTCAUD", start=start, end=end, columns=["id"])
+    assert result.id.tolist() == ids[1:4]
+
+
+def test_ingest(tmp_path):
+
+    store = TradeStore(tmp_path)
+
+    with StubServer(num_trades=3000) as server:
+
+        with Client(base_url=server.base_url) as client:
+            assert store.ingest(client, "BTCAUD", start_id=1000) == 2000
+
+        server.num_trades = 3500
+        with Client(base_url=server.base_url) as client:
+            assert store.ingest(client, "BTCAUD") == 500
+
+    assert store.read("BTCAUD").id.tolist() == list(range(1000, 3500))
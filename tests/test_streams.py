@@ -0,0 +1,149 @@
+"""Tests for `pynance.streams` module."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from pynance.streams import StreamSubscriber, stream_name, stream_names
+from pynance.testing import StreamStub
+
+
+async def consume(subscriber, num_messages, delay=0.):
+
+    messages = []
+    async for stream, data in subscriber:
+        messages.append((stream, data))
+        if len(messages) == num_messages:
+            return messages
+        await asyncio.sleep(delay)
+
+
+def test_stream_names():
+
+    assert stream_name("BTCAUD", "depth@100ms") == "btcaud@depth@100ms"
+    assert stream_names(["BTCAUD", "ETHAUD"], ["trade", "bookTicker"]) == \
+        ["btcaud@trade", "btcaud@bookTicker", "ethaud@trade",
+         "ethaud@bookTicker"]
+
+
+def test_combined_streams():
+
+    num_events = 50
+    streams = stream_names(["BTCAUD", "ETHAUD", "BNBAUD"],
+                           ["trade", "aggTrade", "depth", "bookTicker"])
+
+    async def subscribe(base_url):
+        async with StreamSubscriber(streams, base_url=base_url, max_streams=5,
+                                    maxsize=8) as subscriber:
+            # fewer queued messages than there are to consume
+            messages = await consume(subscriber, num_events * len(streams))
+            assert subscriber.queue.qsize() <= 8
+            return subscriber, messages
+
+    with StreamStub(num_events=num_events) as stub:
+        subscriber, messages = asyncio.run(subscribe(stub.base_url))
+
+    assert stub.num_connections == 3
+    assert subscriber.num_reconnects == 0
+
+    events = {stream: [data for name, data in messages if name == stream]
+              for stream in streams}
+    assert [event["t"] for event in events["btcaud@trade"]] == \
+        list(range(num_events))
+    assert [event["a"] for event in events["ethaud@aggTrade"]] == \
+        list(range(num_events))
+    assert [event["u"] for event in events["bnbaud@depth"]] == \
+        list(range(num_events))
+    assert all(event["s"] == "BNBAUD" for event in events["bnbaud@bookTicker"])
+
+
+def test_reconnect():
+
+    num_events = 40
+    streams = stream_names(["BTCAUD", "ETHAUD"], ["aggTrade"])
+
+    async def subscribe(base_url):
+        async with StreamSubscriber(streams, base_url=base_url,
+                                    min_backoff=0.01) as subscriber:
+            messages = await consume(subscriber,
+                                     num_events * len(streams) + 2 * 2)
+            return subscriber, messages
+
+    with StreamStub(num_events=num_events, drop_after=25,
+                    num_drops=2) as stub:
+        subscriber, messages = asyncio.run(subscribe(stub.base_url))
+
+    assert stub.num_connections == 3
+    assert subscriber.num_reconnects == 2
+
+    # every stream is marked as having a gap after each reconnect
+    gaps = [i for i, (_, data) in enumerate(messages) if data is None]
+    assert len(gaps) == 4
+    assert [messages[i][0] for i in gaps[:2]] == streams
+
+    for stream in streams:
+        ids = [data["a"] for name, data in messages
+               if name == stream and data is not None]
+        assert ids == list(range(num_events))
+
+
+def test_give_up():
+
+    async def subscribe():
+        # nothing listens on the discard port
+        async with StreamSubscriber(["btcaud@trade"],
+                                    base_url="ws://127.0.0.1:9",
+                                    min_backoff=0.01,
+                                    max_retries=2) as subscriber:
+            await subscriber.get()
+
+    with pytest.raises(aiohttp.ClientError):
+        asyncio.run(subscribe())
+
+
+def test_replies():
+
+    num_events = 20
+    streams = stream_names(["BTCAUD"], ["trade", "bookTicker"])
+
+    async def subscribe(base_url):
+        async with StreamSubscriber(streams, base_url=base_url) as subscriber:
+            messages = await consume(subscriber, num_events * len(streams))
+            return subscriber, messages
+
+    preamble = ['{"result": null, "id": 1}',
+                '{"code": 2, "msg": "Invalid request"}']
+    with StreamStub(num_events=num_events, preamble=preamble) as stub:
+        subscriber, messages = asyncio.run(subscribe(stub.base_url))
+
+    assert subscriber.num_reconnects == 0
+    assert all(data is not None for _, data in messages)
+
+
+def test_malformed():
+
+    async def subscribe(base_url):
+        async with StreamSubscriber(["btcaud@trade"], base_url=base_url,
+                                    min_backoff=0.01,
+                                    max_retries=2) as subscriber:
+            # gaps, as connections are dropped, then the error
+            while True:
+                await asyncio.wait_for(subscriber.get(), timeout=10.)
+
+    with StreamStub(preamble=["not json"]) as stub:
+        with pytest.raises(ValueError):
+            asyncio.run(subscribe(stub.base_url))
+
+
+def test_unexpected_error():
+
+    async def subscribe(base_url):
+        async with StreamSubscriber(["btcaud@trade"], base_url=base_url,
+                                    min_backoff=0.01) as subscriber:
+            await asyncio.wait_for(subscriber.get(), timeout=10.)
+
+    # an event without data is not retried, even forever
+    with StreamStub(preamble=['{"stream": "btcaud@trade"}']) as stub:
+        with pytest.raises(KeyError):
+            asyncio.run(subscribe(stub.base_url))
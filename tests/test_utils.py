@@ -0,0 +1,89 @@
+"""Tests for `pynance.utils` module."""
+
+import time
+
+import pytest
+import requests
+
+from pynance.client import Client
+from pynance.testing import StubServer
+from pynance.utils import ClockSync, create_timestamp
+
+
+def test_create_timestamp():
+
+    before = create_timestamp()
+    time.sleep(0.01)
+    assert create_timestamp() > before  # not frozen at import
+
+
+def test_min_rtt_filter():
+
+    # (local send time, local receive time, server time) of each sample,
+    # with the server 1000ms ahead
+    samples = iter([(0., 0.2, 1100.), (1., 1.01, 2005.), (2., 2.4, 3050.)])
+    now = [0.]
+
+    def server_time():
+        start, end, server = next(samples)
+        now[0] = end
+        return server
+
+    def clock():
+        return now[0]
+
+    clock_sync = ClockSync(server_time, window=2, clock=clock)
+
+    for start, rtt, offset in [(0., 200., 1000.), (1., 10., 1000.),
+                               (2., 10., 1000.)]:
+        now[0] = start
+        clock_sync.sample()
+        assert clock_sync.rtt == pytest.approx(rtt)
+        assert clock_sync.offset == pytest.approx(offset)
+
+    # the noisy third sample (offset 850) does not replace the second
+    assert clock_sync.timestamp() == int(1e+3 * 2.4 + 1000.)
+
+
+def test_skewed_server():
+
+    num_my_trades = {"BTCAUD": 10}
+
+    with StubServer(num_my_trades=num_my_trades, clock_skew=-30.) as server:
+
+        with Client(api_key="foo", secret_key="bar",
+                    base_url=server.base_url) as client:
+
+            # local timestamps are 30s ahead of the server's
+            with pytest.raises(requests.HTTPError):
+                client.my_trades("BTCAUD")
+
+            clock_sync = client.sync_clock(interval=0.05)
+            assert clock_sync.offset == pytest.approx(-30000., abs=50.)
+            assert len(client.my_trades("BTCAUD")) == 10
+
+            time.sleep(0.2)
+            assert len(clock_sync.samples) > 1
+            num_requests = server.num_requests
+
+        # the background thread is stopped along with the client
+        time.sleep(0.1)
+        assert server.num_requests == num_requests
+
+
+def test_failed_samples(caplog):
+
+    errors = iter([requests.ConnectionError("down"), ValueError("bug")])
+
+    def server_time():
+        error = next(errors, None)
+        if error is not None:
+            raise error
+        return 1e+3 * time.time()
+
+    clock_sync = ClockSync(server_time, interval=0.01)
+
+    # connection errors are logged and skipped, others are not
+    with pytest.raises(ValueError):
+        clock_sync.run()
+    assert "down" in caplog.text